@@ -30,6 +30,9 @@ class UserAccessEventManagerInterface(Protocol):
     def user_added_to_case(self, user: User, issue: Issue) -> None:
         raise NotImplementedError()
 
+    def user_added_to_cases(self, user: User, issues: list[Issue]) -> None:
+        raise NotImplementedError()
+
     def user_removed_from_case(self, user: User, issue: Issue) -> None:
         raise NotImplementedError()
 
@@ -62,6 +65,9 @@ class UserAccessEventAdapter(UserAccessEventManagerInterface):
     def user_added_to_case(self, user: User, issue: Issue) -> None:
         self._service.add_user_to_case(user, issue)
 
+    def user_added_to_cases(self, user: User, issues: list[Issue]) -> None:
+        self._service.add_user_to_cases(user, issues)
+
     def user_removed_from_case(self, user: User, issue: Issue) -> None:
         self._service.remove_user_from_case(user, issue)
 
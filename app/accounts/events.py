@@ -14,6 +14,9 @@ user_deactivated = Signal()
 # Sent when a user is given access to a case (issue). kwargs: user, issue
 user_added_to_case = Signal()
 
+# Sent when a user is given access to many cases at once. kwargs: user, issues
+user_added_to_cases = Signal()
+
 # Sent when a user's access to a case should be removed. kwargs: user, issue
 user_removed_from_case = Signal()
 
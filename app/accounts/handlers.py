@@ -28,6 +28,19 @@ def handle_user_added_to_case(sender, user, issue, **kwargs):
         )
 
 
+@receiver(events.user_added_to_cases)
+def handle_user_added_to_cases(sender, user, issues, **kwargs):
+    mgr = get_user_event_manager()
+    try:
+        mgr.user_added_to_cases(user, issues)
+    except Exception:
+        logger.exception(
+            "Failure handling user event: User<%s> added to %s Issues",
+            user.pk,
+            len(issues),
+        )
+
+
 @receiver(events.user_removed_from_case)
 def handle_user_removed_from_case(sender, user, issue, **kwargs):
     mgr = get_user_event_manager()
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0012_user_ms_account_initial_password"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="groups_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -1,6 +1,6 @@
 from django.contrib.auth.models import AbstractUser
 from django.contrib.contenttypes.fields import GenericRelation
-from django.db import models
+from django.db import DatabaseError, models
 from auditlog.registry import auditlog
 from encrypted_fields.fields import EncryptedCharField
 
@@ -54,12 +54,35 @@ class User(AbstractUser):
     university = models.ForeignKey(
         University, blank=True, null=True, on_delete=models.PROTECT
     )
+    # Incremented whenever the user's groups change, to invalidate cached roles.
+    groups_version = models.PositiveIntegerField(default=0, editable=False)
 
     def save(self, *args, **kwargs):
         # Ensure email always lowercase
         if self.email:
             self.email = self.email.lower()
 
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # groups_version is only changed with F() updates, see
+            # accounts.signals.invalidate_cached_roles, so leave it out of full
+            # saves in case this instance was loaded before the user's groups
+            # changed. Writing back the old version would make their cached
+            # role valid again.
+            skip_fields = {"groups_version", *self.get_deferred_fields()}
+            update_fields = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.attname not in skip_fields
+            ]
+            try:
+                return super().save(*args, update_fields=update_fields, **kwargs)
+            except DatabaseError as e:
+                # Django raises a plain DatabaseError when no row was updated.
+                # The row was deleted, so insert it again like a full save of
+                # any other model would.
+                if type(e) is not DatabaseError:
+                    raise
+
         return super().save(*args, **kwargs)
 
     @property
@@ -77,4 +100,4 @@ class User(AbstractUser):
         return self.email
 
 
-auditlog.register(User, exclude_fields=["last_login", "password"])
+auditlog.register(User, exclude_fields=["last_login", "password", "groups_version"])
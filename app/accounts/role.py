@@ -7,6 +7,10 @@ from django.db.models import prefetch_related_objects
 
 if TYPE_CHECKING:
     from accounts.models import User
+    from django.contrib.sessions.backends.base import SessionBase
+
+# Session key for the cached group names of the logged in user.
+SESSION_GROUPS_KEY = "user_groups"
 
 
 class UserRole:
@@ -51,17 +55,26 @@ class UserRole:
     _user: User | None = None
     _group_names: set[str] = set()
 
-    def __init__(self, user: User):
+    def __init__(self, user: User, group_names: set[str] | None = None):
         self._user = user
-        self.reset()
+        self.reset(group_names)
 
     @staticmethod
-    def annotate_user(user: User):
+    def annotate_user(user: User, session: SessionBase | None = None):
         """
         Add attributes to the user object that indicate their role (e.g.
         paralegal, coordinator etc.) & the comparative level of their role.
+
+        If the user's session is given, their group names are cached in it
+        until their groups_version changes.
         """
-        role = UserRole(user)
+        if session is None:
+            role = UserRole(user)
+        else:
+            role = UserRole.from_session(user, session)
+
+        # Share the role with user.role
+        user._role = role
         setattr(user, "is_admin", role.is_admin)
         setattr(user, "is_coordinator", role.is_coordinator)
         setattr(user, "is_lawyer", role.is_lawyer)
@@ -72,21 +85,46 @@ class UserRole:
         setattr(user, "is_lawyer_or_better", role.is_lawyer_or_better)
         setattr(user, "is_paralegal_or_better", role.is_paralegal_or_better)
 
-    def reset(self):
+    @staticmethod
+    def from_session(user: User, session: SessionBase) -> UserRole:
+        """
+        Returns the user's role, using the group names cached in their session
+        if their groups haven't changed since.
+        """
+        cached = session.get(SESSION_GROUPS_KEY)
+        if (
+            cached
+            and cached["user"] == user.pk
+            and cached["version"] == user.groups_version
+        ):
+            return UserRole(user, group_names=set(cached["groups"]))
+
+        role = UserRole(user)
+        session[SESSION_GROUPS_KEY] = {
+            "user": user.pk,
+            "version": user.groups_version,
+            "groups": sorted(role._group_names),
+        }
+        return role
+
+    def reset(self, group_names: set[str] | None = None):
         self._group_names = set()
         self._set_no_role()
 
         if self._user:
-            # Prefetch the user's groups if they haven't been already.
-            if (
-                not hasattr(self._user, "_prefetched_objects_cache")
-                or "groups" not in self._user._prefetched_objects_cache
-            ):
-                prefetch_related_objects([self._user], "groups")
-
-            # NOTE: Use all() to make sure we hit the "groups" prefetch_related
-            # cache.
-            self._group_names = set(x.name for x in self._user.groups.all())
+            if group_names is not None:
+                self._group_names = group_names
+            else:
+                # Prefetch the user's groups if they haven't been already.
+                if (
+                    not hasattr(self._user, "_prefetched_objects_cache")
+                    or "groups" not in self._user._prefetched_objects_cache
+                ):
+                    prefetch_related_objects([self._user], "groups")
+
+                # NOTE: Use all() to make sure we hit the "groups"
+                # prefetch_related cache.
+                self._group_names = set(x.name for x in self._user.groups.all())
 
             # NOTE: the order of the tests is important.
             if self._user.is_superuser:
@@ -2,6 +2,7 @@ import os
 
 from auditlog.models import LogEntry
 from auditlog.receivers import post_log
+from django.db.models import F
 from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
 from django_q.tasks import async_task
@@ -39,6 +40,10 @@ def post_log_user(sender, instance, action, changes, **kwargs):
 
 @receiver(m2m_changed, sender=User.groups.through)
 def m2m_changed_user_groups(sender, instance, action, **kwargs):
+    invalidate_cached_roles(
+        instance, action, kwargs.get("reverse"), kwargs.get("pk_set")
+    )
+
     if kwargs.get("reverse"):
         # Do nothing if it's a Group instance rather than a User.
         return
@@ -57,6 +62,27 @@ def m2m_changed_user_groups(sender, instance, action, **kwargs):
         events.user_role_changed.send(sender=User, user=user)
 
 
+def invalidate_cached_roles(instance, action, reverse, pk_set):
+    """
+    Bump the groups_version of users whose groups have changed, so that any
+    role cached in their session is recalculated.
+    """
+    if not reverse:
+        if action not in ("post_add", "post_remove", "post_clear"):
+            return
+        users = User.objects.filter(pk=instance.pk)
+        instance.groups_version += 1
+    elif action in ("post_add", "post_remove"):
+        users = User.objects.filter(pk__in=pk_set)
+    elif action == "pre_clear":
+        # Users must be found before they're removed from the Group.
+        users = User.objects.filter(groups=instance)
+    else:
+        return
+
+    users.update(groups_version=F("groups_version") + 1)
+
+
 # We have to wait until the MS account is created before sending the welcome
 # email, as the email contains the initial MS password.
 @receiver(ms_events.ms_account_created, sender=User)
@@ -27,6 +27,9 @@ def test_microsoft_adapter_case_delegation(mock_ms_service, user):
     adapter.user_removed_from_case(user, issue)
     mock_ms_service.remove_user_from_case.assert_called_once_with(user, issue)
 
+    adapter.user_added_to_cases(user, [issue])
+    mock_ms_service.add_user_to_cases.assert_called_once_with(user, [issue])
+
 
 # User activation/deactivation tests
 
@@ -1,5 +1,7 @@
 import pytest
+from django.contrib.sessions.backends.db import SessionStore
 
+from accounts.models import User
 from accounts.role import UserRole
 
 
@@ -212,3 +214,51 @@ def test_reset_recomputes_on_group_change(user, paralegal_group, coordinator_gro
     user.groups.set([])
     role.reset()
     _assert_all_false(role)
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+def test_role_cached_in_session(
+    user, paralegal_group, coordinator_group, django_assert_num_queries
+):
+    user.groups.add(paralegal_group)
+    session = SessionStore()
+    session.create()
+
+    UserRole.annotate_user(User.objects.get(pk=user.pk), session)
+    user = User.objects.get(pk=user.pk)
+    with django_assert_num_queries(0):
+        UserRole.annotate_user(user, session)
+        assert user.is_paralegal
+        assert user.role.is_paralegal
+
+    # Changing the user's groups invalidates the cached role.
+    user.groups.add(coordinator_group)
+    user = User.objects.get(pk=user.pk)
+    UserRole.annotate_user(user, session)
+    assert user.is_coordinator
+    assert user.role.is_coordinator
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+def test_role_cache_invalidated_after_stale_user_save(
+    user, paralegal_group, coordinator_group
+):
+    user.groups.add(coordinator_group)
+    session = SessionStore()
+    session.create()
+    UserRole.annotate_user(User.objects.get(pk=user.pk), session)
+
+    # A User loaded before their groups change is saved afterwards.
+    stale_user = User.objects.get(pk=user.pk)
+    user.groups.remove(coordinator_group)
+    user.groups.add(paralegal_group)
+    stale_user.first_name = "Updated"
+    stale_user.save()
+
+    user = User.objects.get(pk=user.pk)
+    assert user.first_name == "Updated"
+    UserRole.annotate_user(user, session)
+    assert not user.is_coordinator
+    assert user.is_paralegal
@@ -0,0 +1,48 @@
+"""
+Benchmarks for the busiest case management pages and API endpoints.
+"""
+
+import pytest
+from django.urls import reverse
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    "search", ["", "smith", "smith r0"], ids=["all", "name", "fileref"]
+)
+def test_case_list(bench_get, coordinator, search):
+    bench_get(coordinator, reverse("case-api-list"), {"search": search})
+
+
+def test_case_list__paralegal(bench_get, paralegal):
+    bench_get(paralegal, reverse("case-api-list"))
+
+
+def test_case_retrieve(bench_get, coordinator, busiest_issue):
+    bench_get(coordinator, reverse("case-api-detail", args=(busiest_issue.pk,)))
+
+
+def test_email_thread_list(bench_get, coordinator, busiest_issue):
+    bench_get(coordinator, reverse("email-api-thread-list", args=(busiest_issue.pk,)))
+
+
+def test_email_thread(bench_get, coordinator, busiest_issue):
+    thread_name = busiest_issue.email_set.values_list("thread_name", flat=True)[0]
+    bench_get(
+        coordinator,
+        reverse("email-api-detail", args=(busiest_issue.pk,)),
+        {"slug": thread_name},
+    )
+
+
+def test_date_list(bench_get, coordinator):
+    bench_get(coordinator, reverse("date-api-list"))
+
+
+def test_paralegal_list(bench_get, coordinator):
+    bench_get(coordinator, reverse("paralegal-list"))
+
+
+def test_case_inbox(bench_get, coordinator):
+    bench_get(coordinator, reverse("case-inbox"))
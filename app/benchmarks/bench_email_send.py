@@ -0,0 +1,63 @@
+"""
+Benchmarks for sending large emails.
+"""
+
+import os
+import tracemalloc
+from unittest.mock import Mock, patch
+
+import pytest
+from core.factories import EmailAttachmentFactory, EmailFactory, IssueFactory
+from django.core.files.base import ContentFile
+from emails.models import EmailState
+from emails.service.send import send_email_task
+from emails.utils.size import MAX_EMAIL_SIZE_BYTES
+
+pytestmark = pytest.mark.django_db
+
+ATTACHMENT_COUNT = 10
+# Python memory allocated while sending the largest email we allow.
+MEMORY_CEILING_BYTES = 16 * 1024 * 1024
+# Chunk size http.client uses to send a file body.
+SEND_BLOCK_SIZE = 8192
+
+
+@pytest.fixture
+def large_email(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    email = EmailFactory(issue=IssueFactory(), state=EmailState.READY_TO_SEND)
+    # Attachments which add up to the size limit once base64 encoded.
+    size = MAX_EMAIL_SIZE_BYTES * 3 // 4 // ATTACHMENT_COUNT
+    for i in range(ATTACHMENT_COUNT):
+        f = ContentFile(os.urandom(size), name=f"attachment-{i}.bin")
+        EmailAttachmentFactory(email=email, file=f)
+
+    return email
+
+
+def test_send_large_email(benchmark, large_email):
+    sent = []
+
+    def post(url, data, headers, timeout):
+        # Read the body like http.client does when sending it.
+        while block := data.read(SEND_BLOCK_SIZE):
+            sent.append(len(block))
+        return Mock(headers={"X-Message-Id": "sendgrid-id"})
+
+    def send():
+        large_email.state = EmailState.READY_TO_SEND
+        large_email.save()
+        sent.clear()
+        tracemalloc.start()
+        try:
+            with patch("emails.api.requests.post", side_effect=post):
+                send_email_task(large_email.pk)
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    peak = benchmark.pedantic(send, rounds=3)
+    benchmark.extra_info["peak_mb"] = round(peak / 1024 / 1024, 1)
+    benchmark.extra_info["sent_mb"] = round(sum(sent) / 1024 / 1024, 1)
+    assert sum(sent) > MAX_EMAIL_SIZE_BYTES * 0.99
+    assert peak < MEMORY_CEILING_BYTES, f"Sending used {peak} bytes"
@@ -0,0 +1,134 @@
+"""
+Fixtures for benchmarking the case management API against a large dataset.
+
+Run with `just benchmark`. The dataset is seeded into its own database the
+first time the benchmarks run and is kept between runs, pass --create-db to
+reseed it. Set BENCHMARK_SCALE to seed a fraction of the full dataset.
+"""
+
+import os
+import statistics
+
+import pytest
+from accounts.models import CaseGroups, User
+from core.models import Issue, UserWorkload
+from django.core.management import call_command
+from django.db import connection, connections
+from django.db.models import Count
+from django.test import Client
+from utils.queries import QueryRecorder
+
+# Size of the dataset seeded when BENCHMARK_SCALE is 1.
+DATASET_SIZE = {
+    "users": 5000,
+    "issues": 100_000,
+    "notes": 2_000_000,
+    "emails": 500_000,
+    "dates": 50_000,
+}
+# Number of times each request is timed.
+ROUNDS = 20
+PERCENTILES = (50, 95, 99)
+
+# Results of each benchmark, printed at the end of the run.
+results = []
+
+
+@pytest.fixture(scope="session")
+def django_db_modify_db_settings(django_db_modify_db_settings):
+    # Keep the seeded dataset apart from the test suite's database.
+    test_settings = connections["default"].settings_dict["TEST"]
+    test_settings["NAME"] = "test_benchmark"
+
+
+@pytest.fixture(scope="session")
+def benchmark_data(django_db_setup, django_db_blocker):
+    with django_db_blocker.unblock():
+        if not Issue.objects.exists():
+            scale = float(os.environ.get("BENCHMARK_SCALE", 1))
+            sizes = {k: max(int(v * scale), 1) for k, v in DATASET_SIZE.items()}
+            call_command("seed_benchmark_data", **sizes)
+
+
+@pytest.fixture(autouse=True)
+def use_zeal():
+    # Don't slow down requests by checking for N+1 queries.
+    yield
+
+
+@pytest.fixture
+def coordinator(benchmark_data) -> User:
+    return User.objects.filter(groups__name=CaseGroups.COORDINATOR).first()
+
+
+@pytest.fixture
+def paralegal(benchmark_data) -> User:
+    """
+    The paralegal with the most open cases.
+    """
+    workload = (
+        UserWorkload.objects.filter(user__groups__name=CaseGroups.PARALEGAL)
+        .order_by("-open_cases")
+        .first()
+    )
+    return workload.user
+
+
+@pytest.fixture
+def busiest_issue(benchmark_data) -> Issue:
+    """
+    The case with the most emails.
+    """
+    return (
+        Issue.objects.alias(email_count=Count("email")).order_by("-email_count").first()
+    )
+
+
+@pytest.fixture
+def bench_get(benchmark):
+    """
+    Returns a function which benchmarks a GET request by the given user.
+
+    Records the latency percentiles and number of queries run by the request
+    in the benchmark's extra_info.
+    """
+
+    def bench(user: User, url: str, params: dict | None = None):
+        client = Client()
+        client.force_login(user)
+
+        # Check the request works and count its queries before timing it.
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = client.get(url, params)
+
+        assert response.status_code == 200, response.status_code
+        benchmark.extra_info["queries"] = recorder.stats.count
+        benchmark.pedantic(
+            client.get, args=(url, params), rounds=ROUNDS, warmup_rounds=1
+        )
+        if benchmark.stats:
+            timings = benchmark.stats.stats.data
+            quantiles = statistics.quantiles(timings, n=100, method="inclusive")
+            for p in PERCENTILES:
+                benchmark.extra_info[f"p{p}_ms"] = round(quantiles[p - 1] * 1000, 1)
+
+        results.append((benchmark.name, benchmark.extra_info))
+        return response
+
+    return bench
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not results:
+        return
+
+    terminalreporter.section("latency percentiles and query counts")
+    columns = [f"p{p}_ms" for p in PERCENTILES] + ["queries"]
+    width = max(len(name) for name, _ in results)
+    terminalreporter.write_line(
+        "Name".ljust(width) + "".join(c.rjust(10) for c in columns)
+    )
+    for name, info in results:
+        values = "".join(str(info.get(c, "-")).rjust(10) for c in columns)
+        terminalreporter.write_line(name.ljust(width) + values)
@@ -1,8 +1,8 @@
 from accounts.role import UserRole
 
 
-def annotate_group_access(user):
-    UserRole.annotate_user(user)
+def annotate_group_access(user, session=None):
+    UserRole.annotate_user(user, session)
 
 
 def annotate_group_access_middleware(get_response):
@@ -11,7 +11,9 @@ def annotate_group_access_middleware(get_response):
         # the view (and later middleware) are called.
         user = request.user
         if user and user.is_authenticated:
-            annotate_group_access(user)
+            # Cache the user's groups in their session, if they have one.
+            session = request.session if request.session.session_key else None
+            annotate_group_access(user, session)
         return get_response(request)
 
     return middleware
@@ -13,6 +13,7 @@ from .email import (
     EmailSerializer,
     EmailTemplateSerializer,
     EmailThreadSerializer,
+    EmailThreadSummarySerializer,
 )
 from .issue import (
     IssueNoteSearchSerializer,
@@ -44,6 +45,7 @@ __all__ = [
     "EmailSerializer",
     "EmailTemplateSerializer",
     "EmailThreadSerializer",
+    "EmailThreadSummarySerializer",
     "IssueNoteSearchSerializer",
     "IssueNoteSerializer",
     "IssueSearchSerializer",
@@ -54,7 +54,7 @@ class EmailAttachmentSerializer(serializers.ModelSerializer):
         # one (after base64 encoding) rather than this file in isolation.
         if email is not None:
             used = get_email_payload_size(
-                email.text, email.html, email.attachments.all()
+                email.text, email.html, email.attachments_payload_bytes
             )
             if used + base64_size(file.size) > MAX_EMAIL_SIZE_BYTES:
                 # Attachments are base64 encoded (~33% larger) for delivery, so
@@ -109,7 +109,7 @@ class EmailSerializer(serializers.ModelSerializer):
             size = get_email_payload_size(
                 attrs.get("text", self.instance.text),
                 attrs.get("html", self.instance.html),
-                self.instance.attachments.all(),
+                self.instance.attachments_payload_bytes,
             )
             if size > MAX_EMAIL_SIZE_BYTES:
                 raise serializers.ValidationError(
@@ -139,3 +139,23 @@ class EmailThreadSerializer(serializers.Serializer):
 
     def get_url(self, obj):
         return reverse("case-email-thread", args=(obj.issue.pk, obj.slug))
+
+
+class EmailThreadSummarySerializer(serializers.Serializer):
+    """
+    Per-thread email counts, from the rows of get_email_thread_summaries.
+    """
+
+    subject = serializers.CharField(source="thread_subject", read_only=True)
+    slug = serializers.CharField(source="thread_name", read_only=True)
+    most_recent = LocalTimeField()
+    email_count = serializers.IntegerField(read_only=True)
+    draft_count = serializers.IntegerField(read_only=True)
+    sent_count = serializers.IntegerField(read_only=True)
+    delivered_count = serializers.IntegerField(read_only=True)
+    delivery_failure_count = serializers.IntegerField(read_only=True)
+    ingested_count = serializers.IntegerField(read_only=True)
+    url = serializers.SerializerMethodField()
+
+    def get_url(self, obj):
+        return reverse("case-email-thread", args=(obj["issue"], obj["thread_name"]))
@@ -11,6 +11,15 @@ from case.middleware import annotate_group_access
 from .fields import LocalDateField, SlugRelatedTextChoiceField
 
 
+def is_ms_account_set_up(ms_account_created_at) -> bool:
+    """
+    MS accounts take a while to be usable after they're created.
+    """
+    fifteen_minutes_ago = timezone.now() - timezone.timedelta(minutes=15)
+    is_set_up = ms_account_created_at and (ms_account_created_at < fifteen_minutes_ago)
+    return bool(is_set_up)
+
+
 class PotentialUserSerializer(serializers.Serializer):
     email = serializers.CharField(source="primaryEmail")
     first_name = serializers.CharField(source="name.givenName")
@@ -116,11 +125,7 @@ class UserSerializer(serializers.ModelSerializer):
         return super().update(instance, validated_data)
 
     def get_is_ms_account_set_up(self, obj):
-        fifteen_minutes_ago = timezone.now() - timezone.timedelta(minutes=15)
-        is_set_up = obj.ms_account_created_at and (
-            obj.ms_account_created_at < fifteen_minutes_ago
-        )
-        return bool(is_set_up)
+        return is_ms_account_set_up(obj.ms_account_created_at)
 
     def get_full_name(self, obj):
         return obj.get_full_name().title()
@@ -0,0 +1,83 @@
+import logging
+from functools import partial
+
+from accounts import events
+from accounts.models import User
+from core.models import Client, Issue, IssueNote, Person, Tenancy
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django_q.tasks import async_task
+
+from case.utils.summary import update_issue_summaries
+
+logger = logging.getLogger(__name__)
+
+# User fields which are saved on login and aren't included in Issue summaries.
+USER_LOGIN_FIELDS = {"last_login"}
+
+
+def dispatch_summary_update(issues):
+    issue_ids = list(issues.order_by().values_list("pk", flat=True))
+    if issue_ids:
+        logger.info("Dispatching summary update task for %s Issues", len(issue_ids))
+        transaction.on_commit(partial(async_task, update_issue_summaries, issue_ids))
+
+
+def rebuild_summary_on_commit(issue_id):
+    """
+    Rebuild a single Issue's summary once the change is committed, so that the
+    summary never reflects data which was rolled back or not yet visible.
+    """
+    transaction.on_commit(partial(update_issue_summaries, [issue_id]), robust=True)
+
+
+@receiver(post_save, sender=Issue)
+def post_save_issue_summary(sender, instance, **kwargs):
+    rebuild_summary_on_commit(instance.pk)
+
+
+@receiver(post_save, sender=IssueNote)
+@receiver(post_delete, sender=IssueNote)
+def post_change_issue_note_summary(sender, instance, **kwargs):
+    rebuild_summary_on_commit(instance.issue_id)
+
+
+@receiver(post_save, sender=Client)
+def post_save_client_summary(sender, instance, created, **kwargs):
+    if not created:
+        dispatch_summary_update(Issue.objects.filter(client=instance))
+
+
+@receiver(post_save, sender=Tenancy)
+def post_save_tenancy_summary(sender, instance, created, **kwargs):
+    if not created:
+        dispatch_summary_update(Issue.objects.filter(tenancy=instance))
+
+
+@receiver(post_save, sender=Person)
+def post_save_person_summary(sender, instance, created, **kwargs):
+    if not created:
+        q_filter = (
+            Q(tenancy__landlord=instance)
+            | Q(tenancy__agent=instance)
+            | Q(support_worker=instance)
+        )
+        dispatch_summary_update(Issue.objects.filter(q_filter))
+
+
+@receiver(post_save, sender=User)
+def post_save_user_summary(sender, instance, created, update_fields, **kwargs):
+    # Users are saved on every login, skip saves that only record the login.
+    if created or (update_fields and set(update_fields) <= USER_LOGIN_FIELDS):
+        return
+
+    dispatch_summary_update(
+        Issue.objects.filter(Q(paralegal=instance) | Q(lawyer=instance))
+    )
+
+
+@receiver(events.user_role_changed)
+def user_role_changed_summary(sender, user, **kwargs):
+    dispatch_summary_update(Issue.objects.filter(Q(paralegal=user) | Q(lawyer=user)))
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import Callable
 
+import pytest
 from accounts.models import User
 from core.factories import (
     EmailTemplateFactory,
@@ -11,6 +12,10 @@ from core.factories import (
 from factory.django import DjangoModelFactory
 
 
+# Number of rows list tests create, so that queries run once per row show up.
+ROW_COUNT = 3
+
+
 class Action:
     LIST = "LIST"
     RETRIEVE = "RETRIEVE"
@@ -33,6 +38,8 @@ class APIViewTestCase:
     # Returns true if user should have write permissions
     test_write_permissions: Callable[[User], bool]
     # Note: neither of these flags check for object-level permissions
+    # Maximum number of queries each action's request may run
+    query_budgets: dict[str, int]
 
 
 GENERIC_API_TEST_CASES = [
@@ -42,6 +49,7 @@ GENERIC_API_TEST_CASES = [
         test_read_permissions=lambda user: user.is_coordinator_or_better,
         test_write_permissions=lambda user: user.is_coordinator_or_better,
         actions=[Action.LIST, Action.UPDATE],  # Create tested elsewhere.
+        query_budgets={Action.LIST: 10, Action.UPDATE: 11},
     ),
     APIViewTestCase(
         factory=EmailTemplateFactory,
@@ -49,6 +57,13 @@ GENERIC_API_TEST_CASES = [
         test_read_permissions=lambda user: user.is_admin_or_better,
         test_write_permissions=lambda user: user.is_admin_or_better,
         actions=Action.ALL,
+        query_budgets={
+            Action.LIST: 7,
+            Action.RETRIEVE: 7,
+            Action.UPDATE: 8,
+            Action.CREATE: 6,
+            Action.DELETE: 8,
+        },
     ),
     APIViewTestCase(
         factory=NotificationFactory,
@@ -56,5 +71,29 @@ GENERIC_API_TEST_CASES = [
         test_read_permissions=lambda user: user.is_admin_or_better,
         test_write_permissions=lambda user: user.is_admin_or_better,
         actions=Action.ALL,
+        query_budgets={
+            Action.LIST: 7,
+            Action.RETRIEVE: 7,
+            Action.UPDATE: 8,
+            Action.CREATE: 6,
+            Action.DELETE: 8,
+        },
     ),
 ]
+
+
+def get_test_case_params(action: str) -> list:
+    """
+    Returns pytest params for the test cases which include the given action,
+    marked with that action's query budget. List tests create ROW_COUNT rows.
+    """
+    rows = ROW_COUNT if action == Action.LIST else None
+    return [
+        pytest.param(
+            tc,
+            id=tc.base_view_name,
+            marks=pytest.mark.query_budget(tc.query_budgets[action], rows=rows),
+        )
+        for tc in GENERIC_API_TEST_CASES
+        if action in tc.actions
+    ]
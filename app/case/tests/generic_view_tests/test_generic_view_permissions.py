@@ -6,19 +6,19 @@ import pytest
 from accounts.models import CaseGroups, User
 from case.middleware import annotate_group_access
 from case.tests.generic_view_tests.generic_view_test_cases import (
-    GENERIC_API_TEST_CASES,
+    ROW_COUNT,
     Action,
     APIViewTestCase,
+    get_test_case_params,
 )
 from django.contrib.auth.models import Group
 from rest_framework.reverse import reverse
 
-LIST_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.LIST in tc.actions]
-LIST_TEST_CASE_IDS = [tc.base_view_name for tc in LIST_TEST_CASES]
+LIST_TEST_CASES = get_test_case_params(Action.LIST)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", LIST_TEST_CASES, ids=LIST_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", LIST_TEST_CASES)
 @pytest.mark.parametrize("group_name", CaseGroups.values)
 def test_generic_list_view_requires_permissions(
     user_client, user: User, test_case: APIViewTestCase, group_name: str
@@ -33,6 +33,7 @@ def test_generic_list_view_requires_permissions(
     # Apply group annotations (usually done in middleware)
     annotate_group_access(user)
     is_authorized = test_case.test_read_permissions(user)
+    test_case.factory.create_batch(ROW_COUNT)
 
     # Try view a list of items as the user (client logged in as user)
     list_view_name = f"{test_case.base_view_name}-list"
@@ -47,12 +48,11 @@ def test_generic_list_view_requires_permissions(
         assert response.status_code == 403
 
 
-CREATE_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.CREATE in tc.actions]
-CREATE_TEST_CASE_IDS = [tc.base_view_name for tc in CREATE_TEST_CASES]
+CREATE_TEST_CASES = get_test_case_params(Action.CREATE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", CREATE_TEST_CASES, ids=CREATE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", CREATE_TEST_CASES)
 @pytest.mark.parametrize("group_name", CaseGroups.values)
 def test_generic_create_view_requires_permissions(
     user_client, user: User, test_case: APIViewTestCase, group_name: str
@@ -81,14 +81,11 @@ def test_generic_create_view_requires_permissions(
         assert response.status_code == 403
 
 
-RETRIEVE_TEST_CASES = [
-    tc for tc in GENERIC_API_TEST_CASES if Action.RETRIEVE in tc.actions
-]
-RETRIEVE_TEST_CASE_IDS = [tc.base_view_name for tc in RETRIEVE_TEST_CASES]
+RETRIEVE_TEST_CASES = get_test_case_params(Action.RETRIEVE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", RETRIEVE_TEST_CASES, ids=RETRIEVE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", RETRIEVE_TEST_CASES)
 @pytest.mark.parametrize("group_name", CaseGroups.values)
 def test_generic_detail_view_requires_permissions(
     user_client, user: User, test_case: APIViewTestCase, group_name: str
@@ -119,12 +116,11 @@ def test_generic_detail_view_requires_permissions(
         assert response.status_code == 403
 
 
-UPDATE_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.UPDATE in tc.actions]
-UPDATE_TEST_CASE_IDS = [tc.base_view_name for tc in UPDATE_TEST_CASES]
+UPDATE_TEST_CASES = get_test_case_params(Action.UPDATE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", UPDATE_TEST_CASES, ids=UPDATE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", UPDATE_TEST_CASES)
 @pytest.mark.parametrize("group_name", CaseGroups.values)
 def test_generic_update_view_requires_permissions(
     user_client, user: User, test_case: APIViewTestCase, group_name: str
@@ -155,12 +151,11 @@ def test_generic_update_view_requires_permissions(
         assert response.status_code == 403
 
 
-DELETE_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.DELETE in tc.actions]
-DELETE_TEST_CASE_IDS = [tc.base_view_name for tc in DELETE_TEST_CASES]
+DELETE_TEST_CASES = get_test_case_params(Action.DELETE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", DELETE_TEST_CASES, ids=DELETE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", DELETE_TEST_CASES)
 @pytest.mark.parametrize("group_name", CaseGroups.values)
 def test_generic_delete_view_requires_permissions(
     user_client, user: User, test_case: APIViewTestCase, group_name: str
@@ -7,25 +7,25 @@ import uuid
 
 import pytest
 from case.tests.generic_view_tests.generic_view_test_cases import (
-    GENERIC_API_TEST_CASES,
+    ROW_COUNT,
     Action,
     APIViewTestCase,
+    get_test_case_params,
 )
 from rest_framework.reverse import reverse
 
-LIST_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.LIST in tc.actions]
-LIST_TEST_CASE_IDS = [tc.base_view_name for tc in LIST_TEST_CASES]
+LIST_TEST_CASES = get_test_case_params(Action.LIST)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", LIST_TEST_CASES, ids=LIST_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", LIST_TEST_CASES)
 def test_generic_list_view_schema(superuser_client, test_case: APIViewTestCase) -> None:
     """
     Ensure that a given view's API list view matches the schema.
     """
-    # Create an instance of the model
+    # Create several instances of the model
     Model = test_case.factory._meta.model
-    instance = test_case.factory.create()
+    *_, instance = test_case.factory.create_batch(ROW_COUNT)
     instance_count = Model.objects.count()
 
     # Try view a list of instances
@@ -55,14 +55,11 @@ def test_generic_list_view_schema(superuser_client, test_case: APIViewTestCase)
         assert instance.id in ids
 
 
-RETRIEVE_TEST_CASES = [
-    tc for tc in GENERIC_API_TEST_CASES if Action.RETRIEVE in tc.actions
-]
-RETRIEVE_TEST_CASE_IDS = [tc.base_view_name for tc in RETRIEVE_TEST_CASES]
+RETRIEVE_TEST_CASES = get_test_case_params(Action.RETRIEVE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", RETRIEVE_TEST_CASES, ids=RETRIEVE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", RETRIEVE_TEST_CASES)
 def test_generic_detail_view_schema(
     superuser_client, test_case: APIViewTestCase
 ) -> None:
@@ -85,12 +82,11 @@ def test_generic_detail_view_schema(
         assert response.json()["id"] == instance.id
 
 
-DELETE_TEST_CASES = [tc for tc in GENERIC_API_TEST_CASES if Action.DELETE in tc.actions]
-DELETE_TEST_CASE_IDS = [tc.base_view_name for tc in DELETE_TEST_CASES]
+DELETE_TEST_CASES = get_test_case_params(Action.DELETE)
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", DELETE_TEST_CASES, ids=DELETE_TEST_CASE_IDS)
+@pytest.mark.parametrize("test_case", DELETE_TEST_CASES)
 def test_generic_delete_view_schema(
     superuser_client, test_case: APIViewTestCase
 ) -> None:
@@ -4,9 +4,10 @@ ie. not JSON API endpoints
 """
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
 
 import pytest
+from case.tests.generic_view_tests.generic_view_test_cases import ROW_COUNT
 from core import factories
 from django.urls import reverse
 from factory.django import DjangoModelFactory
@@ -27,80 +28,188 @@ class PageTestCase:
     name: str
     is_detail: bool
     factory: Optional[DjangoModelFactory]
+    # Maximum number of queries the page may run
+    query_budget: int
+    # Creates ROW_COUNT rows which the detail page lists for the instance
+    create_rows: Optional[Callable] = None
 
 
 PAGE_TEST_CASE = [
-    PageTestCase(name="case-list", factory=factories.IssueFactory, is_detail=False),
-    PageTestCase(name="case-review", factory=factories.IssueFactory, is_detail=False),
-    PageTestCase(name="case-inbox", factory=factories.IssueFactory, is_detail=False),
-    PageTestCase(name="case-detail", factory=factories.IssueFactory, is_detail=True),
-    PageTestCase(name="case-docs", factory=factories.IssueFactory, is_detail=True),
-    PageTestCase(name="case-date-list", factory=factories.IssueFactory, is_detail=True),
-    PageTestCase(name="case-create", factory=None, is_detail=False),
-    PageTestCase(name="case-services", factory=factories.IssueFactory, is_detail=True),
-    PageTestCase(name="date-list", factory=None, is_detail=False),
-    PageTestCase(name="person-list", factory=factories.PersonFactory, is_detail=False),
-    PageTestCase(
-        name="person-create", factory=factories.PersonFactory, is_detail=False
-    ),
-    PageTestCase(name="person-detail", factory=factories.PersonFactory, is_detail=True),
-    PageTestCase(
-        name="tenancy-detail", factory=factories.TenancyFactory, is_detail=True
-    ),
-    PageTestCase(name="client-detail", factory=factories.ClientFactory, is_detail=True),
-    PageTestCase(name="account-list", factory=factories.UserFactory, is_detail=False),
-    PageTestCase(name="account-create", factory=None, is_detail=False),
-    PageTestCase(name="account-detail", factory=factories.UserFactory, is_detail=True),
-    PageTestCase(name="paralegal-list", factory=factories.UserFactory, is_detail=False),
-    PageTestCase(name="template-list", factory=None, is_detail=False),
+    PageTestCase(
+        name="case-list",
+        factory=factories.IssueFactory,
+        is_detail=False,
+        query_budget=6,
+    ),
+    PageTestCase(
+        name="case-review",
+        factory=factories.IssueFactory,
+        is_detail=False,
+        query_budget=10,
+    ),
+    PageTestCase(
+        name="case-inbox",
+        factory=factories.IssueFactory,
+        is_detail=False,
+        query_budget=10,
+    ),
+    PageTestCase(
+        name="case-detail",
+        factory=factories.IssueFactory,
+        is_detail=True,
+        query_budget=7,
+    ),
+    PageTestCase(
+        name="case-docs", factory=factories.IssueFactory, is_detail=True, query_budget=7
+    ),
+    PageTestCase(
+        name="case-date-list",
+        factory=factories.IssueFactory,
+        is_detail=True,
+        query_budget=7,
+    ),
+    PageTestCase(name="case-create", factory=None, is_detail=False, query_budget=6),
+    PageTestCase(
+        name="case-services",
+        factory=factories.IssueFactory,
+        is_detail=True,
+        query_budget=7,
+    ),
+    PageTestCase(name="date-list", factory=None, is_detail=False, query_budget=6),
+    PageTestCase(
+        name="person-list",
+        factory=factories.PersonFactory,
+        is_detail=False,
+        query_budget=6,
+    ),
+    PageTestCase(
+        name="person-create",
+        factory=factories.PersonFactory,
+        is_detail=False,
+        query_budget=6,
+    ),
+    PageTestCase(
+        name="person-detail",
+        factory=factories.PersonFactory,
+        is_detail=True,
+        query_budget=8,
+        create_rows=lambda person: factories.IssueFactory.create_batch(
+            ROW_COUNT, tenancy__landlord=person
+        ),
+    ),
+    PageTestCase(
+        name="tenancy-detail",
+        factory=factories.TenancyFactory,
+        is_detail=True,
+        query_budget=11,
+        create_rows=lambda tenancy: factories.IssueFactory.create_batch(
+            ROW_COUNT, tenancy=tenancy
+        ),
+    ),
+    PageTestCase(
+        name="client-detail",
+        factory=factories.ClientFactory,
+        is_detail=True,
+        query_budget=8,
+        create_rows=lambda client: factories.IssueFactory.create_batch(
+            ROW_COUNT, client=client
+        ),
+    ),
+    PageTestCase(
+        name="account-list",
+        factory=factories.UserFactory,
+        is_detail=False,
+        query_budget=6,
+    ),
+    PageTestCase(name="account-create", factory=None, is_detail=False, query_budget=6),
+    PageTestCase(
+        name="account-detail",
+        factory=factories.UserFactory,
+        is_detail=True,
+        query_budget=7,
+    ),
+    PageTestCase(
+        name="paralegal-list",
+        factory=factories.UserFactory,
+        is_detail=False,
+        query_budget=8,
+    ),
+    PageTestCase(name="template-list", factory=None, is_detail=False, query_budget=6),
     PageTestCase(
         name="template-email-list",
         factory=factories.EmailTemplateFactory,
         is_detail=False,
+        query_budget=6,
     ),
     PageTestCase(
         name="template-email-create",
         factory=factories.EmailTemplateFactory,
         is_detail=False,
+        query_budget=6,
     ),
     PageTestCase(
         name="template-email-detail",
         factory=factories.EmailTemplateFactory,
         is_detail=True,
+        query_budget=7,
     ),
     PageTestCase(
         name="template-notify-list",
         factory=factories.NotificationFactory,
         is_detail=False,
+        query_budget=7,
     ),
     PageTestCase(
         name="template-notify-create",
         factory=factories.NotificationFactory,
         is_detail=False,
+        query_budget=6,
     ),
     PageTestCase(
         name="template-notify-detail",
         factory=factories.NotificationFactory,
         is_detail=True,
+        query_budget=7,
+    ),
+    PageTestCase(
+        name="template-doc-list", factory=None, is_detail=False, query_budget=6
+    ),
+    PageTestCase(
+        name="template-doc-create", factory=None, is_detail=False, query_budget=6
     ),
-    PageTestCase(name="template-doc-list", factory=None, is_detail=False),
-    PageTestCase(name="template-doc-create", factory=None, is_detail=False),
 ]
 
-TEST_NAMES = [tc.name for tc in PAGE_TEST_CASE]
+
+def get_test_case_params(test_cases: list[PageTestCase]) -> list:
+    """
+    Returns pytest params for the test cases, marked with their query budget.
+    """
+    return [
+        pytest.param(
+            tc,
+            id=tc.name,
+            marks=pytest.mark.query_budget(tc.query_budget, rows=ROW_COUNT),
+        )
+        for tc in test_cases
+    ]
 
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", PAGE_TEST_CASE, ids=TEST_NAMES)
+@pytest.mark.parametrize("test_case", get_test_case_params(PAGE_TEST_CASE))
 def test_case_page_status_code(superuser_client, test_case):
     """
     Ensure URLs return the correct status code.
     """
-    instance = test_case.factory() if test_case.factory else None
+    instance = None
     if test_case.is_detail:
-        assert instance, "A factory is required"
+        assert test_case.factory, "A factory is required"
+        instance = test_case.factory()
+        if test_case.create_rows:
+            test_case.create_rows(instance)
         url = reverse(test_case.name, args=(instance.pk,))
     else:
+        if test_case.factory:
+            test_case.factory.create_batch(ROW_COUNT)
         url = reverse(test_case.name)
 
     response = superuser_client.get(url)
@@ -110,22 +219,31 @@ def test_case_page_status_code(superuser_client, test_case):
 
 EMAIL_PAGE_TEST_CASE = [
     PageTestCase(
-        name="case-email-list", factory=factories.EmailFactory, is_detail=False
+        name="case-email-list",
+        factory=factories.EmailFactory,
+        is_detail=False,
+        query_budget=9,
     ),
-    PageTestCase(name="case-email-draft", factory=None, is_detail=False),
     PageTestCase(
-        name="case-email-edit", factory=factories.EmailFactory, is_detail=True
+        name="case-email-draft", factory=None, is_detail=False, query_budget=9
     ),
     PageTestCase(
-        name="case-email-preview", factory=factories.EmailFactory, is_detail=True
+        name="case-email-edit",
+        factory=factories.EmailFactory,
+        is_detail=True,
+        query_budget=11,
+    ),
+    PageTestCase(
+        name="case-email-preview",
+        factory=factories.EmailFactory,
+        is_detail=True,
+        query_budget=11,
     ),
 ]
 
-EMAIL_TEST_NAMES = [tc.name for tc in EMAIL_PAGE_TEST_CASE]
-
 
 @pytest.mark.django_db
-@pytest.mark.parametrize("test_case", EMAIL_PAGE_TEST_CASE, ids=EMAIL_TEST_NAMES)
+@pytest.mark.parametrize("test_case", get_test_case_params(EMAIL_PAGE_TEST_CASE))
 def test_case_email_page_status_code(superuser_client, test_case):
     """
     Ensure URLs return the correct status code for email pages.
@@ -133,7 +251,7 @@ def test_case_email_page_status_code(superuser_client, test_case):
     email = None
     issue = factories.IssueFactory()
     if test_case.factory:
-        email = test_case.factory(issue=issue)
+        *_, email = test_case.factory.create_batch(ROW_COUNT, issue=issue)
     if test_case.is_detail:
         assert email, "A factory is required"
         url = reverse(
@@ -149,12 +267,13 @@ def test_case_email_page_status_code(superuser_client, test_case):
 
 
 @pytest.mark.django_db
+@pytest.mark.query_budget(9, rows=ROW_COUNT)
 def test_case_thread_view_page_status_code(superuser_client):
     """
     Ensure URLs return the correct status code for email thread view page.
     """
     issue = factories.IssueFactory()
-    factories.EmailFactory(issue=issue, subject="foo")
+    factories.EmailFactory.create_batch(ROW_COUNT, issue=issue, subject="foo")
     url = reverse("case-email-thread", args=(issue.pk, "foo"))
     response = superuser_client.get(url)
     msg = f"URL name case-email-thread failed, expecting status 200 got {response.status_code}"
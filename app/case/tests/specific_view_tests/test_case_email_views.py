@@ -9,7 +9,11 @@ from unittest.mock import Mock, patch
 
 import pytest
 from accounts.models import User
-from case.views.case_email import EmailThread, get_email_threads
+from case.views.case_email import (
+    EmailThread,
+    get_email_thread_summaries,
+    get_email_threads,
+)
 from core.factories import (
     EmailAttachmentFactory,
     EmailFactory,
@@ -17,7 +21,8 @@ from core.factories import (
     get_dummy_file,
 )
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from emails.models import Email, EmailAttachment, EmailState
+from emails.models import Email, EmailAttachment, EmailState, SharepointState
+from emails.utils.size import base64_size
 from rest_framework.reverse import reverse
 
 
@@ -34,6 +39,42 @@ def test_case_email_list_view(superuser_client):
     assert len(threads) == 3
 
 
+@pytest.mark.django_db
+def test_case_email_thread_view(superuser_client):
+    issue = IssueFactory()
+    for state, subject, created_at in THREADED_EMAILS:
+        EmailFactory(issue=issue, state=state, subject=subject, created_at=created_at)
+
+    url = reverse("email-api-detail", args=(issue.pk,))
+    response = superuser_client.get(url, {"slug": "legal-advice"})
+    assert response.status_code == 200, response.json()
+    [thread] = response.json()
+    assert thread["slug"] == "legal-advice"
+    assert len(thread["emails"]) == 4
+
+
+@pytest.mark.django_db
+@pytest.mark.query_budget(9)
+def test_case_email_thread_list_view(superuser_client):
+    issue = IssueFactory()
+    for state, subject, created_at in THREADED_EMAILS:
+        EmailFactory(issue=issue, state=state, subject=subject, created_at=created_at)
+
+    url = reverse("email-api-thread-list", args=(issue.pk,))
+    response = superuser_client.get(url, {"page_size": 2})
+    assert response.status_code == 200, response.json()
+    data = response.json()
+    assert data["item_count"] == 3
+    assert data["page_count"] == 2
+    assert [t["slug"] for t in data["results"]] == [
+        "a-quick-question",
+        "legal-advice",
+    ]
+    assert data["results"][1]["url"] == reverse(
+        "case-email-thread", args=(issue.pk, "legal-advice")
+    )
+
+
 @pytest.mark.django_db
 def test_case_email_get_view(superuser_client):
     email = EmailFactory(state=EmailState.DRAFT)
@@ -107,6 +148,9 @@ def test_case_email_add_attachment_view(superuser_client):
     attachment = EmailAttachment.objects.get(pk=attach_data["id"])
     assert attachment.email == email
     assert attachment.file.read() == b"Hello World!"
+    assert attachment.size_bytes == 12
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == base64_size(12)
 
 
 @pytest.mark.django_db
@@ -170,6 +214,8 @@ def test_case_email_delete_attachment_view(superuser_client):
     response = superuser_client.delete(url)
     assert response.status_code == 204
     assert EmailAttachment.objects.count() == 0
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == 0
 
 
 @pytest.mark.django_db
@@ -188,6 +234,29 @@ def test_case_email_upload_attachment_to_sharepoint_view(
     mock_save_email_attachment.assert_called_once_with(email, attachment)
 
 
+@pytest.mark.django_db
+@patch("case.views.case_email.save_email_attachment")
+def test_case_email_upload_attachment_to_sharepoint_view_already_uploaded(
+    mock_save_email_attachment, superuser_client, settings, tmpdir
+):
+    settings.MEDIA_ROOT = str(tmpdir)
+    uploaded = EmailAttachmentFactory(
+        file=get_dummy_file("image.png"), sharepoint_state=SharepointState.UPLOADED
+    )
+    email = EmailFactory(state=EmailState.DRAFT, issue=uploaded.email.issue)
+    # The same file is attached to another email on the case.
+    attachment = EmailAttachmentFactory(email=email, file=get_dummy_file("image.png"))
+    url = reverse(
+        "email-api-attachment-sharepoint-upload",
+        args=(email.issue.pk, email.pk, attachment.pk),
+    )
+    response = superuser_client.post(url)
+    assert response.status_code == 204
+    mock_save_email_attachment.assert_not_called()
+    attachment.refresh_from_db()
+    assert attachment.sharepoint_state == SharepointState.UPLOADED
+
+
 @pytest.mark.django_db
 @patch("case.views.case_email.MSGraphAPI")
 def test_case_email_download_attachment_from_sharepoint_view(
@@ -278,3 +347,41 @@ def test_email_thread_aggregation():
     assert threads[0].subject == "A quick question"
     assert threads[0].slug == "a-quick-question"
     assert threads[0].emails == list(reversed(emails[12:13]))
+
+
+@pytest.mark.django_db
+def test_email_thread_summaries():
+    issue = IssueFactory()
+    for state, subject, created_at in THREADED_EMAILS:
+        EmailFactory(issue=issue, state=state, subject=subject, created_at=created_at)
+
+    # Emails which aren't displayed are not counted.
+    EmailFactory(issue=issue, state=EmailState.READY_TO_SEND, subject="Legal Advice")
+    EmailFactory(state=EmailState.SENT, subject="Legal Advice")
+
+    threads = list(get_email_thread_summaries(issue))
+    assert [t["thread_name"] for t in threads] == [
+        "a-quick-question",
+        "legal-advice",
+        "r00956-case-closure",
+    ]
+    closure = threads[2]
+    assert closure["thread_subject"] == "R00956 Case Closure"
+    assert closure["most_recent"] == dt(8)
+    assert closure["email_count"] == 8
+    assert closure["sent_count"] == 4
+    assert closure["ingested_count"] == 3
+    assert closure["draft_count"] == 1
+    assert closure["delivered_count"] == closure["delivery_failure_count"] == 0
+    assert threads[1]["email_count"] == 4
+    assert threads[1]["thread_subject"] == "Legal Advice"
+
+
+@pytest.mark.django_db
+def test_email_thread_without_subject():
+    issue = IssueFactory()
+    email = EmailFactory(issue=issue, state=EmailState.INGESTED, subject="Re:")
+    assert email.thread_name == "no-subject"
+    [thread] = get_email_thread_summaries(issue)
+    assert thread["thread_name"] == "no-subject"
+    assert thread["thread_subject"] == "Re:"
@@ -1,14 +1,24 @@
+from decimal import Decimal
+from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 from accounts.models import User
+from auditlog.models import LogEntry
 from case.middleware import annotate_group_access
+from case.utils.pagination import ClerkPaginator, get_ordering_values
+from case.views.case import CasePaginator
 from core import factories
-from core.models import Issue, IssueNote
+from core.models import AuditEvent, Issue, IssueNote
 from core.models.issue import CaseStage
 from core.models.service import ServiceCategory
+from core.signals.issue_date import handle_issue_date_log
+from django.db.models import F
 from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
 from rest_framework.reverse import reverse
+from rest_framework.test import APIClient, APIRequestFactory
 
 
 @pytest.mark.django_db
@@ -128,6 +138,156 @@ def test_case_list_view__search(superuser_client):
     assert results[0]["id"] == str(issue_a.pk)
 
 
+@pytest.mark.django_db
+def test_case_list_view__search_client_details(superuser_client):
+    client = factories.ClientFactory(last_name="Qzcitizen", phone_number="0412 345 678")
+    issue_a = factories.IssueFactory(client=client)
+    factories.IssueFactory()
+    url = reverse("case-api-list")
+
+    for search in ("qzcitizen", "0412345678"):
+        response = superuser_client.get(url, {"search": search})
+        assert response.status_code == 200
+        results = response.json()["results"]
+        assert [r["id"] for r in results] == [str(issue_a.pk)]
+
+
+@pytest.mark.django_db
+def test_case_list_view__cursor_pagination(superuser_client):
+    issues = factories.IssueFactory.create_batch(5)
+    # Identical timestamps are ordered by primary key.
+    Issue.objects.filter(pk__in=[i.pk for i in issues[:2]]).update(
+        created_at=issues[0].created_at
+    )
+    expected = list(
+        Issue.objects.order_by("-created_at", "-pk").values_list("id", flat=True)
+    )
+    url = reverse("case-api-list")
+
+    seen = []
+    params = {"cursor": "", "page_size": 2}
+    for page_number in (1, 2, 3):
+        response = superuser_client.get(url, params)
+        assert response.status_code == 200
+        resp_data = response.json()
+        assert resp_data["current"] == page_number
+        assert resp_data["item_count"] == 5
+        assert resp_data["page_count"] == 3
+        seen += [r["id"] for r in resp_data["results"]]
+        params["cursor"] = resp_data["next_cursor"]
+
+    assert seen == [str(pk) for pk in expected]
+    assert resp_data["next_cursor"] is None
+
+    # Go back a page.
+    response = superuser_client.get(
+        url, {"cursor": resp_data["prev_cursor"], "page_size": 2}
+    )
+    resp_data = response.json()
+    assert resp_data["current"] == 2
+    assert [r["id"] for r in resp_data["results"]] == seen[2:4]
+
+    response = superuser_client.get(url, {"cursor": "nonsense"})
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_case_list_view__cursor_pagination_counts_once(superuser_client):
+    factories.IssueFactory.create_batch(3)
+    url = reverse("case-api-list")
+    response = superuser_client.get(url, {"cursor": "", "page_size": 2})
+    cursor = response.json()["next_cursor"]
+
+    # Later pages use the count from the first page.
+    with patch.object(CasePaginator, "get_count") as mock_get_count:
+        response = superuser_client.get(url, {"cursor": cursor, "page_size": 2})
+
+    assert response.status_code == 200
+    mock_get_count.assert_not_called()
+    resp_data = response.json()
+    assert resp_data["item_count"] == 3
+    assert len(resp_data["results"]) == 1
+
+
+class CursorPaginator(ClerkPaginator):
+    page_size = 2
+    allow_cursor = True
+
+
+def get_cursor_page(queryset, cursor: str) -> tuple[list, dict]:
+    request = Request(APIRequestFactory().get("/", {"cursor": cursor}))
+    paginator = CursorPaginator()
+    items = paginator.paginate_queryset(queryset, request)
+    return items, paginator.get_paginated_response([]).data
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("field", ["outcome", "-outcome", "paralegal__first_name"])
+def test_cursor_pagination__null_sort_values(field):
+    """
+    Rows with null sort values, or a missing related row, are paged through
+    in the database's order.
+    """
+    paralegal = factories.UserFactory(first_name="Alex")
+    factories.IssueFactory.create_batch(2, outcome=None, paralegal=None)
+    factories.IssueFactory.create_batch(2, outcome="RESOLVED_EARLY")
+    factories.IssueFactory(outcome="CHURNED", paralegal=paralegal)
+    queryset = Issue.objects.order_by(field)
+    pk_field = "-pk" if field.startswith("-") else "pk"
+    expected = list(Issue.objects.order_by(field, pk_field))
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        items, data = get_cursor_page(queryset, cursor)
+        seen += items
+        cursor = data["next_cursor"]
+
+    assert seen == expected
+
+    # Page back from the last page.
+    items, data = get_cursor_page(queryset, data["prev_cursor"])
+    assert items == expected[2:4]
+
+
+def test_get_ordering_values():
+    instance = SimpleNamespace(amount=Decimal("1.50"), paralegal=None)
+    values = get_ordering_values(instance, ["-amount", "paralegal__first_name"])
+    assert values == ["1.50", None]
+
+
+@pytest.mark.django_db
+def test_cursor_pagination__expression_ordering():
+    queryset = Issue.objects.order_by(F("created_at").desc())
+    with pytest.raises(ValidationError):
+        get_cursor_page(queryset, "")
+
+
+@pytest.mark.django_db
+def test_case_list_view__estimated_count_too_low(superuser_client):
+    """
+    Pages past an estimated count which is too low can still be fetched.
+    """
+    factories.IssueFactory.create_batch(5)
+    url = reverse("case-api-list")
+
+    with patch.object(CasePaginator, "get_estimated_count", return_value=1):
+        response = superuser_client.get(url, {"page": 2, "page_size": 2})
+        assert response.status_code == 200
+        resp_data = response.json()
+        assert len(resp_data["results"]) == 2
+        assert resp_data["next"] == 3
+        assert resp_data["page_count"] == 3
+
+        response = superuser_client.get(url, {"page": 3, "page_size": 2})
+        assert response.status_code == 200
+        resp_data = response.json()
+        assert len(resp_data["results"]) == 1
+        assert resp_data["next"] is None
+
+        response = superuser_client.get(url, {"page": 4, "page_size": 2})
+        assert response.status_code == 404
+
+
 # TODO: Test permissions and who can see which notes
 @pytest.mark.django_db
 def test_case_get_view(superuser_client):
@@ -333,8 +493,8 @@ def test_case_create_note_view(superuser_client, superuser: User):
 
 # TODO: Test permissions
 @pytest.mark.django_db
-@patch("case.views.case.get_case_folder_info")
-def test_case_get_documents_view(mock_get_case_folder_info, superuser_client):
+@patch("case.views.case.get_case_documents")
+def test_case_get_documents_view(mock_get_case_documents, superuser_client):
     issue = factories.IssueFactory()
     url = reverse("case-api-docs", args=(issue.pk,))
     sharepoint_url = "https://example.com"
@@ -347,9 +507,12 @@ def test_case_get_documents_view(mock_get_case_folder_info, superuser_client):
             "is_file": True,
         }
     ]
-    mock_get_case_folder_info.return_value = docs, sharepoint_url
-    superuser_client.get(url)
-    mock_get_case_folder_info.assert_called_once_with(issue)
+    synced_at = timezone.now()
+    mock_get_case_documents.return_value = docs, sharepoint_url, synced_at
+    response = superuser_client.get(url)
+    mock_get_case_documents.assert_called_once_with(issue)
+    assert response.json()["documents"] == docs
+    assert response.json()["synced_at"] == synced_at.isoformat().replace("+00:00", "Z")
 
 
 @pytest.mark.django_db
@@ -454,3 +617,29 @@ def test_case_update_view__allowed_to_close_case_with_reviewed_critical_date(
     assert response.status_code == 200
     assert Issue.objects.count() == 1
     assert Issue.objects.last().stage == CaseStage.CLOSED
+
+
+@pytest.mark.django_db
+def test_case_detail_view__includes_issue_date_audit_events(superuser):
+    # Don't validate the response schema, which doesn't allow the null creator
+    # of system generated notes.
+    client = APIClient()
+    client.force_login(user=superuser)
+    issue = factories.IssueFactory()
+    for issue_date in (
+        factories.IssueDateFactory(issue=issue),
+        factories.IssueDateFactory(),  # On another case.
+    ):
+        log_entry = LogEntry.objects.log_create(
+            issue_date, force_log=True, action=LogEntry.Action.CREATE, changes={}
+        )
+        handle_issue_date_log(log_entry.pk, issue_date.issue_id)
+
+    audit_event = AuditEvent.objects.get(issue=issue)
+    url = reverse("case-api-detail", args=(issue.pk,))
+    response = client.get(url)
+
+    assert response.status_code == 200
+    notes = response.json()["notes"]
+    assert len(notes) == 1
+    assert notes[0]["text_display"] == audit_event.get_text()
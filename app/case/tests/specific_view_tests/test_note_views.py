@@ -32,6 +32,23 @@ def test_issue_note_list_api(superuser_client):
     assert set(x["id"] for x in results) == {instance_1.pk, instance_2.pk}
 
 
+@pytest.mark.django_db
+@pytest.mark.query_budget(12, rows=3)
+def test_issue_note_list_api__query_budget(superuser_client):
+    """
+    Listing notes doesn't run queries for each note's creator or reviewee.
+    """
+    IssueNoteFactory.create_batch(3, note_type=NoteType.PERFORMANCE)
+    IssueNoteFactory.create_batch(3, note_type=NoteType.REVIEW)
+
+    response = superuser_client.get(reverse("note-api-list"))
+
+    assert response.status_code == 200, response.json()
+    results = response.json()["results"]
+    assert len(results) == 6
+    assert all(r["reviewee"] for r in results if r["note_type"] == "PERFORMANCE")
+
+
 @pytest.mark.django_db
 def test_issue_note_list_api__search_filter(superuser_client):
     instance = IssueNoteFactory()
@@ -0,0 +1,136 @@
+from unittest import mock
+
+import pytest
+from case.serializers import IssueSerializer
+from case.utils.summary import get_issue_summary_data, update_issue_summaries
+from core.factories import (
+    ClientFactory,
+    IssueFactory,
+    IssueNoteFactory,
+    UserFactory,
+)
+from core.models import Issue, IssueNote, IssueSummary
+from core.models.issue_note import NoteType
+from django.db.models import Max
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_update_issue_summaries():
+    issue = IssueFactory(is_open=True)
+    review_at = timezone.now() + timezone.timedelta(days=7)
+    IssueNoteFactory(issue=issue, note_type=NoteType.REVIEW, event=review_at)
+    IssueNoteFactory(issue=issue, note_type=NoteType.CONFLICT_CHECK_SUCCESS)
+
+    (summary,) = update_issue_summaries([issue.pk])
+
+    issues = Issue.objects.filter(pk=issue.pk).annotate(
+        next_review=Max("issuenote__event")
+    )
+    expected = IssueSerializer(IssueNote.annotate_with_eligibility_checks(issues).get())
+    assert summary.is_open
+    assert summary.created_at == issue.created_at
+    assert summary.next_review == review_at
+    assert summary.data == expected.data
+    assert summary.data["is_conflict_check"] is True
+    assert summary.data["is_eligibility_check"] is False
+
+
+@pytest.mark.django_db
+def test_get_issue_summary_data__builds_missing_summaries():
+    issues = [IssueFactory(), IssueFactory(), IssueFactory()]
+    update_issue_summaries([issues[0].pk])
+    assert IssueSummary.objects.count() == 1
+
+    data = get_issue_summary_data(reversed(issues))
+
+    assert [d["id"] for d in data] == [str(i.pk) for i in reversed(issues)]
+    assert IssueSummary.objects.count() == 3
+
+
+@pytest.mark.django_db
+def test_issue_summary_ms_account_set_up_is_read_time():
+    """
+    Whether the paralegal's MS account is set up changes with time alone,
+    so it isn't stored in the summary.
+    """
+    paralegal = UserFactory(ms_account_created_at=timezone.now())
+    issue = IssueFactory(paralegal=paralegal)
+
+    (summary,) = update_issue_summaries([issue.pk])
+    assert "is_ms_account_set_up" not in summary.data["paralegal"]
+    (data,) = get_issue_summary_data([issue])
+    assert data["paralegal"]["is_ms_account_set_up"] is False
+
+    later = timezone.now() + timezone.timedelta(minutes=20)
+    with mock.patch("django.utils.timezone.now", return_value=later):
+        (data,) = get_issue_summary_data([issue])
+
+    assert data["paralegal"]["is_ms_account_set_up"] is True
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+def test_issue_summary_signals(mock_issue_async, django_capture_on_commit_callbacks):
+    """
+    Summaries are rebuilt when the Issue or its related data changes.
+    """
+    client = ClientFactory(first_name="Jane")
+    issue = IssueFactory(client=client)
+    (summary,) = update_issue_summaries([issue.pk])
+    assert summary.data["client"]["first_name"] == "Jane"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        client.first_name = "Janet"
+        client.save()
+
+    summary.refresh_from_db()
+    assert summary.data["client"]["first_name"] == "Janet"
+
+    with django_capture_on_commit_callbacks(execute=True):
+        note = IssueNote.objects.create(
+            issue=issue,
+            creator=UserFactory(),
+            note_type=NoteType.ELIGIBILITY_CHECK_FAILURE,
+            text="Not eligible",
+        )
+
+    summary.refresh_from_db()
+    assert summary.data["is_eligibility_check"] is True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        note.delete()
+
+    summary.refresh_from_db()
+    assert summary.data["is_eligibility_check"] is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        issue.is_open = False
+        issue.save()
+
+    summary.refresh_from_db()
+    assert not summary.is_open
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+def test_issue_summary_waits_for_commit(
+    mock_issue_async, django_capture_on_commit_callbacks
+):
+    """
+    Summaries are only rebuilt once the change has been committed.
+    """
+    issue = IssueFactory(is_open=True)
+    update_issue_summaries([issue.pk])
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        issue.is_open = False
+        issue.save()
+
+    assert IssueSummary.objects.get(pk=issue.pk).is_open
+    for callback in callbacks:
+        callback()
+
+    assert not IssueSummary.objects.get(pk=issue.pk).is_open
@@ -1,17 +1,251 @@
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import uuid
+from functools import cached_property
+
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import ValidationError
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
 
+class CountedPaginator(DjangoPaginator):
+    """
+    Django paginator which delegates counting to the ClerkPaginator, so that
+    the count can be estimated.
+
+    An estimated count can be lower than the real one, so page numbers aren't
+    checked against it and each page looks one item ahead to find the next.
+    """
+
+    def __init__(self, *args, get_count, get_estimated_count, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.get_count = get_count
+        self.get_estimated_count = get_estimated_count
+
+    @cached_property
+    def estimated_count(self) -> int | None:
+        return self.get_estimated_count(self.object_list)
+
+    @cached_property
+    def count(self):
+        if self.estimated_count is not None:
+            return self.estimated_count
+        return self.get_count(self.object_list)
+
+    def validate_number(self, number):
+        if self.estimated_count is None:
+            return super().validate_number(number)
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(self.error_messages["invalid_page"])
+        if number < 1:
+            raise EmptyPage(self.error_messages["min_page"])
+        return number
+
+    def page(self, number):
+        if self.estimated_count is None:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        items = list(self.object_list[bottom : bottom + self.per_page + 1])
+        if not items and number > 1:
+            raise EmptyPage(self.error_messages["no_results"])
+        page = EstimatedPage(items[: self.per_page], number, self)
+        page.has_more = len(items) > self.per_page
+        return page
+
+
+class EstimatedPage(Page):
+    """
+    Page of a CountedPaginator with an estimated count, which knows whether
+    there is a next page from the items it fetched.
+    """
+
+    has_more = False
+
+    def has_next(self):
+        return self.has_more
+
+
 class ClerkPaginator(PageNumberPagination):
+    """
+    Page number pagination with an optional keyset (cursor) mode.
+
+    Subclasses can opt into cursor pagination with allow_cursor. Clients then
+    request it by passing the cursor query param (empty for the first page)
+    and follow the next_cursor / prev_cursor values in the response. Cursor
+    pages filter on the queryset's sort key rather than using OFFSET, so deep
+    pages cost the same as the first page. The item count is worked out for
+    the first page and carried along in the cursor.
+    """
+
     page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    # Whether clients can request cursor pagination.
+    allow_cursor = False
+    # Sort key used for cursor pagination when the queryset isn't ordered.
+    cursor_ordering = ("-created_at", "-pk")
+    # Use the query planner's row estimate instead of COUNT(*) when it
+    # estimates at least this many rows. None means always count exactly.
+    estimate_count_threshold = None
 
     def paginate_queryset(self, queryset, request, view=None):
         page_size = request.query_params.get(self.page_size_query_param, self.page_size)
         if page_size and int(page_size) < 0:
             return queryset
+        if self.allow_cursor and self.cursor_query_param in request.query_params:
+            return self.paginate_queryset_by_cursor(queryset, request)
         return super().paginate_queryset(queryset, request, view)
 
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(
+            queryset,
+            page_size,
+            get_count=self.get_count,
+            get_estimated_count=self.get_estimated_count,
+        )
+
+    def get_count(self, queryset: QuerySet) -> int:
+        """
+        Returns the total number of items, which may be an estimate for large
+        querysets.
+        """
+        estimate = self.get_estimated_count(queryset)
+        if estimate is not None:
+            return estimate
+
+        return queryset.order_by().count()
+
+    def get_estimated_count(self, queryset: QuerySet) -> int | None:
+        """
+        Returns the query planner's estimate of the number of items, or None if
+        they should be counted exactly.
+        """
+        if self.estimate_count_threshold is None:
+            return None
+
+        estimate = get_estimated_count(queryset.order_by())
+        if estimate >= self.estimate_count_threshold:
+            return estimate
+
+        return None
+
+    def paginate_queryset_by_cursor(self, queryset, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        ordering = self.get_cursor_ordering(queryset)
+        cursor = self.decode_cursor(request.query_params[self.cursor_query_param])
+
+        page_number, is_reverse = 1, False
+        if cursor:
+            page_number, is_reverse = cursor["page"], cursor["reverse"]
+            self.cursor_count = cursor["count"]
+            queryset = queryset.filter(
+                get_keyset_filter(ordering, cursor["values"], is_reverse)
+            )
+        else:
+            self.cursor_count = self.get_count(queryset)
+
+        order_by = [flip_ordering(f) if is_reverse else f for f in ordering]
+        items = list(queryset.order_by(*order_by)[: page_size + 1])
+        has_more = len(items) > page_size
+        items = items[:page_size]
+        if is_reverse:
+            items.reverse()
+
+        has_next = True if is_reverse else has_more
+        has_prev = has_more if is_reverse else cursor is not None
+        self.cursor_page = {
+            "number": page_number,
+            # The count can be estimated, or out of date for later pages.
+            "page_count": max(
+                page_number + int(has_next and bool(items)),
+                -(-self.cursor_count // page_size),
+            ),
+            "next": None,
+            "prev": None,
+        }
+        if items and has_next:
+            values = get_ordering_values(items[-1], ordering)
+            self.cursor_page["next"] = (page_number + 1, values, False)
+        if items and has_prev:
+            values = get_ordering_values(items[0], ordering)
+            self.cursor_page["prev"] = (page_number - 1, values, True)
+
+        return items
+
+    def get_cursor_ordering(self, queryset: QuerySet) -> list[str]:
+        """
+        Returns the sort key used for cursor pagination, which always ends in
+        the primary key so that each position is unique.
+        """
+        ordering = list(queryset.query.order_by)
+        if not all(isinstance(f, str) and f != "?" for f in ordering):
+            # Expressions, eg. search rank, can't be encoded into a cursor.
+            raise ValidationError(
+                {"cursor": "Cursor pagination isn't supported for this ordering"}
+            )
+        if not ordering:
+            ordering = list(self.cursor_ordering)
+
+        if not any(f.lstrip("-") in ("pk", "id") for f in ordering):
+            ordering.append("-pk" if ordering[-1].startswith("-") else "pk")
+
+        return ordering
+
+    def encode_cursor(self, page_number, values, is_reverse) -> str:
+        data = {
+            "page": page_number,
+            "values": values,
+            "reverse": is_reverse,
+            "count": self.cursor_count,
+        }
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+
+    def decode_cursor(self, encoded: str) -> dict | None:
+        if not encoded:
+            return None
+        try:
+            data = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            return {
+                "page": int(data["page"]),
+                "values": list(data["values"]),
+                "reverse": bool(data["reverse"]),
+                "count": int(data["count"]),
+            }
+        except (TypeError, KeyError, ValueError, binascii.Error):
+            raise ValidationError({"cursor": "Invalid cursor"})
+
     def get_paginated_response(self, data):
+        if hasattr(self, "cursor_page"):
+            page = self.cursor_page
+            next_page, prev_page = page["next"], page["prev"]
+            return Response(
+                {
+                    "page_count": page["page_count"],
+                    "item_count": self.cursor_count,
+                    "current": page["number"],
+                    "next": next_page[0] if next_page else None,
+                    "prev": prev_page[0] if prev_page else None,
+                    "next_cursor": (
+                        self.encode_cursor(*next_page) if next_page else None
+                    ),
+                    "prev_cursor": (
+                        self.encode_cursor(*prev_page) if prev_page else None
+                    ),
+                    "results": data,
+                }
+            )
+
         next_page_number, prev_page_number = None, None
         page_count, current_page_number = 1, 1
         item_count = len(data)
@@ -23,9 +257,13 @@ class ClerkPaginator(PageNumberPagination):
             if self.page.has_previous():
                 prev_page_number = self.page.previous_page_number()
 
-            page_count = self.page.paginator.num_pages
-            item_count = self.page.paginator.count
             current_page_number = self.page.number
+            # An estimated count can be lower than the real one.
+            page_count = max(
+                self.page.paginator.num_pages,
+                next_page_number or current_page_number,
+            )
+            item_count = self.page.paginator.count
 
         return Response(
             {
@@ -37,3 +275,79 @@ class ClerkPaginator(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+def get_estimated_count(queryset: QuerySet) -> int:
+    """
+    Returns the query planner's estimate of the number of rows in a queryset.
+    """
+    if queryset.query.is_empty():
+        return 0
+    plan = json.loads(queryset.explain(format="json"))
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def flip_ordering(field: str) -> str:
+    return field[1:] if field.startswith("-") else "-" + field
+
+
+def get_keyset_filter(ordering: list[str], values: list, is_reverse: bool) -> Q:
+    """
+    Returns a filter for the rows which come after the given sort key values,
+    or before them if is_reverse is set.
+
+    Postgres sorts nulls as if they were larger than any other value, so they
+    come last in ascending order and first in descending order.
+    """
+    if len(values) != len(ordering):
+        raise ValidationError({"cursor": "Invalid cursor"})
+
+    keyset_filter = Q()
+    for i, field in enumerate(ordering):
+        is_descending = field.startswith("-") != is_reverse
+        q_filter = get_after_filter(field.lstrip("-"), values[i], is_descending)
+        if q_filter is None:
+            continue
+        for prev_field, prev_value in zip(ordering[:i], values[:i]):
+            q_filter &= get_equal_filter(prev_field.lstrip("-"), prev_value)
+        keyset_filter |= q_filter
+
+    # Nothing comes after the last row.
+    return keyset_filter or Q(pk__in=[])
+
+
+def get_after_filter(name: str, value, is_descending: bool) -> Q | None:
+    """
+    Returns a filter for the rows whose field sorts after the value, or None if
+    no row can.
+    """
+    if value is None:
+        return Q(**{f"{name}__isnull": False}) if is_descending else None
+    if is_descending:
+        return Q(**{f"{name}__lt": value})
+    return Q(**{f"{name}__gt": value}) | Q(**{f"{name}__isnull": True})
+
+
+def get_equal_filter(name: str, value) -> Q:
+    if value is None:
+        return Q(**{f"{name}__isnull": True})
+    return Q(**{name: value})
+
+
+def get_ordering_values(instance, ordering: list[str]) -> list:
+    """
+    Returns the JSON serializable sort key values of a model instance.
+    """
+    values = []
+    for field in ordering:
+        value = instance
+        for attr in field.lstrip("-").split("__"):
+            # A missing relation sorts as null.
+            value = getattr(value, attr) if value is not None else None
+        if isinstance(value, (datetime.date, datetime.datetime, datetime.time)):
+            value = value.isoformat()
+        elif isinstance(value, (uuid.UUID, decimal.Decimal)):
+            value = str(value)
+        values.append(value)
+
+    return values
@@ -0,0 +1,112 @@
+import logging
+
+from accounts.models import User
+from core.models import Issue, IssueNote, IssueSummary
+from django.db.models import Max
+
+from case.serializers import IssueSerializer
+from case.serializers.user import is_ms_account_set_up
+
+logger = logging.getLogger(__name__)
+
+# Number of Issues summarised per batch.
+SUMMARY_BATCH_SIZE = 500
+
+# Nested users in the summary data. Whether their MS account is set up depends
+# on the current time, so it's left out of the summary and added when read.
+SUMMARY_USER_FIELDS = ("paralegal", "lawyer")
+
+
+def update_issue_summaries(issue_ids) -> list[IssueSummary]:
+    """
+    Rebuild the summaries of the given Issues. Returns the new summaries.
+    """
+    issue_ids = list(issue_ids)
+    summaries = []
+    for i in range(0, len(issue_ids), SUMMARY_BATCH_SIZE):
+        batch_ids = issue_ids[i : i + SUMMARY_BATCH_SIZE]
+        issues = (
+            Issue.objects.filter(pk__in=batch_ids)
+            .select_related(
+                "client",
+                "tenancy__agent",
+                "tenancy__landlord",
+                "paralegal",
+                "lawyer",
+                "support_worker",
+            )
+            .prefetch_related("paralegal__groups", "lawyer__groups")
+            .annotate(next_review=Max("issuenote__event"))
+        )
+        issues = list(IssueNote.annotate_with_eligibility_checks(issues))
+        # Serialize the batch together so that nested fields load their
+        # choices once rather than once per Issue.
+        data_list = IssueSerializer(issues, many=True).data
+        for data in data_list:
+            for user_data in _get_summary_users(data):
+                user_data.pop("is_ms_account_set_up", None)
+
+        batch = [
+            IssueSummary(
+                issue_id=issue.pk,
+                is_open=issue.is_open,
+                paralegal_id=issue.paralegal_id,
+                created_at=issue.created_at,
+                next_review=issue.next_review,
+                data=data,
+            )
+            for issue, data in zip(issues, data_list)
+        ]
+        summaries += IssueSummary.objects.bulk_create(
+            batch,
+            update_conflicts=True,
+            unique_fields=["issue"],
+            update_fields=[
+                "is_open",
+                "paralegal",
+                "created_at",
+                "next_review",
+                "data",
+                "modified_at",
+            ],
+        )
+
+    logger.debug("Updated %s Issue summaries", len(summaries))
+    return summaries
+
+
+def get_issue_summary_data(issues) -> list[dict]:
+    """
+    Returns the serialized Issues from their summaries, in the given order.
+    """
+    issue_ids = [issue.pk for issue in issues]
+    summaries = IssueSummary.objects.in_bulk(issue_ids)
+    missing_ids = [pk for pk in issue_ids if pk not in summaries]
+    if missing_ids:
+        summaries.update({s.pk: s for s in update_issue_summaries(missing_ids)})
+
+    data_list = [summaries[pk].data for pk in issue_ids]
+    _add_ms_account_set_up(data_list)
+    return data_list
+
+
+def _get_summary_users(data: dict) -> list[dict]:
+    return [data[f] for f in SUMMARY_USER_FIELDS if data.get(f)]
+
+
+def _add_ms_account_set_up(data_list: list[dict]):
+    """
+    Add the time-dependent MS account status to the nested users, as of now.
+    """
+    user_ids = {u["id"] for data in data_list for u in _get_summary_users(data)}
+    if not user_ids:
+        return
+
+    created_at = dict(
+        User.objects.filter(pk__in=user_ids).values_list("pk", "ms_account_created_at")
+    )
+    for data in data_list:
+        for user_data in _get_summary_users(data):
+            user_data["is_ms_account_set_up"] = is_ms_account_set_up(
+                created_at.get(user_data["id"])
+            )
@@ -6,18 +6,17 @@ from core.events.service import (
 from core.models import (
     AuditEvent,
     Issue,
-    IssueDate,
     IssueEvent,
     IssueNote,
     ServiceEvent,
 )
 from core.models.issue import CaseOutcome, CaseStage, CaseTopic
-from django.contrib.contenttypes.models import ContentType
+from core.services.search import rank_queryset, search_queryset
 from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.db.models import Max, Q, QuerySet
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
-from microsoft.service import get_case_folder_info
+from microsoft.service import get_case_documents
 from rest_framework import status
 from rest_framework.decorators import (
     action,
@@ -37,6 +36,7 @@ from case.serializers import (
     TenancySerializer,
 )
 from case.utils import ClerkPaginator, render_react_page
+from case.utils.summary import get_issue_summary_data
 from case.views.auth import (
     CoordinatorOrBetterPermission,
     ParalegalOrBetterObjectPermission,
@@ -82,17 +82,9 @@ def case_create_page_view(request):
 @coordinator_or_better_required
 def case_inbox_page_view(request):
     """Inbox page where coordinators can see new cases for them to assign"""
-    is_unassigned = Q(paralegal__isnull=True)
-    is_open = Q(is_open=True)
-    is_inbox = is_unassigned & is_open
-    issues = (
-        Issue.objects.select_related("client", "tenancy__agent", "tenancy__landlord")
-        .prefetch_related("issuenote_set", "paralegal__groups", "lawyer__groups")
-        .filter(is_inbox)
-        .order_by("created_at")
-    )
-    issues = IssueNote.annotate_with_eligibility_checks(issues)
-    context = {"issues": IssueSerializer(issues, many=True).data}
+    is_inbox = Q(paralegal__isnull=True) & Q(is_open=True)
+    issues = Issue.objects.filter(is_inbox).order_by("created_at").only("pk")
+    context = {"issues": get_issue_summary_data(issues)}
     return render_react_page(request, "Case Inbox", "case-inbox", context)
 
 
@@ -101,14 +93,12 @@ def case_inbox_page_view(request):
 def case_review_page_view(request):
     """Page where coordinators can see existing cases for them to review"""
     issues = (
-        Issue.objects.select_related("client", "tenancy__agent", "tenancy__landlord")
-        .prefetch_related("issuenote_set", "paralegal__groups", "lawyer__groups")
-        .filter(is_open=True)
+        Issue.objects.filter(is_open=True)
         .annotate(next_review=Max("issuenote__event"))
         .order_by("next_review")
+        .only("pk")
     )
-    issues = IssueNote.annotate_with_eligibility_checks(issues)
-    context = {"issues": IssueSerializer(issues, many=True).data}
+    context = {"issues": get_issue_summary_data(issues)}
     return render_react_page(request, "Case Review", "case-review", context)
 
 
@@ -207,6 +197,8 @@ def get_detail_urls(issue: Issue):
 class CasePaginator(ClerkPaginator):
     page_size = 14
     max_page_size = 14
+    allow_cursor = True
+    estimate_count_threshold = 10000
 
 
 def get_viewset(request, action, **kwargs):
@@ -238,14 +230,12 @@ class CaseApiViewset(
 
     def get_queryset(self):
         user = self.request.user
-        queryset = (
-            Issue.objects.select_related(
+        queryset = Issue.objects.order_by("-created_at")
+        if self.action != "list":
+            queryset = queryset.select_related(
                 "client", "tenancy__agent", "tenancy__landlord"
-            )
-            .prefetch_related("paralegal__groups", "lawyer__groups")
-            .order_by("-created_at")
-        )
-        if self.action == "list":
+            ).prefetch_related("paralegal__groups", "lawyer__groups")
+        else:
             if user.is_paralegal:
                 # Paralegals can only see assigned cases
                 queryset = queryset.filter(paralegal=user)
@@ -272,31 +262,26 @@ class CaseApiViewset(
         search_query = search_query_serializer.validated_data
         for key, value in search_query.items():
             if key == "search" and value:
-                # Run free text search query
-                search_parts = value.split(" ")
-                search_query = None
-                for search_part in search_parts:
-                    part_query = (
-                        Q(paralegal__first_name__icontains=search_part)
-                        | Q(paralegal__last_name__icontains=search_part)
-                        | Q(paralegal__email__icontains=search_part)
-                        | Q(client__first_name__icontains=search_part)
-                        | Q(client__last_name__icontains=search_part)
-                        | Q(client__email__icontains=search_part)
-                        | Q(fileref__icontains=search_part)
-                    )
-                    if search_query:
-                        search_query |= part_query
-                    else:
-                        search_query = part_query
-
-                queryset = queryset.filter(search_query)
+                # Run free text search query, best matches first.
+                queryset = search_queryset(queryset, value, match_any=True)
+                queryset = rank_queryset(queryset, value)
             else:
                 # Apply basic field filtering
                 queryset = queryset.filter(**{key: value})
 
         return queryset
 
+    def list(self, request, *args, **kwargs):
+        """
+        List issues, using their summaries rather than serializing each issue.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(get_issue_summary_data(page))
+
+        return Response(get_issue_summary_data(queryset))
+
     def retrieve(self, request, *args, **kwargs):
         """
         Get a single issue
@@ -319,12 +304,7 @@ class CaseApiViewset(
                 IssueEvent.objects.filter(issue=issue).select_related(
                     "prev_user", "next_user"
                 ),
-                AuditEvent.objects.filter(
-                    log_entry__content_type=ContentType.objects.get_for_model(
-                        IssueDate
-                    ),
-                    log_entry__serialized_data__fields__issue=str(issue.id),
-                ).select_related(
+                AuditEvent.objects.filter(issue=issue).select_related(
                     "log_entry", "log_entry__content_type", "log_entry__actor"
                 ),
                 ServiceEvent.objects.filter(service__issue=issue)
@@ -386,8 +366,12 @@ class CaseApiViewset(
         View sharepoint documents for a case.
         """
         issue = self.get_object()
-        documents, sharepoint_url = get_case_folder_info(issue)
-        data = {"sharepoint_url": sharepoint_url, "documents": documents}
+        documents, sharepoint_url, synced_at = get_case_documents(issue)
+        data = {
+            "sharepoint_url": sharepoint_url,
+            "documents": documents,
+            "synced_at": synced_at,
+        }
         return Response(data)
 
     @action(
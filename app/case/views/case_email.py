@@ -4,7 +4,8 @@ from typing import List
 
 from core.models import Issue
 from django.core.files.uploadedfile import InMemoryUploadedFile
-from django.db.models import Q
+from django.db.models import Count, Max, OuterRef, Q, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce, NullIf
 from django.http import Http404, HttpResponse
 from django.urls import reverse
 from emails.models import (
@@ -15,7 +16,7 @@ from emails.models import (
     SharepointState,
 )
 from emails.service import build_clerk_address
-from emails.utils.html import parse_email_html, render_email_template
+from emails.utils.html import get_display_html, render_email_template
 from emails.utils.threads import EmailThread
 from microsoft.endpoints import MSGraphAPI
 from microsoft.service import save_email_attachment
@@ -28,7 +29,9 @@ from case.serializers import (
     EmailSerializer,
     EmailTemplateSerializer,
     EmailThreadSerializer,
+    EmailThreadSummarySerializer,
 )
+from case.utils.pagination import ClerkPaginator
 from case.utils.react import render_react_page
 from case.views.auth import (
     CoordinatorOrBetterPermission,
@@ -132,15 +135,20 @@ def get_viewset(request, action, **kwargs):
     return viewset
 
 
+class EmailThreadPaginator(ClerkPaginator):
+    page_size = 20
+
+
 class EmailApiViewset(GenericViewSet):
     serializer_class = EmailThreadSerializer
+    pagination_class = EmailThreadPaginator
     permission_classes = [
         CoordinatorOrBetterPermission | ParalegalOrBetterObjectPermission
     ]
 
     def get_queryset(self):
         user = self.request.user
-        queryset = Issue.objects.prefetch_related("email_set__attachments")
+        queryset = Issue.objects.all()
 
         if self.action == "list":
             if user.is_paralegal:
@@ -157,17 +165,27 @@ class EmailApiViewset(GenericViewSet):
         return queryset
 
     def retrieve(self, request, *args, **kwargs):
-        """Fetch all email threads for a given issue"""
+        """Fetch all email threads for a given issue, or just the one with slug"""
         issue = self.get_object()
-        email_threads = get_email_threads(issue)
         slug = request.query_params.get("slug")
-        if slug:
-            email_threads = [t for t in email_threads if t.slug == slug]
-            if not email_threads:
-                raise Http404()
+        email_threads = get_email_threads(issue, slug=slug)
+        if slug and not email_threads:
+            raise Http404()
 
         return Response(EmailThreadSerializer(email_threads, many=True).data)
 
+    @action(detail=True, methods=["GET"], url_name="thread-list", url_path="threads")
+    def thread_list(self, request, *args, **kwargs):
+        """Fetch a page of email thread summaries for a given issue"""
+        issue = self.get_object()
+        queryset = get_email_thread_summaries(issue)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = EmailThreadSummarySerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        return Response(EmailThreadSummarySerializer(queryset, many=True).data)
+
     @action(detail=True, methods=["POST"], url_name="create", url_path="create")
     def create_email(self, request, *args, **kwargs):
         issue = self.get_object()
@@ -281,7 +299,20 @@ class EmailApiViewset(GenericViewSet):
         attachment = self.get_attachment(email, attachment_id)
         attachment.sharepoint_state = SharepointState.UPLOADING
         attachment.save()
-        save_email_attachment(email, attachment)
+        # Attachments with the same key have the same content, so a file which
+        # is already in the case's folder doesn't need to be uploaded again.
+        is_uploaded = (
+            EmailAttachment.objects.filter(
+                email__issue=email.issue,
+                file=attachment.file.name,
+                sharepoint_state=SharepointState.UPLOADED,
+            )
+            .exclude(pk=attachment.pk)
+            .exists()
+        )
+        if not is_uploaded:
+            save_email_attachment(email, attachment)
+
         attachment.sharepoint_state = SharepointState.UPLOADED
         attachment.save()
         return Response(status=204)
@@ -320,35 +351,69 @@ class EmailApiViewset(GenericViewSet):
         return Response(status=204)
 
 
-def get_email_threads(issue: Issue) -> List[EmailThread]:
+def get_email_threads(issue: Issue, slug: str | None = None) -> List[EmailThread]:
+    """
+    Returns the issue's email threads, with each email prepared for display.
+    Pass slug to only load the emails in that thread.
+    """
+    email_qs = issue.email_set.filter(state__in=DISPLAY_EMAIL_STATES)
+    if slug:
+        email_qs = email_qs.filter(thread_name=slug)
+
     email_qs = (
-        issue.email_set.filter(state__in=DISPLAY_EMAIL_STATES)
+        email_qs.defer("received_data")
         .select_related("sender")
         .prefetch_related("sender__groups", "attachments")
         .order_by("created_at")
     )
-
-    threads = []
+    threads = {}
     for email in email_qs:
         process_email_for_display(email)
+        thread = threads.get(email.thread_name)
+        if thread:
+            thread.add_email(email)
+        else:
+            threads[email.thread_name] = EmailThread(email)
 
-        # Assign each email to a thread
-        is_in_a_thread = False
-        for thread in threads:
-            is_in_a_thread = thread.add_email_if_in_thread(email)
-            if is_in_a_thread:
-                break
+    for thread in threads.values():
+        thread.emails = sorted(thread.emails, key=lambda t: t.created_at, reverse=True)
 
-        if not is_in_a_thread:
-            threads.append(EmailThread(email))
+    return sorted(threads.values(), key=lambda t: t.most_recent, reverse=True)
 
-    for thread in threads:
-        thread.emails = sorted(thread.emails, key=lambda t: t.created_at, reverse=True)
 
-    return sorted(threads, key=lambda t: t.most_recent, reverse=True)
+def get_email_thread_summaries(issue: Issue) -> QuerySet:
+    """
+    Returns a row for each of the issue's email threads, grouped by the stored
+    thread_name, with the thread's subject, most recent timestamp and counts of
+    emails in each state. Email bodies are not loaded.
+    """
+    email_qs = Email.objects.filter(issue=issue, state__in=DISPLAY_EMAIL_STATES)
+    first_subject = (
+        email_qs.filter(thread_name=OuterRef("thread_name"))
+        .order_by("created_at")
+        .values("subject")[:1]
+    )
+    return (
+        email_qs.values("issue", "thread_name")
+        .annotate(
+            thread_subject=Coalesce(
+                NullIf(Subquery(first_subject), Value("")), Value("No Subject")
+            ),
+            most_recent=Max("created_at"),
+            email_count=Count("pk"),
+            draft_count=Count("pk", filter=Q(state=EmailState.DRAFT)),
+            sent_count=Count("pk", filter=Q(state=EmailState.SENT)),
+            delivered_count=Count("pk", filter=Q(state=EmailState.DELIVERED)),
+            delivery_failure_count=Count(
+                "pk", filter=Q(state=EmailState.DELIVERY_FAILURE)
+            ),
+            ingested_count=Count("pk", filter=Q(state=EmailState.INGESTED)),
+        )
+        .order_by("-most_recent", "thread_name")
+    )
 
 
 def process_email_for_display(email: Email):
-    email.html = parse_email_html(email)
+    email.html = get_display_html(email)
     for attachment in email.attachments.all():
         attachment.file.display_name = os.path.basename(attachment.file.name)
@@ -1,6 +1,5 @@
 from django.http import Http404
-from django.db.models import Q, QuerySet, Value
-from django.db.models.functions import Concat, Trim
+from django.db.models import Prefetch, Q, QuerySet
 from rest_framework.decorators import api_view
 from rest_framework.exceptions import PermissionDenied
 from rest_framework.viewsets import GenericViewSet
@@ -16,7 +15,8 @@ from case.serializers import (
     IssueSerializer,
     ClientSearchSerializer,
 )
-from core.models import Client
+from core.models import Client, Issue
+from core.services.search import search_queryset
 from case.utils import render_react_page, ClerkPaginator
 from .auth import (
     paralegal_or_better_required,
@@ -29,7 +29,12 @@ from .auth import (
 @paralegal_or_better_required
 def client_detail_page_view(request, pk):
     try:
-        client = Client.objects.prefetch_related("issue_set").get(pk=pk)
+        issues = Issue.objects.select_related(
+            "client", "tenancy__agent", "tenancy__landlord", "support_worker"
+        ).prefetch_related("paralegal__groups", "lawyer__groups")
+        client = Client.objects.prefetch_related(
+            Prefetch("issue_set", queryset=issues)
+        ).get(pk=pk)
     except Client.DoesNotExist:
         raise Http404()
 
@@ -49,6 +54,7 @@ def client_detail_page_view(request, pk):
 
 class ClientPaginator(ClerkPaginator):
     page_size = 20
+    allow_cursor = True
 
 
 class ClientApiViewset(
@@ -93,14 +99,6 @@ class ClientApiViewset(
         serializer.is_valid(raise_exception=True)
         search = serializer.validated_data.get("q", None)
         if search:
-            q_filter = (
-                Q(full_name__icontains=search)
-                | Q(preferred_name__icontains=search)
-                | Q(email__icontains=search)
-                | Q(phone_number__icontains=search)
-            )
-            queryset = queryset.annotate(
-                full_name=Concat(Trim("first_name"), Value(" "), Trim("last_name"))
-            ).filter(q_filter)
+            queryset = search_queryset(queryset, search)
 
         return queryset
@@ -1,4 +1,5 @@
 from core.models import Issue, IssueDate
+from core.services.search import search_queryset
 from django.db.models import QuerySet, Q
 from rest_framework import viewsets
 from rest_framework.decorators import api_view
@@ -20,6 +21,7 @@ def date_list_page_view(request):
 
 class DatePaginator(ClerkPaginator):
     page_size = 20
+    allow_cursor = True
 
 
 class DateApiViewSet(viewsets.ModelViewSet):
@@ -84,13 +86,8 @@ class DateApiViewSet(viewsets.ModelViewSet):
         for key, value in search_query.items():
             if value is not None:
                 if key == "q":
-                    # Search by fileref or client details
-                    queryset = queryset.filter(
-                        Q(issue__fileref__icontains=value)
-                        | Q(issue__client__first_name__icontains=value)
-                        | Q(issue__client__last_name__icontains=value)
-                        | Q(issue__client__email__icontains=value)
-                    )
+                    # Search by case details
+                    queryset = search_queryset(queryset, value, prefix="issue__")
                 else:
                     queryset = queryset.filter(**{key: value})
 
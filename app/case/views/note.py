@@ -2,6 +2,7 @@ from accounts.models import User
 from core.models import IssueNote
 from core.models.issue_note import NoteType
 from django.contrib.contenttypes.models import ContentType
+from django.contrib.contenttypes.prefetch import GenericPrefetch
 from django.db.models import Q, QuerySet
 from rest_framework.mixins import ListModelMixin
 from rest_framework.viewsets import GenericViewSet
@@ -20,6 +21,8 @@ from case.views.auth import (
 class NotePaginator(ClerkPaginator):
     page_size = 20
     max_page_size = 100
+    allow_cursor = True
+    estimate_count_threshold = 10000
 
 
 class NoteApiViewset(GenericViewSet, ListModelMixin):
@@ -40,7 +43,13 @@ class NoteApiViewset(GenericViewSet, ListModelMixin):
 
         queryset = (
             IssueNote.objects.select_related("issue__paralegal", "issue__lawyer")
-            .prefetch_related("creator__groups")
+            .prefetch_related(
+                "creator__groups",
+                # Performance notes serialize the reviewee.
+                GenericPrefetch(
+                    "content_object", [User.objects.prefetch_related("groups")]
+                ),
+            )
             .filter(note_type__in=note_types)
             .order_by("-created_at")
         )
@@ -1,6 +1,8 @@
 from accounts.models import CaseGroups, User
-from core.models.issue import CaseTopic
-from django.db.models import Case, Count, F, Max, Q, When
+from core.models.user_workload import WorkloadRole
+from core.services.workload import WORKLOAD_FIELDS
+from django.db.models import Case, F, FilteredRelation, Q, Value, When
+from django.db.models.functions import Coalesce
 from rest_framework.decorators import api_view
 
 from case.serializers import ParalegalSerializer
@@ -14,12 +16,12 @@ from .auth import coordinator_or_better_required
 def paralegal_list_page_view(request):
     paralegals = User.objects.filter(
         is_active=True, groups__name__in=[CaseGroups.PARALEGAL, CaseGroups.COORDINATOR]
-    ).prefetch_related("issue_set", "groups")
+    ).prefetch_related("groups")
     lawyers = User.objects.filter(
         is_active=True, groups__name=CaseGroups.LAWYER
-    ).prefetch_related("issue_set", "groups")
-    paralegals = _calculate_user_capacity(paralegals, "issue")
-    lawyers = _calculate_user_capacity(lawyers, "lawyer_issue")
+    ).prefetch_related("groups")
+    paralegals = _annotate_user_capacity(paralegals, WorkloadRole.PARALEGAL)
+    lawyers = _annotate_user_capacity(lawyers, WorkloadRole.LAWYER)
     context = {
         "paralegals": ParalegalSerializer(paralegals, many=True).data,
         "lawyers": ParalegalSerializer(lawyers, many=True).data,
@@ -27,55 +29,21 @@ def paralegal_list_page_view(request):
     return render_react_page(request, "Paralegals", "paralegal-list", context)
 
 
-def _calculate_user_capacity(user_qs, issue_rel):
-    user_qs = (
+def _annotate_user_capacity(user_qs, role):
+    """
+    Annotate users with their precomputed UserWorkload for the given role.
+    """
+    user_qs = user_qs.annotate(
+        workload=FilteredRelation("workloads", condition=Q(workloads__role=role))
+    )
+    counts = {
+        name: Coalesce(f"workload__{name}", Value(0))
+        for name in WORKLOAD_FIELDS
+        if name != "latest_issue_created_at"
+    }
+    return (
         user_qs.annotate(
-            latest_issue_created_at=Max(f"{issue_rel}__created_at"),
-            total_cases=Count(issue_rel, distinct=True),
-            open_cases=Count(
-                issue_rel, Q(**{f"{issue_rel}__is_open": True}), distinct=True
-            ),
-            open_repairs=Count(
-                issue_rel,
-                Q(
-                    **{
-                        f"{issue_rel}__is_open": True,
-                        f"{issue_rel}__topic": CaseTopic.REPAIRS,
-                    }
-                ),
-                distinct=True,
-            ),
-            open_bonds=Count(
-                issue_rel,
-                Q(
-                    **{
-                        f"{issue_rel}__is_open": True,
-                        f"{issue_rel}__topic": CaseTopic.BONDS,
-                    }
-                ),
-                distinct=True,
-            ),
-            open_eviction=Count(
-                issue_rel,
-                Q(
-                    **{
-                        f"{issue_rel}__is_open": True,
-                    }
-                )
-                & Q(
-                    Q(
-                        **{
-                            f"{issue_rel}__topic": CaseTopic.EVICTION_ARREARS,
-                        }
-                    )
-                    | Q(
-                        **{
-                            f"{issue_rel}__topic": CaseTopic.EVICTION_RETALIATORY,
-                        }
-                    )
-                ),
-                distinct=True,
-            ),
+            latest_issue_created_at=F("workload__latest_issue_created_at"), **counts
         )
         .annotate(
             capacity=Case(
@@ -83,6 +51,6 @@ def _calculate_user_capacity(user_qs, issue_rel):
                 default=100 * F("open_cases") / F("case_capacity"),
             )
         )
+        .distinct()
         .order_by("-capacity")
     )
-    return user_qs
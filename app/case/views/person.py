@@ -1,4 +1,5 @@
 from core.models import Issue, Person, Tenancy
+from core.services.search import search_queryset
 from django.db.models import Q, QuerySet
 from django.http import Http404
 from django.urls import reverse
@@ -42,7 +43,14 @@ def person_detail_page_view(request, pk):
         raise Http404()
 
     q_filter = Q(tenancy__agent=person) | Q(tenancy__landlord=person)
-    issues = Issue.objects.filter(q_filter).order_by("-created_at").all()
+    issues = (
+        Issue.objects.select_related(
+            "client", "tenancy__agent", "tenancy__landlord", "support_worker"
+        )
+        .prefetch_related("paralegal__groups", "lawyer__groups")
+        .filter(q_filter)
+        .order_by("-created_at")
+    )
 
     context = {
         "issues": IssueSerializer(issues, many=True).data,
@@ -55,6 +63,7 @@ def person_detail_page_view(request, pk):
 
 class PersonPaginator(ClerkPaginator):
     page_size = 20
+    allow_cursor = True
 
 
 class PersonApiViewset(ModelViewSet):
@@ -100,12 +109,6 @@ class PersonApiViewset(ModelViewSet):
 
         query = serializer.validated_data.get("query")
         if query:
-            q_filter = (
-                Q(full_name__icontains=query)
-                | Q(email__icontains=query)
-                | Q(address__icontains=query)
-                | Q(phone_number__icontains=query)
-            )
-            queryset = queryset.filter(q_filter)
+            queryset = search_queryset(queryset, query)
 
         return queryset
@@ -26,11 +26,12 @@ def tenancy_detail_page_view(request, pk):
     if not (has_object_permission or request.user.is_coordinator_or_better):
         raise PermissionDenied()
 
+    issues = tenancy.issue_set.select_related(
+        "client", "tenancy__agent", "tenancy__landlord", "support_worker"
+    ).prefetch_related("paralegal__groups", "lawyer__groups")
     context = {
         "tenancy": TenancySerializer(instance=tenancy).data,
-        "issues": IssueSerializer(
-            tenancy.issue_set.all(), read_only=True, many=True
-        ).data,
+        "issues": IssueSerializer(issues, read_only=True, many=True).data,
     }
 
     return render_react_page(request, "Tenancy", "tenancy-detail", context)
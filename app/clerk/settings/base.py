@@ -81,6 +81,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "utils.queries.query_stats_middleware",
     "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django_browser_reload.middleware.BrowserReloadMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -98,6 +99,9 @@ MIDDLEWARE = [
     "auditlog.middleware.AuditlogMiddleware",
 ]
 
+# Log database query counts, timings and duplicate queries for each request.
+QUERY_STATS_ENABLED = bool(os.environ.get("QUERY_STATS_ENABLED"))
+
 ROOT_URLCONF = "clerk.urls"
 
 WSGI_APPLICATION = "clerk.wsgi.application"
@@ -258,6 +262,7 @@ AWS_QUERYSTRING_AUTH = False
 AWS_DEFAULT_ACL = "public-read"
 AWS_REGION_NAME = "ap-southeast-2"
 AWS_S3_FILE_OVERWRITE = True  # Files with the same name will overwrite each other
+AWS_S3_MAX_MEMORY_SIZE = 5 * 1024 * 1024  # Spill files read from S3 to disk past 5MB
 AWS_S3_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
 AWS_S3_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
 
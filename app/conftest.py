@@ -14,6 +14,7 @@ from core import factories
 from django.contrib.auth.models import Group
 from openapi_tester import SchemaTester
 from openapi_tester.clients import OpenAPIClient
+from utils.queries import query_stats_recorded
 from utils.signals import disable_signals, restore_signals
 from zeal import zeal_context
 
@@ -55,11 +56,60 @@ def disable_signals_fixture(request):
     request.addfinalizer(restore_signals)
 
 
+@pytest.fixture(autouse=True)
+def query_budget_fixture(request):
+    """
+    Pytest fixture for failing tests whose requests run too many queries.
+
+    Set the maximum number of queries per request with
+    @pytest.mark.query_budget(n)
+
+    Tests which create several rows should pass their count, so that any query
+    run once per row fails, no matter how much slack the budget has:
+    @pytest.mark.query_budget(n, rows=3)
+
+    """
+    marker = request.node.get_closest_marker("query_budget")
+    if not marker:
+        yield
+        return
+
+    budget = marker.args[0]
+    rows = marker.kwargs.get("rows")
+    request.getfixturevalue("settings").QUERY_STATS_ENABLED = True
+    recorded = []
+
+    def record_stats(sender, request, stats, **kwargs):
+        recorded.append((f"{request.method} {request.path}", stats))
+
+    query_stats_recorded.connect(record_stats)
+    yield
+    query_stats_recorded.disconnect(record_stats)
+
+    assert recorded, "No requests were made"
+    for name, stats in recorded:
+        duplicates = "\n".join(f"{n}x {sql}" for sql, n in stats.duplicates.items())
+        assert stats.count <= budget, (
+            f"{name} ran {stats.count} queries, the budget is {budget}.\n"
+            f"Duplicate queries:\n{duplicates}"
+        )
+        if rows:
+            per_row = {sql: n for sql, n in stats.duplicates.items() if n >= rows}
+            assert not per_row, (
+                f"{name} ran queries once per row, for {rows} rows:\n{duplicates}"
+            )
+
+
 def pytest_configure(config):
     """
-    Register restore signals mark
+    Register restore signals and query budget marks
     """
     config.addinivalue_line("markers", "enable_signals: Mark test to use signals.")
+    config.addinivalue_line(
+        "markers",
+        "query_budget(n, rows=None): Fail if a request runs more than n queries, "
+        "or runs a query once per row.",
+    )
 
 
 def pytest_sessionstart(session):
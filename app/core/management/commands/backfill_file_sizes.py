@@ -0,0 +1,67 @@
+from core.models import FileUpload
+from django.core.management.base import BaseCommand
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from emails.models import Email, EmailAttachment
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py backfill_file_sizes
+    """
+
+    help = "Store the sizes of email attachments and file uploads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        for model in (EmailAttachment, FileUpload):
+            self.backfill_sizes(model, batch_size)
+
+        self.update_email_payloads()
+
+    def backfill_sizes(self, model, batch_size: int):
+        # Only files without a size are selected, so the command can be stopped
+        # and re-run to pick up where it left off.
+        qs = model.objects.filter(size_bytes__isnull=True).only("pk", "file")
+        qs = qs.order_by("pk")
+        total = qs.count()
+        name = model._meta.verbose_name_plural
+        self.stdout.write(f"Storing sizes for {total} {name}")
+
+        count, missing, last_pk = 0, 0, None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            objs = list(batch_qs[:batch_size])
+            if not objs:
+                break
+
+            for obj in objs:
+                try:
+                    obj.size_bytes = obj.file.size if obj.file else 0
+                except FileNotFoundError:
+                    obj.size_bytes = 0
+                    missing += 1
+
+            model.objects.bulk_update(objs, ["size_bytes"])
+            count += len(objs)
+            last_pk = objs[-1].pk
+            self.stdout.write(f"\t{count}/{total}", ending="\r")
+
+        self.stdout.write(f"\nStored sizes for {count} {name}, {missing} missing")
+
+    def update_email_payloads(self):
+        # Same as emails.utils.size.base64_size, done in the database.
+        payload_bytes = (
+            EmailAttachment.objects.filter(email=OuterRef("pk"))
+            .order_by()
+            .values("email")
+            .annotate(total=Sum((F("size_bytes") + 2) / 3 * 4))
+            .values("total")
+        )
+        count = Email.objects.filter(
+            pk__in=EmailAttachment.objects.values("email")
+        ).update(attachments_payload_bytes=Coalesce(Subquery(payload_bytes), 0))
+        self.stdout.write(f"Updated attachment payload sizes for {count} emails")
@@ -25,8 +25,9 @@ from django.core.files.storage import default_storage
 from django.core.management.base import BaseCommand
 from django.db import transaction
 from django.db.models import Q
-from emails.models import Email, EmailAttachment
+from emails.models import Email, EmailArchive, EmailAttachment
 from faker import Faker
+from microsoft.models import CaseFolderListing, DriveDelta, TokenCache
 from utils.signals import disable_signals, restore_signals
 from core.services.submission import UPLOAD_ANSWERS
 
@@ -162,6 +163,15 @@ class Command(BaseCommand):
                 e.cc_addresses = [get_email(addr) for addr in e.cc_addresses]
                 e.save()
 
+        # Archived received data has the original email contents.
+        EmailArchive.objects.all().delete()
+
+        # Cached access tokens would give access to the real MS Graph group.
+        TokenCache.objects.all().delete()
+        # Document names may identify clients, and are refetched when needed.
+        CaseFolderListing.objects.all().delete()
+        DriveDelta.objects.all().delete()
+
         for s in services.iterator():
             if s.notes:
                 s.notes = " ".join(fake.sentences())
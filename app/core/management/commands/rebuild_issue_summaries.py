@@ -0,0 +1,16 @@
+from case.utils.summary import update_issue_summaries
+from core.models import Issue
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py rebuild_issue_summaries
+    """
+
+    help = "Rebuild the Issue summaries used by the case list, inbox and review pages"
+
+    def handle(self, *args, **kwargs):
+        issue_ids = Issue.objects.order_by().values_list("pk", flat=True)
+        summaries = update_issue_summaries(issue_ids)
+        self.stdout.write(f"Updated {len(summaries)} Issue summaries")
@@ -0,0 +1,16 @@
+from core.models import Client, Issue, Person
+from core.services.search import refresh_search_documents
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py rebuild_search_documents
+    """
+
+    help = "Rebuild the search documents used by the case, client and person lists"
+
+    def handle(self, *args, **kwargs):
+        for model in (Client, Person, Issue):
+            count = refresh_search_documents(model.objects.all())
+            self.stdout.write(f"Updated {count} {model.__name__} search documents")
@@ -0,0 +1,14 @@
+from core.services.workload import update_user_workloads
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py reconcile_user_workloads
+    """
+
+    help = "Recount the case workloads shown on the paralegal capacity page"
+
+    def handle(self, *args, **kwargs):
+        count = update_user_workloads()
+        self.stdout.write(f"Updated {count} user workloads")
@@ -0,0 +1,327 @@
+"""
+./manage.py seed_benchmark_data
+"""
+
+import random
+import uuid
+from datetime import timedelta
+
+from accounts.models import CaseGroups, User
+from core.models import (
+    Client,
+    FilerefCounter,
+    Issue,
+    IssueDate,
+    IssueNote,
+    Person,
+    Tenancy,
+)
+from core.models.issue import CaseStage, CaseTopic
+from core.models.issue_date import DateType
+from core.models.issue_note import NoteType
+from django.conf import settings
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from django.utils.text import slugify
+from emails.models import Email, EmailState
+from emails.utils.html import set_display_html
+from faker import Faker
+
+# Number of distinct fake values generated for each kind of text field.
+# Picking from a pool is much faster than calling Faker for every row.
+POOL_SIZE = 1000
+
+# Share of users in each group.
+GROUP_WEIGHTS = {
+    CaseGroups.PARALEGAL: 80,
+    CaseGroups.LAWYER: 10,
+    CaseGroups.COORDINATOR: 5,
+    CaseGroups.ADMIN: 5,
+}
+NOTE_TYPES = [NoteType.PARALEGAL, NoteType.REVIEW, NoteType.EMAIL]
+SENT_EMAIL_STATES = [EmailState.SENT, EmailState.DELIVERED]
+
+
+class Command(BaseCommand):
+    help = "Seed a large synthetic dataset for benchmarking"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--issues", type=int, default=100_000)
+        parser.add_argument("--notes", type=int, default=2_000_000)
+        parser.add_argument("--emails", type=int, default=500_000)
+        parser.add_argument("--dates", type=int, default=50_000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        assert not settings.IS_PROD, "NEVER RUN THIS IN PROD!"
+        self.batch_size = options["batch_size"]
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now()
+        self.build_pools(options["seed"])
+
+        users = self.seed_users(options["users"])
+        issue_ids = self.seed_issues(options["issues"], users)
+        self.seed_notes(options["notes"], issue_ids, users)
+        self.seed_emails(options["emails"], issue_ids, users)
+        self.seed_dates(options["dates"], issue_ids)
+
+        # Bulk inserts don't send signals, so rebuild the read models by hand.
+        call_command("rebuild_issue_summaries", stdout=self.stdout)
+        call_command("reconcile_user_workloads", stdout=self.stdout)
+
+    def build_pools(self, seed: int):
+        fake = Faker("en_AU")
+        fake.seed_instance(seed)
+        self.first_names = [fake.first_name() for _ in range(POOL_SIZE)]
+        self.last_names = [fake.last_name() for _ in range(POOL_SIZE)]
+        self.phone_numbers = [fake.phone_number() for _ in range(POOL_SIZE)]
+        self.addresses = [fake.street_address() for _ in range(POOL_SIZE)]
+        self.suburbs = [fake.city() for _ in range(POOL_SIZE)]
+        self.postcodes = [fake.postcode() for _ in range(POOL_SIZE)]
+        self.sentences = [fake.sentence() for _ in range(POOL_SIZE)]
+        self.paragraphs = [fake.paragraph() for _ in range(POOL_SIZE)]
+
+    def insert(self, model, objs: list):
+        model.objects.bulk_create(objs, batch_size=self.batch_size)
+
+    def batches(self, count: int):
+        """
+        Yields (start, stop) ranges of at most batch_size rows, logging progress.
+        """
+        for start in range(0, count, self.batch_size):
+            stop = min(start + self.batch_size, count)
+            yield start, stop
+            self.stdout.write(f"\t{stop}/{count}", ending="\r")
+
+        self.stdout.write("")
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def past_datetime(self, days: int):
+        return self.now - timedelta(seconds=self.rng.randrange(days * 24 * 60 * 60))
+
+    def seed_users(self, count: int) -> dict[str, list[User]]:
+        self.stdout.write(f"Creating {count} users...")
+        users = []
+        for i in range(count):
+            first_name = self.rng.choice(self.first_names)
+            last_name = self.rng.choice(self.last_names)
+            email = f"{first_name}.{last_name}.{i}@benchmark.anikalegal.org.au"
+            users.append(
+                User(
+                    username=email.lower(),
+                    email=email.lower(),
+                    first_name=first_name,
+                    last_name=last_name,
+                    password="!",  # Unusable password.
+                    case_capacity=self.rng.randint(0, 10),
+                    date_joined=self.past_datetime(3 * 365),
+                )
+            )
+
+        self.insert(User, users)
+
+        groups_by_name = {
+            name: Group.objects.get_or_create(name=name)[0] for name in GROUP_WEIGHTS
+        }
+        users_by_group = {name: [] for name in GROUP_WEIGHTS}
+        memberships = []
+        for i, user in enumerate(users):
+            if i < len(GROUP_WEIGHTS):
+                # Make sure there is at least one user in every group.
+                name = list(GROUP_WEIGHTS)[i]
+            else:
+                [name] = self.rng.choices(
+                    list(GROUP_WEIGHTS), weights=list(GROUP_WEIGHTS.values())
+                )
+
+            users_by_group[name].append(user)
+            memberships.append(
+                User.groups.through(user_id=user.pk, group_id=groups_by_name[name].pk)
+            )
+
+        self.insert(User.groups.through, memberships)
+        return users_by_group
+
+    def seed_issues(self, count: int, users: dict[str, list[User]]) -> list:
+        self.stdout.write(f"Creating {count} issues...")
+        paralegals = users[CaseGroups.PARALEGAL] + users[CaseGroups.COORDINATOR]
+        lawyers = users[CaseGroups.LAWYER]
+        topics = [topic for topic, _ in CaseTopic.ACTIVE_CHOICES]
+        stages = [stage for stage, _ in CaseStage.CHOICES]
+
+        # Landlords and agents are shared between tenancies.
+        people = []
+        for i in range(max(count // 20, 1)):
+            first_name = self.rng.choice(self.first_names)
+            last_name = self.rng.choice(self.last_names)
+            person = Person(
+                full_name=f"{first_name} {last_name}",
+                email=f"agent{i}@example.com",
+                address=self.rng.choice(self.addresses),
+                phone_number=self.rng.choice(self.phone_numbers),
+            )
+            person.search_document = person.get_search_document()
+            people.append(person)
+
+        self.insert(Person, people)
+
+        # Allocate filerefs from the existing counters.
+        fileref_counts = {
+            counter.prefix: counter.value for counter in FilerefCounter.objects.all()
+        }
+        issue_ids = []
+        for start, stop in self.batches(count):
+            clients, tenancies, issues = [], [], []
+            for i in range(start, stop):
+                first_name = self.rng.choice(self.first_names)
+                last_name = self.rng.choice(self.last_names)
+                created_at = self.past_datetime(3 * 365)
+                client = Client(
+                    id=self.uuid(),
+                    first_name=first_name,
+                    last_name=last_name,
+                    email=f"{first_name}.{last_name}.{i}@example.com".lower(),
+                    phone_number=self.rng.choice(self.phone_numbers),
+                    call_times=["WEEK_DAY"],
+                    created_at=created_at,
+                    modified_at=created_at,
+                )
+                client.search_document = client.get_search_document()
+                tenancy = Tenancy(
+                    address=self.rng.choice(self.addresses),
+                    suburb=self.rng.choice(self.suburbs),
+                    postcode=self.rng.choice(self.postcodes),
+                    landlord=self.rng.choice(people),
+                    agent=self.rng.choice(people),
+                    is_on_lease="YES",
+                    created_at=created_at,
+                    modified_at=created_at,
+                )
+                issue = Issue(
+                    id=self.uuid(),
+                    topic=self.rng.choice(topics),
+                    stage=self.rng.choice(stages),
+                    answers={},
+                    client=client,
+                    tenancy=tenancy,
+                    is_open=self.rng.random() < 0.2,
+                    is_sharepoint_set_up=True,
+                    created_at=created_at,
+                    modified_at=self.past_datetime(30),
+                )
+                if paralegals and self.rng.random() < 0.9:
+                    issue.paralegal = self.rng.choice(paralegals)
+                if lawyers and self.rng.random() < 0.5:
+                    issue.lawyer = self.rng.choice(lawyers)
+
+                issue.email_prefix = issue.get_email_prefix()
+                prefix = issue.get_fileref_prefix()
+                fileref_counts[prefix] = fileref_counts.get(prefix, 0) + 1
+                issue.fileref = f"{prefix}{fileref_counts[prefix]:04d}"
+                clients.append(client)
+                tenancies.append(tenancy)
+                issues.append(issue)
+
+            self.insert(Client, clients)
+            self.insert(Tenancy, tenancies)
+            for issue in issues:
+                # Re-assign the tenancy to set tenancy_id now that it has been saved.
+                issue.tenancy = issue.tenancy
+                issue.search_document = issue.get_search_document()
+
+            self.insert(Issue, issues)
+            issue_ids += [issue.pk for issue in issues]
+
+        for prefix, value in fileref_counts.items():
+            FilerefCounter.observe(prefix, value)
+
+        return issue_ids
+
+    def seed_notes(self, count: int, issue_ids: list, users: dict[str, list[User]]):
+        self.stdout.write(f"Creating {count} notes...")
+        creators = [user for group in users.values() for user in group]
+        for start, stop in self.batches(count):
+            notes = []
+            for _ in range(start, stop):
+                note_type = self.rng.choice(NOTE_TYPES)
+                created_at = self.past_datetime(3 * 365)
+                note = IssueNote(
+                    issue_id=self.rng.choice(issue_ids),
+                    creator=self.rng.choice(creators) if creators else None,
+                    note_type=note_type,
+                    text=self.rng.choice(self.paragraphs),
+                    created_at=created_at,
+                    modified_at=created_at,
+                )
+                if note_type == NoteType.REVIEW:
+                    # The next time the case should be reviewed.
+                    note.event = self.now + timedelta(days=self.rng.randint(-30, 60))
+
+                notes.append(note)
+
+            self.insert(IssueNote, notes)
+
+    def seed_emails(self, count: int, issue_ids: list, users: dict[str, list[User]]):
+        self.stdout.write(f"Creating {count} emails...")
+        senders = users[CaseGroups.PARALEGAL] + users[CaseGroups.LAWYER]
+        for start, stop in self.batches(count):
+            emails = []
+            for _ in range(start, stop):
+                # Draw subjects from a small pool so that cases have threads.
+                subject = self.rng.choice(self.sentences[:50])
+                is_received = self.rng.random() < 0.5
+                if is_received:
+                    subject = f"Re: {subject}"
+
+                text = self.rng.choice(self.paragraphs)
+                email = Email(
+                    issue_id=self.rng.choice(issue_ids),
+                    subject=subject,
+                    thread_name=slugify(subject.removeprefix("Re: ")),
+                    text=text,
+                    html=f"<p>{text}</p>",
+                    created_at=self.past_datetime(3 * 365),
+                )
+                if is_received:
+                    email.state = EmailState.INGESTED
+                    email.from_address = "client@example.com"
+                    email.to_address = "case@mail.anikalegal.org.au"
+                else:
+                    email.state = self.rng.choice(SENT_EMAIL_STATES)
+                    email.from_address = "case@mail.anikalegal.org.au"
+                    email.to_address = "client@example.com"
+                    email.sender = self.rng.choice(senders) if senders else None
+
+                set_display_html(email)
+                emails.append(email)
+
+            self.insert(Email, emails)
+
+    def seed_dates(self, count: int, issue_ids: list):
+        self.stdout.write(f"Creating {count} case dates...")
+        date_types = list(DateType)
+        for start, stop in self.batches(count):
+            dates = []
+            for _ in range(start, stop):
+                created_at = self.past_datetime(365)
+                dates.append(
+                    IssueDate(
+                        issue_id=self.rng.choice(issue_ids),
+                        type=self.rng.choice(date_types),
+                        date=(
+                            self.now + timedelta(days=self.rng.randint(-90, 90))
+                        ).date(),
+                        notes=self.rng.choice(self.sentences),
+                        is_reviewed=self.rng.random() < 0.5,
+                        created_at=created_at,
+                        modified_at=created_at,
+                    )
+                )
+
+            self.insert(IssueDate, dates)
@@ -0,0 +1,176 @@
+# Generated by Django 5.1.1 on 2026-10-18 19:49
+
+import re
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def build_search_document(values) -> str:
+    """
+    Frozen copy of core.models.search.build_search_document.
+    """
+    parts = []
+    for value in values:
+        if not value:
+            continue
+        value = " ".join(str(value).lower().split())
+        parts.append(value)
+        compact = re.sub(r"[\s()-]", "", value)
+        if compact != value and compact.isdigit():
+            parts.append(compact)
+
+    return " ".join(parts)
+
+
+def _update_search_documents(queryset, get_values):
+    batch = []
+    for instance in queryset.iterator(chunk_size=BATCH_SIZE):
+        instance.search_document = build_search_document(get_values(instance))
+        batch.append(instance)
+        if len(batch) >= BATCH_SIZE:
+            queryset.model.objects.bulk_update(batch, ["search_document"])
+            batch = []
+    if batch:
+        queryset.model.objects.bulk_update(batch, ["search_document"])
+
+
+def _populate_search_documents(apps, schema_editor):
+    Client = apps.get_model("core", "Client")
+    Issue = apps.get_model("core", "Issue")
+    Person = apps.get_model("core", "Person")
+
+    def get_client_values(c):
+        return [c.first_name, c.last_name, c.preferred_name, c.email, c.phone_number]
+
+    def get_person_values(p):
+        return [p.full_name, p.email, p.address, p.phone_number]
+
+    def get_issue_values(i):
+        values = [i.fileref, *get_client_values(i.client)]
+        for user in (i.paralegal, i.lawyer):
+            if user:
+                values += [user.first_name, user.last_name, user.email]
+        values += [i.tenancy.address, i.tenancy.suburb, i.tenancy.postcode]
+        for person in (i.tenancy.landlord, i.tenancy.agent):
+            if person:
+                values += [person.full_name, person.email]
+        return values
+
+    _update_search_documents(Client.objects.all(), get_client_values)
+    _update_search_documents(Person.objects.all(), get_person_values)
+    _update_search_documents(
+        Issue.objects.select_related(
+            "client", "paralegal", "lawyer", "tenancy__landlord", "tenancy__agent"
+        ),
+        get_issue_values,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0098_issue_annual_income_range"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="client",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.AddField(
+            model_name="person",
+            name="search_document",
+            field=models.TextField(blank=True, default="", editable=False),
+        ),
+        migrations.RunPython(
+            _populate_search_documents,
+            reverse_code=migrations.RunPython.noop,
+        ),
+        migrations.AddField(
+            model_name="client",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "search_document", config="simple"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "search_document", config="simple"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="person",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.SearchVector(
+                    "search_document", config="simple"
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="core_client_search_vec"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="client",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="core_client_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="core_issue_search_vec"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="core_issue_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="core_person_search_vec"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="person",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_document"],
+                name="core_person_search_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
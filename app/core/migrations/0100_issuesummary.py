@@ -0,0 +1,64 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:00
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0099_search_document"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssueSummary",
+            fields=[
+                (
+                    "issue",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="summary",
+                        serialize=False,
+                        to="core.issue",
+                    ),
+                ),
+                ("is_open", models.BooleanField()),
+                ("created_at", models.DateTimeField()),
+                ("next_review", models.DateTimeField(blank=True, null=True)),
+                (
+                    "data",
+                    models.JSONField(
+                        encoder=django.core.serializers.json.DjangoJSONEncoder
+                    ),
+                ),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "paralegal",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["is_open", "created_at"],
+                        name="core_issues_is_open_99f0be_idx",
+                    ),
+                    models.Index(
+                        fields=["is_open", "next_review"],
+                        name="core_issues_is_open_82aca9_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
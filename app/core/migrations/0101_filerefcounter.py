@@ -0,0 +1,48 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:02
+
+from django.db import migrations, models
+from django.db.models import IntegerField, Max
+from django.db.models.functions import Cast, Substr
+
+
+def _seed_fileref_counters(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    FilerefCounter = apps.get_model("core", "FilerefCounter")
+
+    last_numbers = (
+        Issue.objects.filter(fileref__regex=r"^[A-Z][0-9]+$")
+        .annotate(prefix=Substr("fileref", 1, 1))
+        .values("prefix")
+        .annotate(value=Max(Cast(Substr("fileref", 2), IntegerField())))
+        .order_by("prefix")
+    )
+    FilerefCounter.objects.bulk_create(
+        [
+            FilerefCounter(prefix=row["prefix"], value=row["value"])
+            for row in last_numbers
+        ]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0100_issuesummary"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FilerefCounter",
+            fields=[
+                (
+                    "prefix",
+                    models.CharField(max_length=1, primary_key=True, serialize=False),
+                ),
+                ("value", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            _seed_fileref_counters,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
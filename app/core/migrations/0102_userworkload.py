@@ -0,0 +1,90 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Max, Q
+
+
+def _populate_user_workloads(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    UserWorkload = apps.get_model("core", "UserWorkload")
+
+    is_open = Q(is_open=True)
+    is_eviction = Q(topic__in=["EVICTION_ARREARS", "EVICTION_RETALIATORY"])
+    workloads = []
+    for role, field in (("PARALEGAL", "paralegal_id"), ("LAWYER", "lawyer_id")):
+        rows = (
+            Issue.objects.filter(**{f"{field}__isnull": False})
+            .order_by()
+            .values(field)
+            .annotate(
+                total_cases=Count("pk"),
+                open_cases=Count("pk", filter=is_open),
+                open_repairs=Count("pk", filter=is_open & Q(topic="REPAIRS")),
+                open_bonds=Count("pk", filter=is_open & Q(topic="BONDS")),
+                open_eviction=Count("pk", filter=is_open & is_eviction),
+                latest_issue_created_at=Max("created_at"),
+            )
+        )
+        for row in rows:
+            user_id = row.pop(field)
+            workloads.append(UserWorkload(user_id=user_id, role=role, **row))
+
+    UserWorkload.objects.bulk_create(workloads, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0101_filerefcounter"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="UserWorkload",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "role",
+                    models.CharField(
+                        choices=[("PARALEGAL", "Paralegal"), ("LAWYER", "Lawyer")],
+                        max_length=16,
+                    ),
+                ),
+                ("total_cases", models.PositiveIntegerField(default=0)),
+                ("open_cases", models.PositiveIntegerField(default=0)),
+                ("open_repairs", models.PositiveIntegerField(default=0)),
+                ("open_bonds", models.PositiveIntegerField(default=0)),
+                ("open_eviction", models.PositiveIntegerField(default=0)),
+                (
+                    "latest_issue_created_at",
+                    models.DateTimeField(blank=True, null=True),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="workloads",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "role")},
+            },
+        ),
+        migrations.RunPython(
+            _populate_user_workloads,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
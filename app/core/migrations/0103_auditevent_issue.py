@@ -0,0 +1,50 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def _populate_audit_event_issues(apps, schema_editor):
+    AuditEvent = apps.get_model("core", "AuditEvent")
+    ContentType = apps.get_model("contenttypes", "ContentType")
+    IssueNote = apps.get_model("core", "IssueNote")
+
+    content_type = ContentType.objects.filter(
+        app_label="core", model="auditevent"
+    ).first()
+    if not content_type:
+        return
+
+    # Each audit event is shown on its case's timeline by an IssueNote.
+    notes = IssueNote.objects.filter(
+        content_type=content_type, object_id=OuterRef("pk")
+    )
+    AuditEvent.objects.filter(issue__isnull=True).update(
+        issue_id=Subquery(notes.values("issue_id")[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("contenttypes", "0002_remove_content_type_name"),
+        ("core", "0102_userworkload"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="auditevent",
+            name="issue",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="audit_events",
+                to="core.issue",
+            ),
+        ),
+        migrations.RunPython(
+            _populate_audit_event_issues, reverse_code=migrations.RunPython.noop
+        ),
+    ]
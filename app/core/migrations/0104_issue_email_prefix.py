@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:34
+
+from django.db import migrations, models
+from django.db.models.functions import Cast, Left
+
+
+def _populate_email_prefixes(apps, schema_editor):
+    Issue = apps.get_model("core", "Issue")
+    Issue.objects.update(email_prefix=Left(Cast("id", models.CharField()), 8))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0103_auditevent_issue"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="email_prefix",
+            field=models.CharField(db_index=True, default="", max_length=8),
+        ),
+        migrations.RunPython(
+            _populate_email_prefixes, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0104_issue_email_prefix"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fileupload",
+            name="size_bytes",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
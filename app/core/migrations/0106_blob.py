@@ -0,0 +1,47 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:50
+
+import core.models.blob
+import core.models.upload
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0105_fileupload_size_bytes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Blob",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "modified_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("key", models.CharField(max_length=1088, unique=True)),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                "abstract": False,
+            },
+        ),
+        migrations.AlterField(
+            model_name="fileupload",
+            name="file",
+            field=core.models.blob.BlobFileField(
+                upload_to=core.models.upload.get_s3_key
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:52
+
+from django.db import migrations
+from django.db.models import Count
+
+
+def _create_blobs(apps, schema_editor):
+    """
+    Track the existing files as blobs, counting the rows which use each one.
+    """
+    Blob = apps.get_model("core", "Blob")
+    ref_counts = {}
+    for app_label, model_name in [
+        ("core", "FileUpload"),
+        ("emails", "EmailAttachment"),
+    ]:
+        model = apps.get_model(app_label, model_name)
+        rows = model.objects.exclude(file="").values("file").annotate(count=Count("pk"))
+        for row in rows.order_by():
+            ref_counts[row["file"]] = ref_counts.get(row["file"], 0) + row["count"]
+
+    Blob.objects.bulk_create(
+        [Blob(key=key, ref_count=count) for key, count in ref_counts.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0106_blob"),
+        ("emails", "0033_attachment_blob_file"),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_blobs, reverse_code=migrations.RunPython.noop),
+    ]
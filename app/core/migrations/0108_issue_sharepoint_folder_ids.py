@@ -0,0 +1,28 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0107_backfill_blobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="sharepoint_attachment_folder_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="sharepoint_folder_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="sharepoint_upload_folder_id",
+            field=models.CharField(blank=True, default="", max_length=64),
+        ),
+    ]
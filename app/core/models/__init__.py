@@ -1,10 +1,13 @@
 from .audit_event import AuditEvent
+from .blob import Blob, BlobFileField
 from .client import Client
 from .document_template import DocumentTemplate
+from .fileref_counter import FilerefCounter
 from .issue import CaseTopic, Issue
 from .issue_date import IssueDate
 from .issue_event import IssueEvent
 from .issue_note import IssueNote
+from .issue_summary import IssueSummary
 from .person import Person
 from .service import Service
 from .service_event import ServiceEvent
@@ -12,3 +15,4 @@ from .submission import Submission
 from .tenancy import Tenancy
 from .timestamped import TimestampedModel
 from .upload import FileUpload
+from .user_workload import UserWorkload
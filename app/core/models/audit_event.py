@@ -12,6 +12,15 @@ class AuditEvent(models.Model):
     """
 
     log_entry = models.ForeignKey(LogEntry, on_delete=models.PROTECT, related_name="+")
+    # The case the logged object belongs to, so that case timelines don't need
+    # to search the log entry's serialized data.
+    issue = models.ForeignKey(
+        "core.Issue",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="audit_events",
+    )
 
     issue_notes = GenericRelation(IssueNote)
 
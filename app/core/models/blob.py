@@ -0,0 +1,96 @@
+from django.core.files.storage import default_storage
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.fields.files import FieldFile
+from utils.uploads import FILE_FIELD_MAX_LENGTH_S3
+
+from .timestamped import TimestampedModel
+
+
+class Blob(TimestampedModel):
+    """
+    A file in storage which can be shared by many uploads, because its key is
+    derived from its content. Counts the rows which use it, so that the file
+    can be deleted from storage once none do.
+    """
+
+    key = models.CharField(max_length=FILE_FIELD_MAX_LENGTH_S3, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} ({self.ref_count})"
+
+    @classmethod
+    def store(cls, key: str, content, storage=default_storage, max_length=None):
+        """
+        Saves the content to storage unless there is already a blob with this
+        key, and adds a reference to it. Returns the key that was used.
+
+        Storage isn't rolled back with the database, so callers which store
+        blobs in a transaction should remove the references if it fails.
+        """
+        if cls.objects.filter(key=key).update(ref_count=F("ref_count") + 1):
+            return key
+
+        key = storage.save(key, content, max_length=max_length)
+        try:
+            with transaction.atomic():
+                cls.add_ref(key)
+        except Exception:
+            # Don't leave an untracked file behind, unless another upload has
+            # stored the same content under this key meanwhile.
+            if not cls.objects.filter(key=key).exists():
+                storage.delete(key)
+            raise
+
+        return key
+
+    @classmethod
+    def add_ref(cls, key: str):
+        """
+        Adds a reference to a file which is already in storage.
+        """
+        blob, created = cls.objects.get_or_create(key=key, defaults={"ref_count": 1})
+        if not created:
+            cls.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") + 1)
+
+    @classmethod
+    def remove_ref(cls, key: str, storage=default_storage, keep_file=False):
+        """
+        Removes a reference to a blob, deleting it from storage if it was the
+        last one and keep_file is False.
+        """
+        with transaction.atomic():
+            blob = cls.objects.select_for_update().filter(key=key).first()
+            if not blob:
+                # Files which aren't tracked as blobs are never deleted.
+                return
+
+            if blob.ref_count > 1:
+                cls.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+            else:
+                blob.delete()
+                if not keep_file:
+                    transaction.on_commit(lambda: storage.delete(key))
+
+
+class BlobFieldFile(FieldFile):
+    def save(self, name, content, save=True):
+        name = self.field.generate_filename(self.instance, name)
+        self.name = Blob.store(
+            name, content, storage=self.storage, max_length=self.field.max_length
+        )
+        setattr(self.instance, self.field.attname, self.name)
+        self._committed = True
+        if save:
+            self.instance.save()
+
+
+class BlobFileField(models.FileField):
+    """
+    A FileField which stores its files as Blobs. The upload_to function must
+    build the key from the file's content, so that files with the same key
+    have the same content.
+    """
+
+    attr_class = BlobFieldFile
@@ -7,6 +7,7 @@ from django.utils import timezone
 
 from accounts.models import User
 
+from .search import SearchableModel
 from .timestamped import TimestampedModel
 
 
@@ -109,7 +110,7 @@ class ContactRestriction(models.TextChoices):
     )
 
 
-class Client(TimestampedModel):
+class Client(SearchableModel, TimestampedModel):
     """
     A person that we are helping.
     """
@@ -191,6 +192,15 @@ class Client(TimestampedModel):
             return int((timezone.now() - self.date_of_birth).days / 365.25)
         return None
 
+    def get_search_values(self) -> list:
+        return [
+            self.first_name,
+            self.last_name,
+            self.preferred_name,
+            self.email,
+            self.phone_number,
+        ]
+
     def __str__(self) -> str:
         name = self.get_full_name()
         return f"{name} ({self.id})"
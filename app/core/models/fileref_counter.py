@@ -0,0 +1,41 @@
+from django.db import models, transaction
+from django.db.models.functions import Greatest
+
+
+class FilerefCounter(models.Model):
+    """
+    The last file reference number allocated for each fileref prefix.
+
+    Allocating a fileref locks the prefix's row until the transaction ends, so
+    concurrent cases can never be given the same fileref.
+    """
+
+    prefix = models.CharField(max_length=1, primary_key=True)
+    value = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.prefix}{self.value}"
+
+    @staticmethod
+    def allocate(prefix: str) -> int:
+        """
+        Returns the next file reference number for the prefix.
+        """
+        with transaction.atomic():
+            counter, _ = FilerefCounter.objects.select_for_update().get_or_create(
+                prefix=prefix
+            )
+            counter.value += 1
+            counter.save(update_fields=["value"])
+
+        return counter.value
+
+    @staticmethod
+    def observe(prefix: str, value: int):
+        """
+        Ensure a fileref number that was assigned by hand is never allocated.
+        """
+        FilerefCounter.objects.get_or_create(prefix=prefix)
+        FilerefCounter.objects.filter(prefix=prefix).update(
+            value=Greatest("value", value)
+        )
@@ -8,10 +8,13 @@ from django.db import models
 from django.urls import reverse
 
 from .client import Client
+from .fileref_counter import FilerefCounter
 from .person import Person
+from .search import SearchableModel
 from .submission import Submission
 from .tenancy import Tenancy
 from .timestamped import TimestampedModel
+from .tracking import TrackedFieldsModel
 
 
 # NOTE: The first letter of the topic is used as a prefix for the fileref. You
@@ -147,11 +150,17 @@ class IncomeRange(models.TextChoices):
     OVER_155K = "OVER_155K", "Over $155,000"
 
 
-class Issue(TimestampedModel):
+class Issue(SearchableModel, TrackedFieldsModel, TimestampedModel):
     """
     A client's specific issue.
     """
 
+    # Fields which the search document is built from, see get_search_values.
+    search_fields = ("fileref", "client_id", "tenancy_id", "lawyer_id", "paralegal_id")
+    # Fields which IssueEvents, notifications, user workloads and the search
+    # document depend on.
+    tracked_fields = ("is_open", "stage", "topic", *search_fields)
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     # What kind of case it is.
     topic = models.CharField(max_length=32, choices=CaseTopic.CHOICES)
@@ -168,6 +177,8 @@ class Issue(TimestampedModel):
     provided_legal_services = models.BooleanField(default=False)
     # File reference number for internal comms
     fileref = models.CharField(max_length=8, default="", blank=True)
+    # Identifies the case in its email address, see build_clerk_address.
+    email_prefix = models.CharField(max_length=8, default="", db_index=True)
     # Questionnaire answers
     answers = models.JSONField(encoder=DjangoJSONEncoder, null=True)
     # The person we are trying to help.
@@ -210,6 +221,15 @@ class Issue(TimestampedModel):
 
     # Tracks whether a matching folder has been set up in Sharepoint.
     is_sharepoint_set_up = models.BooleanField(default=False)
+    # Sharepoint drive item IDs of the case folder and its subfolders, so they
+    # can be used without searching for them by name.
+    sharepoint_folder_id = models.CharField(max_length=64, blank=True, default="")
+    sharepoint_upload_folder_id = models.CharField(
+        max_length=64, blank=True, default=""
+    )
+    sharepoint_attachment_folder_id = models.CharField(
+        max_length=64, blank=True, default=""
+    )
 
     # Store some point-in-time data with the case details so we can potentially
     # track changes over time.
@@ -244,10 +264,19 @@ class Issue(TimestampedModel):
     )
 
     def save(self, *args, **kwargs):
+        self.email_prefix = self.get_email_prefix()
         if not self.fileref:
             self.fileref = self.get_next_fileref()
+        elif self._state.adding:
+            self.observe_fileref()
         super().save(*args, **kwargs)
 
+    def get_email_prefix(self) -> str:
+        """
+        Returns the first block of the issue's id, eg. "0e62ccc2".
+        """
+        return str(self.id).split("-")[0]
+
     def get_fileref_prefix(self):
         match self.topic:
             case CaseTopic.RENT_REDUCTION:
@@ -262,24 +291,43 @@ class Issue(TimestampedModel):
         Returns next file reference code (eg. "R0023") for this issue topic.
         """
         prefix = self.get_fileref_prefix()
-        last_fileref = (
-            Issue.objects.exclude(fileref="")
-            .filter(fileref__startswith=prefix)
-            .order_by("fileref")
-            .values_list("fileref", flat=True)
-            .last()
-        )
-        if last_fileref:
-            # A prior fileref exists for this topic.
-            next_filref_count = int(last_fileref[1:]) + 1
-            rjust = max(4, len(str(next_filref_count)))
-        else:
-            # This is the first one.
-            rjust = 4
-            next_filref_count = 1
-
+        next_filref_count = FilerefCounter.allocate(prefix)
+        rjust = max(4, len(str(next_filref_count)))
         return prefix + str(next_filref_count).rjust(rjust, "0")
 
+    def observe_fileref(self):
+        """
+        Make sure a file reference code which was set by hand is never reused.
+        """
+        prefix, number = self.fileref[:1], self.fileref[1:]
+        if prefix and number.isdigit():
+            FilerefCounter.observe(prefix, int(number))
+
+    def is_search_document_stale(self) -> bool:
+        # Changes to the related models are picked up by core.signals.search,
+        # so only saves which change what the document is built from need to
+        # load them.
+        if self._state.adding:
+            return True
+        changed_fields = self.changed_fields
+        return any(name in changed_fields for name in self.search_fields)
+
+    def get_search_values(self) -> list:
+        values = [self.fileref]
+        if self.client_id:
+            values += self.client.get_search_values()
+        for user in (self.paralegal, self.lawyer):
+            if user:
+                values += [user.first_name, user.last_name, user.email]
+        if self.tenancy_id:
+            tenancy = self.tenancy
+            values += [tenancy.address, tenancy.suburb, tenancy.postcode]
+            for person in (tenancy.landlord, tenancy.agent):
+                if person:
+                    values += [person.full_name, person.email]
+
+        return values
+
     def __str__(self):
         return f"{self.id} {self.fileref}"
 
@@ -56,43 +56,49 @@ class IssueEvent(TimestampedModel):
 
     @staticmethod
     @transaction.atomic
-    def maybe_generate_event(issue: Issue, prev_issue: Issue):
-        assert issue.pk == prev_issue.pk
+    def maybe_generate_event(issue: Issue, changed_fields: dict):
+        """
+        Create IssueEvents for the changes in Issue.changed_fields
+        """
         create_kwargs_list = []
         event_types = []
-        if issue.lawyer != prev_issue.lawyer:
+        if "lawyer_id" in changed_fields:
             # Lawyer changed
+            prev_lawyer_id, next_lawyer_id = changed_fields["lawyer_id"]
             create_kwargs = {
-                "prev_user": prev_issue.lawyer,
-                "next_user": issue.lawyer,
+                "prev_user_id": prev_lawyer_id,
+                "next_user_id": next_lawyer_id,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.LAWYER)
 
-        if issue.paralegal != prev_issue.paralegal:
+        if "paralegal_id" in changed_fields:
             # Paralegal changed
+            prev_paralegal_id, next_paralegal_id = changed_fields["paralegal_id"]
             create_kwargs = {
-                "prev_user": prev_issue.paralegal,
-                "next_user": issue.paralegal,
+                "prev_user_id": prev_paralegal_id,
+                "next_user_id": next_paralegal_id,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.PARALEGAL)
 
-        if issue.is_open != prev_issue.is_open:
+        prev_stage, next_stage = changed_fields.get("stage", (issue.stage, issue.stage))
+        if "is_open" in changed_fields:
             # Open state changed
+            prev_is_open, next_is_open = changed_fields["is_open"]
             create_kwargs = {
-                "prev_is_open": prev_issue.is_open,
-                "next_is_open": issue.is_open,
-                "prev_stage": prev_issue.stage,
-                "next_stage": issue.stage,
+                "prev_is_open": prev_is_open,
+                "next_is_open": next_is_open,
+                "prev_stage": prev_stage,
+                "next_stage": next_stage,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.OPEN)
-        elif issue.stage != prev_issue.stage:
+        elif "stage" in changed_fields:
             # Stage changed
             create_kwargs = {
-                "prev_stage": prev_issue.stage,
-                "next_stage": issue.stage,
+                "prev_stage": prev_stage,
+                "next_stage": next_stage,
             }
             create_kwargs_list.append(create_kwargs)
             event_types.append(EventType.STAGE)
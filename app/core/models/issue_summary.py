@@ -0,0 +1,38 @@
+from accounts.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+from .issue import Issue
+
+
+class IssueSummary(models.Model):
+    """
+    A denormalised copy of an Issue's list representation, so that case lists
+    can be read from a single table without joins or aggregates.
+
+    Summaries are rebuilt whenever the Issue or any of its related data changes.
+    """
+
+    issue = models.OneToOneField(
+        Issue, on_delete=models.CASCADE, primary_key=True, related_name="summary"
+    )
+    # Copies of Issue fields used to filter & order case lists.
+    is_open = models.BooleanField()
+    paralegal = models.ForeignKey(
+        User, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    created_at = models.DateTimeField()
+    # The time of the next case review (the latest review note event).
+    next_review = models.DateTimeField(null=True, blank=True)
+    # The serialized Issue.
+    data = models.JSONField(encoder=DjangoJSONEncoder)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["is_open", "created_at"]),
+            models.Index(fields=["is_open", "next_review"]),
+        ]
+
+    def __str__(self):
+        return f"Summary of {self.issue_id}"
@@ -1,5 +1,6 @@
 from django.db import models
 
+from .search import SearchableModel
 from .timestamped import TimestampedModel
 
 
@@ -27,7 +28,7 @@ class SupportContactPreferences(models.TextChoices):
     )
 
 
-class Person(TimestampedModel):
+class Person(SearchableModel, TimestampedModel):
     """
     A non-client person who is involved in a case.
     """
@@ -41,3 +42,6 @@ class Person(TimestampedModel):
     support_contact_preferences = models.CharField(
         max_length=16, choices=SupportContactPreferences.choices, blank=True, default=""
     )
+
+    def get_search_values(self) -> list:
+        return [self.full_name, self.email, self.address, self.phone_number]
@@ -0,0 +1,76 @@
+import re
+
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from django.db import models
+
+
+def build_search_document(values) -> str:
+    """
+    Returns a normalised, lower case string of all non-empty values, used for
+    full-text and trigram search. Phone numbers and other values with
+    separators are also added with the separators removed so that "0412 345
+    678" can be found by searching "0412345678".
+    """
+    parts = []
+    for value in values:
+        if not value:
+            continue
+        value = " ".join(str(value).lower().split())
+        parts.append(value)
+        compact = re.sub(r"[\s()-]", "", value)
+        if compact != value and compact.isdigit():
+            parts.append(compact)
+
+    return " ".join(parts)
+
+
+class SearchableModel(models.Model):
+    """
+    A model with an indexed search document.
+
+    The search document is rebuilt from get_search_values() when the model is
+    saved, unless is_search_document_stale() says it doesn't need to be. The
+    search vector is generated from the document by Postgres.
+    """
+
+    search_document = models.TextField(default="", blank=True, editable=False)
+    search_vector = models.GeneratedField(
+        expression=SearchVector("search_document", config="simple"),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    class Meta:
+        abstract = True
+        indexes = [
+            GinIndex(
+                fields=["search_vector"],
+                name="%(app_label)s_%(class)s_search_vec",
+            ),
+            GinIndex(
+                fields=["search_document"],
+                opclasses=["gin_trgm_ops"],
+                name="%(app_label)s_%(class)s_search_trgm",
+            ),
+        ]
+
+    def get_search_values(self) -> list:
+        raise NotImplementedError()
+
+    def get_search_document(self) -> str:
+        return build_search_document(self.get_search_values())
+
+    def is_search_document_stale(self) -> bool:
+        """
+        Returns True if the search document should be rebuilt on save.
+        """
+        return True
+
+    def save(self, *args, **kwargs):
+        if self.is_search_document_stale():
+            self.search_document = self.get_search_document()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "search_document"}
+        super().save(*args, **kwargs)
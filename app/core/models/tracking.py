@@ -0,0 +1,76 @@
+from django.db import models
+
+
+class TrackedFieldsModel(models.Model):
+    """
+    Remembers the values of tracked_fields when an instance is loaded or saved,
+    so that signal receivers can see what changed without re-fetching the row.
+    """
+
+    # Attribute names of the fields to track, eg. "stage" or "lawyer_id".
+    tracked_fields: tuple[str, ...] = ()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.snapshot_tracked_fields()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        if fields is None:
+            self.snapshot_tracked_fields()
+        else:
+            # Django refreshes a deferred field when it's first read, which
+            # mustn't hide unsaved changes to the fields that were loaded.
+            self.snapshot_tracked_fields(fields)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.snapshot_tracked_fields()
+
+    def snapshot_tracked_fields(self, fields=None):
+        """
+        Remembers the current values of the tracked fields. If fields is given,
+        only those which haven't been remembered yet are added.
+        """
+        deferred_fields = self.get_deferred_fields()
+        if fields is None:
+            self._tracked_values = {}
+        tracked_values = getattr(self, "_tracked_values", {})
+        for name in self.tracked_fields:
+            if name in deferred_fields or name in tracked_values:
+                continue
+            if fields is None or name in fields:
+                tracked_values[name] = getattr(self, name)
+        self._tracked_values = tracked_values
+
+    @property
+    def changed_fields(self) -> dict:
+        """
+        Returns {name: (previous value, current value)} for each tracked field
+        which has changed since the instance was loaded or last saved.
+        """
+        if self._state.adding:
+            return {}
+
+        prev_values = getattr(self, "_tracked_values", {})
+        missing_fields = [f for f in self.tracked_fields if f not in prev_values]
+        if missing_fields:
+            # Fall back to the database for fields which weren't loaded.
+            db_values = (
+                type(self)._base_manager.filter(pk=self.pk).values(*missing_fields)
+            ).first()
+            prev_values.update(db_values or {})
+            self._tracked_values = prev_values
+
+        changes = {}
+        for name, prev_value in prev_values.items():
+            value = getattr(self, name)
+            if value != prev_value:
+                changes[name] = (prev_value, value)
+
+        return changes
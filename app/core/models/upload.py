@@ -1,9 +1,10 @@
-import hashlib
 import os
 import uuid
 
 from django.db import models
+from utils.uploads import hash_file
 
+from .blob import BlobFileField
 from .issue import Issue
 from .timestamped import TimestampedModel
 
@@ -15,11 +16,8 @@ def get_s3_key(file_upload, filename):
     """
     file = file_upload.file
     if file._file:
-        img_bytes = file._file.file.read()
-        file._file.file.seek(0)
-        filename_base = hashlib.md5(img_bytes).hexdigest()
         _, filename_ext = os.path.splitext(filename)
-        filename = filename_base + filename_ext.lower()
+        filename = hash_file(file._file) + filename_ext.lower()
 
     return f"{file_upload.UPLOAD_KEY}/{filename}"
 
@@ -32,5 +30,13 @@ class FileUpload(TimestampedModel):
     UPLOAD_KEY = "file-uploads"
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
-    file = models.FileField(upload_to=get_s3_key)
+    file = BlobFileField(upload_to=get_s3_key)
     issue = models.ForeignKey(Issue, on_delete=models.SET_NULL, null=True, blank=True)
+    # Size of the file, stored so that it can be read without asking storage.
+    size_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        if self.size_bytes is None and self.file:
+            self.size_bytes = self.file.size
+
+        super().save(*args, **kwargs)
@@ -0,0 +1,35 @@
+from accounts.models import User
+from django.db import models
+
+
+class WorkloadRole(models.TextChoices):
+    PARALEGAL = "PARALEGAL", "Paralegal"
+    LAWYER = "LAWYER", "Lawyer"
+
+
+class UserWorkload(models.Model):
+    """
+    Counts of the cases assigned to a user in a given role.
+
+    Kept up to date whenever an Issue's assignment, open state or topic
+    changes, so that the paralegal capacity page doesn't need to aggregate
+    every user's cases. Queryset .update() calls on those fields skip the Issue
+    signals, so call update_user_workloads() after them.
+    Use ./manage.py reconcile_user_workloads to rebuild.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="workloads")
+    role = models.CharField(max_length=16, choices=WorkloadRole.choices)
+    total_cases = models.PositiveIntegerField(default=0)
+    open_cases = models.PositiveIntegerField(default=0)
+    open_repairs = models.PositiveIntegerField(default=0)
+    open_bonds = models.PositiveIntegerField(default=0)
+    open_eviction = models.PositiveIntegerField(default=0)
+    # When the most recently created case assigned to the user was created.
+    latest_issue_created_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        unique_together = ["user", "role"]
+
+    def __str__(self):
+        return f"{self.role} workload for {self.user_id}"
@@ -0,0 +1,95 @@
+import logging
+import re
+
+from core.models import Issue
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F, Q, QuerySet
+
+logger = logging.getLogger(__name__)
+
+# Number of rows written per query when rebuilding search documents.
+REFRESH_BATCH_SIZE = 500
+
+
+def get_search_terms(text: str) -> list[str]:
+    """
+    Split free text search input into normalised search terms.
+    """
+    return [term for term in text.lower().split() if term]
+
+
+def search_queryset(
+    queryset: QuerySet, text: str, prefix: str = "", match_any: bool = False
+) -> QuerySet:
+    """
+    Filter a queryset of searchable models by free text search input.
+
+    Each search term is matched as a substring of the search document, which
+    is served by a trigram index. By default all terms must match, pass
+    match_any to return results that match any term. Use prefix to search a
+    related model, eg. prefix="issue__" to search IssueDates by their Issue.
+    """
+    terms = get_search_terms(text)
+    if not terms:
+        return queryset
+
+    search_filter = Q()
+    for term in terms:
+        term_filter = Q(**{f"{prefix}search_document__contains": term})
+        if match_any:
+            search_filter |= term_filter
+        else:
+            search_filter &= term_filter
+
+    return queryset.filter(search_filter)
+
+
+def rank_queryset(queryset: QuerySet, text: str) -> QuerySet:
+    """
+    Order a queryset of searchable models by how well they match free text
+    search input, falling back to the queryset's existing ordering.
+    """
+    terms = []
+    for term in get_search_terms(text):
+        # Strip characters which have special meaning in tsquery syntax.
+        term = re.sub(r"[^\w@.+-]", "", term)
+        if term:
+            terms.append(f"'{term}':*")
+
+    if not terms:
+        return queryset
+
+    query = SearchQuery(" | ".join(terms), search_type="raw", config="simple")
+    ordering = queryset.query.order_by
+    return queryset.annotate(
+        search_rank=SearchRank(F("search_vector"), query)
+    ).order_by("-search_rank", *ordering)
+
+
+def refresh_search_documents(queryset: QuerySet) -> int:
+    """
+    Rebuild the search documents of searchable models, eg. after a related
+    model has changed. Returns the number of rows updated.
+    """
+    model = queryset.model
+    if model is Issue:
+        queryset = queryset.select_related(
+            "client", "paralegal", "lawyer", "tenancy__landlord", "tenancy__agent"
+        )
+
+    count = 0
+    stale = []
+    for instance in queryset.order_by().iterator(chunk_size=REFRESH_BATCH_SIZE):
+        search_document = instance.get_search_document()
+        if search_document != instance.search_document:
+            instance.search_document = search_document
+            stale.append(instance)
+        if len(stale) >= REFRESH_BATCH_SIZE:
+            count += model.objects.bulk_update(stale, ["search_document"])
+            stale = []
+
+    if stale:
+        count += model.objects.bulk_update(stale, ["search_document"])
+
+    logger.info("Refreshed search documents for %s %s rows", count, model.__name__)
+    return count
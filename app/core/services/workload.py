@@ -0,0 +1,117 @@
+import logging
+
+from core.models import Issue, UserWorkload
+from core.models.issue import CaseTopic
+from core.models.user_workload import WorkloadRole
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+logger = logging.getLogger(__name__)
+
+# The Issue field which assigns a user to a case in each role.
+ROLE_FIELDS = {
+    WorkloadRole.PARALEGAL: "paralegal_id",
+    WorkloadRole.LAWYER: "lawyer_id",
+}
+WORKLOAD_FIELDS = [
+    "total_cases",
+    "open_cases",
+    "open_repairs",
+    "open_bonds",
+    "open_eviction",
+    "latest_issue_created_at",
+]
+
+
+@transaction.atomic
+def update_user_workloads(user_ids=None) -> int:
+    """
+    Recount the case workloads of the given users, or all users if None.
+    Returns the number of workloads updated.
+    """
+    if user_ids is not None:
+        user_ids = {pk for pk in user_ids if pk is not None}
+        if not user_ids:
+            return 0
+        _lock_user_workloads(user_ids)
+
+    is_open = Q(is_open=True)
+    workloads = []
+    for role, field in ROLE_FIELDS.items():
+        issues = Issue.objects.filter(**{f"{field}__isnull": False})
+        if user_ids is not None:
+            issues = issues.filter(**{f"{field}__in": user_ids})
+
+        counts = {
+            row[field]: row
+            for row in issues.order_by()
+            .values(field)
+            .annotate(
+                total_cases=Count("pk"),
+                open_cases=Count("pk", filter=is_open),
+                open_repairs=Count("pk", filter=is_open & Q(topic=CaseTopic.REPAIRS)),
+                open_bonds=Count("pk", filter=is_open & Q(topic=CaseTopic.BONDS)),
+                open_eviction=Count(
+                    "pk",
+                    filter=is_open
+                    & Q(
+                        topic__in=[
+                            CaseTopic.EVICTION_ARREARS,
+                            CaseTopic.EVICTION_RETALIATORY,
+                        ]
+                    ),
+                ),
+                latest_issue_created_at=Max("created_at"),
+            )
+        }
+        # Users who no longer have any cases in this role are reset to zero.
+        role_user_ids = set(counts) if user_ids is None else user_ids
+        if user_ids is None:
+            role_user_ids |= set(
+                UserWorkload.objects.filter(role=role).values_list("user_id", flat=True)
+            )
+
+        for user_id in role_user_ids:
+            row = counts.get(user_id, {})
+            workloads.append(
+                UserWorkload(
+                    user_id=user_id,
+                    role=role,
+                    **{name: row.get(name, 0) for name in WORKLOAD_FIELDS[:-1]},
+                    latest_issue_created_at=row.get("latest_issue_created_at"),
+                )
+            )
+
+    UserWorkload.objects.bulk_create(
+        workloads,
+        update_conflicts=True,
+        unique_fields=["user", "role"],
+        update_fields=WORKLOAD_FIELDS,
+    )
+    logger.debug("Updated %s user workloads", len(workloads))
+    return len(workloads)
+
+
+def _lock_user_workloads(user_ids):
+    """
+    Lock the workload rows of the given users until the transaction ends.
+
+    Two transactions assigning cases to the same user would otherwise each
+    recount without seeing the other's uncommitted case, and the last one to
+    commit would write a count that is too low. Once the lock is held, the
+    recount sees every committed assignment.
+    """
+    UserWorkload.objects.bulk_create(
+        [
+            UserWorkload(user_id=user_id, role=role)
+            for user_id in user_ids
+            for role in ROLE_FIELDS
+        ],
+        ignore_conflicts=True,
+    )
+    list(
+        UserWorkload.objects.select_for_update()
+        .filter(user_id__in=user_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
@@ -1,9 +1,21 @@
-from . import issue, issue_date, issue_event, service_event, submission
+from . import (
+    blob,
+    issue,
+    issue_date,
+    issue_event,
+    search,
+    service_event,
+    submission,
+    workload,
+)
 
 __all__ = [
+    "blob",
     "issue",
     "issue_date",
     "issue_event",
+    "search",
     "service_event",
     "submission",
+    "workload",
 ]
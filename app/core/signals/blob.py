@@ -0,0 +1,11 @@
+from core.models import Blob, FileUpload
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+from emails.models import EmailAttachment
+
+
+@receiver(post_delete, sender=EmailAttachment)
+@receiver(post_delete, sender=FileUpload)
+def post_delete_blob_file(sender, instance, **kwargs):
+    if instance.file:
+        Blob.remove_ref(instance.file.name, storage=instance.file.storage)
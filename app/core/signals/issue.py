@@ -17,12 +17,9 @@ def pre_save_issue(sender, instance, **kwargs):
     Detect state changes and create IssueEvents as required.
     This arguably belongs in the Issue.save() method coz then we could do atomic transactions.
     """
-    if instance.pk:
-        try:
-            prev_issue = Issue.objects.get(pk=instance.pk)
-        except Issue.DoesNotExist:
-            return
-        IssueEvent.maybe_generate_event(instance, prev_issue)
+    changed_fields = instance.changed_fields
+    if changed_fields:
+        IssueEvent.maybe_generate_event(instance, changed_fields)
 
 
 @receiver(post_save, sender=Issue)
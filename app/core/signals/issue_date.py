@@ -31,7 +31,7 @@ def post_log_task(log_entry, instance, error, **kwargs):
 def handle_issue_date_log(log_entry_pk: int, issue_id):
     log_entry = LogEntry.objects.get(pk=log_entry_pk)
     with transaction.atomic():
-        audit_event = AuditEvent.objects.create(log_entry=log_entry)
+        audit_event = AuditEvent.objects.create(log_entry=log_entry, issue_id=issue_id)
         IssueNote.objects.create(
             note_type=NoteType.EVENT,
             issue_id=issue_id,
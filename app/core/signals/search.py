@@ -0,0 +1,42 @@
+import logging
+
+from accounts.models import User
+from core.models import Client, Issue, Person, Tenancy
+from core.services.search import refresh_search_documents
+from django.db.models import Q
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# User fields which are included in Issue search documents.
+USER_SEARCH_FIELDS = {"first_name", "last_name", "email"}
+
+
+@receiver(post_save, sender=Client)
+def post_save_client(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Issue.objects.filter(client=instance))
+
+
+@receiver(post_save, sender=Tenancy)
+def post_save_tenancy(sender, instance, created, **kwargs):
+    if not created:
+        refresh_search_documents(Issue.objects.filter(tenancy=instance))
+
+
+@receiver(post_save, sender=Person)
+def post_save_person(sender, instance, created, **kwargs):
+    if not created:
+        q_filter = Q(tenancy__landlord=instance) | Q(tenancy__agent=instance)
+        refresh_search_documents(Issue.objects.filter(q_filter))
+
+
+@receiver(post_save, sender=User)
+def post_save_user(sender, instance, created, update_fields, **kwargs):
+    # Users are saved on every login, skip saves that don't touch searchable fields.
+    if created or (update_fields and not USER_SEARCH_FIELDS & set(update_fields)):
+        return
+
+    q_filter = Q(paralegal=instance) | Q(lawyer=instance)
+    refresh_search_documents(Issue.objects.filter(q_filter))
@@ -0,0 +1,32 @@
+import logging
+
+from core.models import Issue
+from core.services.workload import update_user_workloads
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+logger = logging.getLogger(__name__)
+
+# Issue fields which change the case workloads of the assigned users.
+WORKLOAD_FIELDS = {"paralegal_id", "lawyer_id", "is_open", "topic"}
+
+
+@receiver(post_save, sender=Issue)
+def post_save_issue_workload(sender, instance, created, **kwargs):
+    # Issue.changed_fields still holds the previous values until save() returns.
+    changed_fields = {} if created else instance.changed_fields
+    if not created and not WORKLOAD_FIELDS & changed_fields.keys():
+        return
+
+    user_ids = {instance.paralegal_id, instance.lawyer_id}
+    for name in ("paralegal_id", "lawyer_id"):
+        if name in changed_fields:
+            prev_user_id, _ = changed_fields[name]
+            user_ids.add(prev_user_id)
+
+    update_user_workloads(user_ids)
+
+
+@receiver(post_delete, sender=Issue)
+def post_delete_issue_workload(sender, instance, **kwargs):
+    update_user_workloads({instance.paralegal_id, instance.lawyer_id})
@@ -0,0 +1,65 @@
+from unittest import mock
+
+import pytest
+from core.factories import EmailAttachmentFactory, FileUploadFactory, get_dummy_file
+from core.models import Blob, FileUpload
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+def test_blob_shared_by_uploads(settings, tmpdir, django_capture_on_commit_callbacks):
+    settings.MEDIA_ROOT = str(tmpdir)
+    upload_1 = FileUploadFactory()
+    with mock.patch.object(
+        upload_1.file.storage, "save", wraps=upload_1.file.storage.save
+    ) as mock_save:
+        upload_2 = FileUploadFactory()
+
+    # The second upload has the same content, so isn't written again.
+    mock_save.assert_not_called()
+    assert upload_2.file.name == upload_1.file.name
+    assert upload_2.file.read() == upload_1.file.read()
+    blob = Blob.objects.get(key=upload_1.file.name)
+    assert blob.ref_count == 2
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upload_1.delete()
+
+    blob.refresh_from_db()
+    assert blob.ref_count == 1
+    assert upload_2.file.storage.exists(upload_2.file.name)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        upload_2.delete()
+
+    # The file is deleted with its last reference.
+    assert not Blob.objects.filter(key=upload_2.file.name).exists()
+    assert not upload_2.file.storage.exists(upload_2.file.name)
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+def test_blob_untracked_file_kept(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    attachment = EmailAttachmentFactory(file=get_dummy_file("image.png"))
+    # A file saved before blobs were tracked.
+    Blob.objects.all().delete()
+
+    attachment.delete()
+
+    assert attachment.file.storage.exists(attachment.file.name)
+
+
+@pytest.mark.django_db
+def test_blob_store_removes_file_if_not_tracked(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    upload = get_dummy_file("image.png")
+    storage = FileUpload.file.field.storage
+
+    with (
+        mock.patch.object(Blob, "add_ref", side_effect=Exception("Failed")),
+        pytest.raises(Exception, match="Failed"),
+    ):
+        Blob.store("uploads/image.png", upload, storage=storage)
+
+    assert not storage.exists("uploads/image.png")
@@ -1,7 +1,13 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
 import pytest
+from django.db import connection
 
-from core.models.issue import CaseTopic
-from core.factories import IssueFactory
+from core.models import FilerefCounter, Issue, IssueEvent
+from core.models.issue import CaseStage, CaseTopic
+from core.models.issue_event import EventType
+from core.factories import ClientFactory, IssueFactory, TenancyFactory, UserFactory
 
 
 @pytest.mark.django_db
@@ -48,3 +54,125 @@ def test_get_next_fileref__with_prior_filerefs__over_9999():
     IssueFactory(topic=CaseTopic.BONDS, fileref="B0056")
     issue = IssueFactory(topic=CaseTopic.REPAIRS)
     assert issue.fileref == "R10000"
+
+
+@pytest.mark.django_db
+def test_get_next_fileref__after_over_9999():
+    IssueFactory(topic=CaseTopic.REPAIRS, fileref="R10000")
+    IssueFactory(topic=CaseTopic.REPAIRS, fileref="R9999")
+    issue = IssueFactory(topic=CaseTopic.REPAIRS)
+    assert issue.fileref == "R10001"
+
+
+def on_own_connection(func):
+    """
+    Run func with a separate database connection, as a worker thread would.
+    """
+
+    def wrapper(*args):
+        try:
+            return func(*args)
+        finally:
+            connection.close()
+
+    return wrapper
+
+
+@pytest.mark.django_db
+def test_get_next_fileref__concurrent_issues():
+    """
+    Issues created at the same time are never given the same fileref.
+
+    Each worker commits on its own connection, outside of the test transaction,
+    so the test has to clean up after itself.
+    """
+
+    @on_own_connection
+    def set_up():
+        return ClientFactory(), TenancyFactory(landlord=None, agent=None)
+
+    @on_own_connection
+    def create_issue(i):
+        issue = Issue.objects.create(
+            topic=CaseTopic.REPAIRS, client=client, tenancy=tenancy
+        )
+        return issue.fileref
+
+    @on_own_connection
+    def tear_down():
+        Issue.objects.filter(client=client).delete()
+        tenancy.delete()
+        client.delete()
+        FilerefCounter.objects.filter(prefix="R").delete()
+
+    with ThreadPoolExecutor(max_workers=10) as executor:
+        client, tenancy = executor.submit(set_up).result()
+        try:
+            filerefs = list(executor.map(create_issue, range(300)))
+        finally:
+            executor.submit(tear_down).result()
+
+    assert len(set(filerefs)) == 300
+    assert sorted(filerefs) == [f"R{i:04}" for i in range(1, 301)]
+
+
+@pytest.mark.django_db
+def test_issue_changed_fields(django_assert_num_queries):
+    lawyer = UserFactory()
+    IssueFactory(stage=CaseStage.UNSTARTED)
+    issue = Issue.objects.get()
+    with django_assert_num_queries(0):
+        assert issue.changed_fields == {}
+        issue.stage = CaseStage.ADVICE
+        issue.lawyer = lawyer
+        assert issue.changed_fields == {
+            "stage": (CaseStage.UNSTARTED, CaseStage.ADVICE),
+            "lawyer_id": (None, lawyer.pk),
+        }
+
+    issue.save()
+    assert issue.changed_fields == {}
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+@mock.patch("case.signals.async_task", autospec=True)
+def test_issue_events_generated_on_save(mock_case_async, mock_issue_async):
+    issue = IssueFactory(stage=CaseStage.UNSTARTED, is_open=True)
+    issue.stage = CaseStage.ADVICE
+    issue.save()
+    issue.is_open = False
+    issue.stage = CaseStage.CLOSED
+    issue.save()
+    issue.save()
+
+    events = IssueEvent.objects.filter(issue=issue).order_by("created_at")
+    assert [
+        (e.event_type, e.prev_stage, e.next_stage, e.prev_is_open, e.next_is_open)
+        for e in events
+    ] == [
+        (EventType.STAGE, CaseStage.UNSTARTED, CaseStage.ADVICE, None, None),
+        (EventType.OPEN, CaseStage.ADVICE, CaseStage.CLOSED, True, False),
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+@mock.patch("case.signals.async_task", autospec=True)
+def test_issue_events_generated_on_save__deferred_fields(
+    mock_case_async, mock_issue_async
+):
+    IssueFactory(stage=CaseStage.UNSTARTED, is_open=True)
+    issue = Issue.objects.only("id", "stage").get()
+    issue.stage = CaseStage.ADVICE
+    # Reading a deferred field doesn't forget the unsaved change.
+    assert issue.topic
+    assert issue.changed_fields == {"stage": (CaseStage.UNSTARTED, CaseStage.ADVICE)}
+    issue.save()
+
+    events = IssueEvent.objects.filter(issue=issue)
+    assert [(e.event_type, e.prev_stage, e.next_stage) for e in events] == [
+        (EventType.STAGE, CaseStage.UNSTARTED, CaseStage.ADVICE)
+    ]
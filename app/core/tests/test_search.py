@@ -0,0 +1,81 @@
+import pytest
+
+from core.factories import ClientFactory, IssueFactory, PersonFactory, TenancyFactory
+from core.models import Issue
+from core.models.search import build_search_document
+from core.services.search import rank_queryset, search_queryset
+
+
+def test_build_search_document():
+    document = build_search_document(
+        ["R0001", "Jane  Citizen", None, "", "0412 345 678"]
+    )
+    assert document == "r0001 jane citizen 0412 345 678 0412345678"
+
+
+@pytest.mark.django_db
+def test_issue_search_document():
+    landlord = PersonFactory(full_name="Larry Landlord")
+    tenancy = TenancyFactory(address="1 Fake St", landlord=landlord)
+    client = ClientFactory(first_name="Jane", last_name="Citizen")
+    issue = IssueFactory(client=client, tenancy=tenancy, fileref="R0123")
+    document = issue.search_document
+    for value in ("r0123", "jane", "citizen", "1 fake st", "larry landlord"):
+        assert value in document
+
+
+@pytest.mark.django_db
+def test_search_queryset():
+    issue_a = IssueFactory(client=ClientFactory(first_name="Qzjane", last_name="Qzdoe"))
+    issue_b = IssueFactory(client=ClientFactory(first_name="Qzjane", last_name="Qzroe"))
+    IssueFactory(client=ClientFactory(first_name="Qzjohn", last_name="Qzsmith"))
+    issues = Issue.objects.all()
+
+    assert set(search_queryset(issues, "qzjane")) == {issue_a, issue_b}
+    assert set(search_queryset(issues, "QZJANE qzdoe")) == {issue_a}
+    assert set(search_queryset(issues, "qzdoe qzroe", match_any=True)) == {
+        issue_a,
+        issue_b,
+    }
+    assert list(search_queryset(issues, "  ")) == list(issues)
+
+
+@pytest.mark.django_db
+def test_rank_queryset():
+    issue_a = IssueFactory(client=ClientFactory(first_name="Qzjane", last_name="Qzdoe"))
+    issue_b = IssueFactory(client=ClientFactory(first_name="Qzjane", last_name="Qzroe"))
+    issues = search_queryset(Issue.objects.all(), "qzjane qzroe", match_any=True)
+    assert list(rank_queryset(issues, "qzjane qzroe")) == [issue_b, issue_a]
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+def test_search_document_updated_when_client_changes(monkeypatch):
+    monkeypatch.setattr("core.signals.issue.async_task", lambda *a, **k: None)
+    client = ClientFactory(first_name="Jane")
+    issue = IssueFactory(client=client)
+    client.first_name = "Janet"
+    client.save()
+    issue.refresh_from_db()
+    assert "janet" in issue.search_document
+
+
+@pytest.mark.django_db
+def test_issue_search_document_not_rebuilt_for_unrelated_fields(
+    django_assert_num_queries,
+):
+    issue = Issue.objects.get(pk=IssueFactory().pk)
+    issue.outcome_notes = "Resolved"
+    # Only the update, the related models aren't loaded.
+    with django_assert_num_queries(1):
+        issue.save()
+
+
+@pytest.mark.django_db
+def test_issue_search_document_rebuilt_when_client_changes():
+    issue = IssueFactory(client=ClientFactory(first_name="Jane"))
+    issue = Issue.objects.get(pk=issue.pk)
+    issue.client = ClientFactory(first_name="Janet")
+    issue.save(update_fields=["client"])
+    issue.refresh_from_db()
+    assert "janet" in issue.search_document
@@ -0,0 +1,135 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.db import transaction
+
+from case.views.paralegal import _annotate_user_capacity
+from core.factories import IssueFactory, UserFactory
+from core.models import FilerefCounter, Issue, UserWorkload
+from core.models.issue import CaseTopic
+from core.models.user_workload import WorkloadRole
+from core.services.workload import update_user_workloads
+from core.tests.test_issue import on_own_connection
+from accounts.models import User
+
+
+@pytest.mark.django_db
+def test_update_user_workloads():
+    paralegal = UserFactory()
+    lawyer = UserFactory()
+    issues = [
+        IssueFactory(paralegal=paralegal, lawyer=lawyer, topic=CaseTopic.REPAIRS),
+        IssueFactory(paralegal=paralegal, topic=CaseTopic.EVICTION_ARREARS),
+        IssueFactory(paralegal=paralegal, topic=CaseTopic.BONDS, is_open=False),
+    ]
+    issue = issues[-1]
+
+    assert update_user_workloads() == 2
+    workload = UserWorkload.objects.get(user=paralegal, role=WorkloadRole.PARALEGAL)
+    assert workload.total_cases == 3
+    assert workload.open_cases == 2
+    assert workload.open_repairs == 1
+    assert workload.open_bonds == 0
+    assert workload.open_eviction == 1
+    assert workload.latest_issue_created_at == max(i.created_at for i in issues)
+    workload = UserWorkload.objects.get(user=lawyer, role=WorkloadRole.LAWYER)
+    assert workload.total_cases == workload.open_cases == 1
+
+    # Users without any cases are reset to zero.
+    issue.paralegal = None
+    issue.lawyer = lawyer
+    issue.save()
+    update_user_workloads([paralegal.pk, lawyer.pk])
+    workload = UserWorkload.objects.get(user=paralegal, role=WorkloadRole.PARALEGAL)
+    assert workload.total_cases == 2
+    workload = UserWorkload.objects.get(user=lawyer, role=WorkloadRole.LAWYER)
+    assert workload.total_cases == 2
+
+
+@pytest.mark.django_db
+@pytest.mark.enable_signals
+@mock.patch("core.signals.issue.async_task", autospec=True)
+@mock.patch("core.signals.issue_event.send_case_assignment_slack", autospec=True)
+@mock.patch("case.signals.async_task", autospec=True)
+def test_user_workloads_updated_on_assignment(mock_case_async, mock_slack, mock_async):
+    prev_paralegal = UserFactory(case_capacity=4)
+    next_paralegal = UserFactory(case_capacity=0)
+    issue = IssueFactory(paralegal=prev_paralegal, topic=CaseTopic.REPAIRS)
+    update_user_workloads([prev_paralegal.pk])
+
+    issue.paralegal = next_paralegal
+    issue.save()
+
+    users = _annotate_user_capacity(User.objects.all(), WorkloadRole.PARALEGAL)
+    users = {u.pk: u for u in users}
+    assert users[prev_paralegal.pk].open_cases == 0
+    assert users[prev_paralegal.pk].capacity == 0
+    assert users[next_paralegal.pk].open_cases == 1
+    assert users[next_paralegal.pk].open_repairs == 1
+    assert users[next_paralegal.pk].capacity == -1
+
+    issue.is_open = False
+    issue.save()
+    workload = UserWorkload.objects.get(
+        user=next_paralegal, role=WorkloadRole.PARALEGAL
+    )
+    assert workload.open_cases == 0
+    assert workload.total_cases == 1
+
+
+@pytest.mark.django_db
+def test_update_user_workloads__concurrent_assignments():
+    """
+    Cases assigned to the same user at the same time are all counted.
+
+    Each worker commits on its own connection, outside of the test transaction,
+    so the test has to clean up after itself.
+    """
+
+    @on_own_connection
+    def set_up():
+        issues = [
+            IssueFactory(
+                topic=CaseTopic.REPAIRS, tenancy__landlord=None, tenancy__agent=None
+            )
+            for _ in range(2)
+        ]
+        return UserFactory(), issues
+
+    barrier = threading.Barrier(2, timeout=10)
+
+    @on_own_connection
+    def assign_issue(issue):
+        with transaction.atomic():
+            Issue.objects.filter(pk=issue.pk).update(paralegal=paralegal)
+            # Both cases are assigned before either transaction recounts.
+            barrier.wait()
+            update_user_workloads([paralegal.pk])
+
+    @on_own_connection
+    def get_total_cases():
+        workload = UserWorkload.objects.get(
+            user=paralegal, role=WorkloadRole.PARALEGAL
+        )
+        return workload.total_cases
+
+    @on_own_connection
+    def tear_down():
+        for issue in issues:
+            issue.delete()
+            issue.client.delete()
+            issue.tenancy.delete()
+        paralegal.delete()
+        FilerefCounter.objects.filter(prefix="R").delete()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        paralegal, issues = executor.submit(set_up).result()
+        try:
+            list(executor.map(assign_issue, issues))
+            total_cases = executor.submit(get_total_cases).result()
+        finally:
+            executor.submit(tear_down).result()
+
+    assert total_cases == 2
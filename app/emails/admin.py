@@ -3,7 +3,8 @@ from django.contrib.messages import constants as messages
 from django_q.tasks import async_task
 
 from .models import Email, EmailAttachment, EmailTemplate
-from .service.receive import ingest_email_task
+from .service.archive import restore_received_data
+from .service.receive import EMAIL_RECEIVE_RULES, ingest_email_task
 
 
 class AttachmentInline(admin.TabularInline):
@@ -31,15 +32,33 @@ class EmailAdmin(admin.ModelAdmin):
     )
     readonly_fields = ("thread_name",)
     inlines = [AttachmentInline]
-    actions = ["ingest"]
+    actions = ["ingest", "restore"]
 
     @admin.action(description="Ingest selected emails")
     def ingest(self, request, queryset):
-        for email in queryset:
+        # Emails which have already been ingested, including all archived
+        # emails, are rejected by ingest_email_task so skip them here.
+        emails = [
+            email
+            for email in queryset
+            if all(rule(email) for rule, _ in EMAIL_RECEIVE_RULES)
+        ]
+        for email in emails:
             async_task(ingest_email_task, str(email.pk))
 
+        skipped = len(queryset) - len(emails)
         self.message_user(
-            request, "Email ingestion task dispatched.", level=messages.INFO
+            request,
+            f"Email ingestion task dispatched for {len(emails)} emails, "
+            f"skipped {skipped} which can't be ingested.",
+            level=messages.INFO,
+        )
+
+    @admin.action(description="Restore archived received data")
+    def restore(self, request, queryset):
+        count = restore_received_data(queryset)
+        self.message_user(
+            request, f"Restored received data for {count} emails.", level=messages.INFO
         )
 
 
@@ -1,11 +1,16 @@
-import time
 import base64
-from typing import List, Tuple
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, List, Tuple
 
 import requests
 from django.conf import settings
+from django.core.files import File
 
-from sendgrid import SendGridAPIClient
 from sendgrid.helpers.mail import (
     Mail,
     To,
@@ -13,11 +18,6 @@ from sendgrid.helpers.mail import (
     Subject,
     From,
     Content,
-    Attachment,
-    FileContent,
-    FileName,
-    FileType,
-    Disposition,
 )
 
 
@@ -26,6 +26,13 @@ HEADERS = {"Authorization": f"Bearer {settings.SENDGRID_API_KEY}"}
 DEV_EMAIL_DOMAIN = "mail.dev.anikalegal.org.au"
 EMAIL_DOMAIN = settings.EMAIL_DOMAIN
 
+# Attachments are read and base64 encoded this many bytes at a time.
+ENCODE_CHUNK_SIZE = 3 * 256 * 1024
+# Buffers are kept in memory up to this size, then spilled to a temp file.
+SPOOL_MAX_SIZE = 1024 * 1024
+# Max number of attachments which are fetched from storage at once.
+FETCH_WORKERS = 4
+
 
 def send_email(
     from_addr: str,
@@ -33,10 +40,16 @@ def send_email(
     cc_addrs: List[str],
     subject: str,
     body: str,
-    attachments: List[Tuple[str, bytes, str]] = None,
+    attachments: List[Tuple[str, File, str]] = None,
     html: str = None,
 ):
-    sendgrid_client = SendGridAPIClient(settings.SENDGRID_API_KEY)
+    """
+    Sends an email with SendGrid, returning its message id. Attachments are
+    (file name, file, content type) tuples.
+
+    The request body is built in a temp file, so that sending an email near
+    the size limit doesn't need several copies of its attachments in memory.
+    """
     message = Mail()
     message.to = [To(email=to_addr)]
     message.cc = [Cc(email=email) for email in cc_addrs]
@@ -47,21 +60,103 @@ def send_email(
         content.append(Content(mime_type="text/html", content=html))
 
     message.content = content
-    if attachments:
-        message.attachment = [
-            Attachment(
-                file_content=FileContent(base64.b64encode(file_bytes).decode()),
-                file_name=FileName(file_name),
-                file_type=FileType(content_type),
-                disposition=Disposition("attachment"),
-            )
-            for file_name, file_bytes, content_type in attachments
-        ]
-    response = sendgrid_client.send(message)
+    with build_request_body(message.get(), attachments or []) as request_body:
+        response = requests.post(
+            BASE_URL + "/v3/mail/send",
+            data=request_body,
+            headers={**HEADERS, "Content-Type": "application/json"},
+            timeout=30,
+        )
+
+    response.raise_for_status()
     message_id = response.headers["X-Message-Id"]
     return message_id
 
 
+class SpooledBody(tempfile.SpooledTemporaryFile):
+    """
+    Temp file which can be used as a requests body without being read into
+    memory. Defines __len__ so that requests can set the Content-Length.
+    """
+
+    def __init__(self):
+        super().__init__(max_size=SPOOL_MAX_SIZE)
+
+    def __len__(self):
+        position = self.tell()
+        size = self.seek(0, os.SEEK_END)
+        self.seek(position)
+        return size
+
+
+def build_request_body(data: dict, attachments: List[Tuple[str, File, str]]) -> IO:
+    """
+    Returns the JSON body of a mail send request, with the attachments added
+    to the message data.
+
+    Attachments are fetched and base64 encoded in chunks, in parallel, and then
+    copied into the body one at a time.
+    """
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        futures = [executor.submit(encode_file, a[1]) for a in attachments]
+
+    request_body = SpooledBody()
+    try:
+        # Raises the first failure, the other buffers are closed below.
+        encoded_files = [future.result() for future in futures]
+        message = json.dumps(data)
+        if not attachments:
+            request_body.write(message.encode())
+        else:
+            # Splice the attachments into the end of the message's JSON object.
+            request_body.write(message[:-1].encode() + b', "attachments": [')
+            for i, (name, _, content_type) in enumerate(attachments):
+                attachment = json.dumps(
+                    {
+                        "filename": name,
+                        "type": content_type,
+                        "disposition": "attachment",
+                    }
+                )
+                if i > 0:
+                    request_body.write(b", ")
+                request_body.write(attachment[:-1].encode() + b', "content": "')
+                encoded_files[i].seek(0)
+                shutil.copyfileobj(encoded_files[i], request_body)
+                request_body.write(b'"}')
+
+            request_body.write(b"]}")
+    except Exception:
+        request_body.close()
+        raise
+    finally:
+        for future in futures:
+            if not future.exception():
+                future.result().close()
+
+    request_body.seek(0)
+    return request_body
+
+
+def encode_file(file: File) -> IO:
+    """
+    Returns a temp file containing the file's contents base64 encoded.
+    """
+    encoded_file = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    # Only encode whole 3 byte groups until the end of the file, so that the
+    # encoded chunks can be joined together.
+    remainder = b""
+    with file.open("rb"):
+        while chunk := file.read(ENCODE_CHUNK_SIZE):
+            chunk = remainder + chunk
+            end = len(chunk) - len(chunk) % 3
+            encoded_file.write(base64.b64encode(chunk[:end]))
+            remainder = chunk[end:]
+
+    encoded_file.write(base64.b64encode(remainder))
+    return encoded_file
+
+
 def set_inbound_parse_url(base_url):
     """
     Set inbound parse webhook URL.
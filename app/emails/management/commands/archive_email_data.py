@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from emails.service.archive import ARCHIVE_AFTER_DAYS, archive_received_data
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py archive_email_data
+    """
+
+    help = "Archive the raw data of emails which were ingested a while ago"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, default=ARCHIVE_AFTER_DAYS)
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        ingested_before = timezone.now() - timedelta(days=kwargs["days"])
+        count = archive_received_data(ingested_before, kwargs["batch_size"])
+        self.stdout.write(f"Archived received data for {count} emails")
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from emails.models import Email, EmailState
+from emails.utils.html import SANITIZER_VERSION, set_display_html
+
+# Drafts are skipped because their HTML can still change, they are rendered on
+# the fly until they are sent.
+BACKFILL_STATES = [
+    EmailState.SENT,
+    EmailState.DELIVERED,
+    EmailState.DELIVERY_FAILURE,
+    EmailState.INGESTED,
+]
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py backfill_email_display_html
+    """
+
+    help = "Store sanitized display HTML for emails which don't have it yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        # Only emails which are out of date are selected, so the command can be
+        # stopped and re-run to pick up where it left off.
+        email_qs = (
+            Email.objects.filter(state__in=BACKFILL_STATES)
+            .exclude(display_html_version=SANITIZER_VERSION)
+            .only("pk", "html", "text")
+            .order_by("pk")
+        )
+        total = email_qs.count()
+        self.stdout.write(f"Updating display HTML for {total} emails")
+
+        count, last_pk = 0, 0
+        while True:
+            emails = list(email_qs.filter(pk__gt=last_pk)[:batch_size])
+            if not emails:
+                break
+
+            for email in emails:
+                set_display_html(email)
+
+            Email.objects.bulk_update(emails, ["display_html", "display_html_version"])
+            count += len(emails)
+            last_pk = emails[-1].pk
+            self.stdout.write(f"\t{count}/{total}", ending="\r")
+
+        self.stdout.write(f"\nUpdated display HTML for {count} emails")
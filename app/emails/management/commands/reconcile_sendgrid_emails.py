@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from emails.service.events import reconcile_sendgrid_activity
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py reconcile_sendgrid_emails
+    """
+
+    help = "Update sent email states from SendGrid's recent activity"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the changes without saving them",
+        )
+
+    def handle(self, *args, **kwargs):
+        dry_run = kwargs["dry_run"]
+        report = reconcile_sendgrid_activity(dry_run=dry_run)
+        self.stdout.write(
+            f"Matched {report.matched}, missing {report.missing}, "
+            f"ambiguous {report.ambiguous}"
+        )
+        for email in report.updated:
+            self.stdout.write(
+                f"\tEmail<{email.pk}> state={email.state} "
+                f"sendgrid_id={email.sendgrid_id}"
+            )
+
+        verb = "Would update" if dry_run else "Updated"
+        self.stdout.write(f"{verb} {len(report.updated)} emails")
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def _set_empty_thread_names(apps, schema_editor):
+    # Emails without a subject are now threaded under "no-subject".
+    Email = apps.get_model("emails", "Email")
+    Email.objects.filter(thread_name="").update(thread_name="no-subject")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0103_auditevent_issue"),
+        ("emails", "0027_alter_email_received_data_hash"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="email",
+            index=models.Index(
+                fields=["issue", "thread_name", "created_at"],
+                name="emails_emai_issue_i_0c40b2_idx",
+            ),
+        ),
+        migrations.RunPython(
+            _set_empty_thread_names, reverse_code=migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0028_email_thread_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="display_html",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="email",
+            name="display_html_version",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
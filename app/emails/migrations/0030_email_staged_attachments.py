@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0029_email_display_html"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="staged_attachments",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
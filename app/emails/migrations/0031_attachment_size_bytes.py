@@ -0,0 +1,23 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0030_email_staged_attachments"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="email",
+            name="attachments_payload_bytes",
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="emailattachment",
+            name="size_bytes",
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
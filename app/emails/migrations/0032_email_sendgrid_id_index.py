@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0031_attachment_size_bytes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="email",
+            name="sendgrid_id",
+            field=models.CharField(
+                blank=True, db_index=True, default="", max_length=128
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:50
+
+import core.models.blob
+import utils.uploads
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0032_email_sendgrid_id_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="emailattachment",
+            name="file",
+            field=core.models.blob.BlobFileField(
+                max_length=1088, upload_to=utils.uploads.get_s3_key
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:53
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("emails", "0033_attachment_blob_file"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EmailArchive",
+            fields=[
+                (
+                    "email",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="archive",
+                        serialize=False,
+                        to="emails.email",
+                    ),
+                ),
+                ("received_data", models.BinaryField()),
+                (
+                    "archived_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+        ),
+    ]
@@ -1,15 +1,14 @@
-import hashlib
-import json
 import re
 
 import psycopg2
 from accounts.models import User
-from core.models import CaseTopic, Issue, TimestampedModel
+from core.models import BlobFileField, CaseTopic, Issue, TimestampedModel
 from django.contrib.postgres.fields import ArrayField
 from django.core.serializers.json import DjangoJSONEncoder
-from django.db import IntegrityError, models
+from django.db import DatabaseError, IntegrityError, models
 from django.utils import timezone
 from django.utils.text import slugify
+from emails.utils.size import base64_size
 from utils.uploads import FILE_FIELD_MAX_LENGTH_S3, get_s3_key
 
 
@@ -50,6 +49,14 @@ STATE_CHOICES = (
 )
 
 
+def get_thread_name(subject: str) -> str:
+    """
+    Returns the slug used to group emails into threads by subject line.
+    """
+    thread_name = re.sub(r"re\s*:\s*", "", subject or "", flags=re.IGNORECASE)
+    return slugify(thread_name) or slugify("No Subject")
+
+
 class Email(models.Model):
     from_address = models.EmailField(default="")
     to_address = models.EmailField(default="", blank=True)
@@ -59,17 +66,30 @@ class Email(models.Model):
     state = models.CharField(max_length=32, choices=STATE_CHOICES)
     text = models.TextField(default="", blank=True)
     html = models.TextField(default="", blank=True)
+    # Sanitized HTML shown to staff, see emails.utils.html.set_display_html.
+    display_html = models.TextField(default="", blank=True)
+    # The SANITIZER_VERSION used to build display_html, 0 if not built yet.
+    display_html_version = models.PositiveSmallIntegerField(default=0)
     created_at = models.DateTimeField(default=timezone.now)
     processed_at = models.DateTimeField(blank=True, null=True)
     issue = models.ForeignKey(Issue, blank=True, null=True, on_delete=models.PROTECT)
     sender = models.ForeignKey(
         User, blank=True, null=True, on_delete=models.PROTECT, related_name="sent_email"
     )
+    # Moved to an EmailArchive some time after the email is ingested.
     received_data = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
     received_data_hash = models.CharField(unique=True, null=True, blank=True)
+    # Inbound attachments which have been uploaded to storage but don't have an
+    # EmailAttachment yet, see save_staged_attachments.
+    staged_attachments = models.JSONField(default=list, blank=True)
+    # Running total of the base64 encoded size of the email's attachments,
+    # kept up to date by EmailAttachment.save and delete.
+    attachments_payload_bytes = models.PositiveBigIntegerField(default=0)
 
     # Sendgrid Email ID
-    sendgrid_id = models.CharField(max_length=128, blank=True, default="")
+    sendgrid_id = models.CharField(
+        max_length=128, blank=True, default="", db_index=True
+    )
 
     # Tracks whether an alert has been successfully sent.
     is_alert_sent = models.BooleanField(default=False)
@@ -77,17 +97,35 @@ class Email(models.Model):
     # Actionstep ID
     actionstep_id = models.IntegerField(blank=True, null=True)
 
-    def save(self, *args, **kwargs):
-        self.thread_name = slugify(
-            re.sub(r"re\s*:\s*", "", self.subject, flags=re.IGNORECASE)
-        )
-
-        # Hash contents of received_data field.
-        if self.state == EmailState.SAVING and self.received_data:
-            self.received_data_hash = hashlib.sha256(
-                json.dumps(self.received_data, sort_keys=True).encode()
-            ).hexdigest()
+    class Meta:
+        indexes = [models.Index(fields=["issue", "thread_name", "created_at"])]
 
+    def save(self, *args, **kwargs):
+        self.thread_name = get_thread_name(self.subject)
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            # attachments_payload_bytes is only changed with F() updates, see
+            # EmailAttachment.update_email_payload, so leave it out of full
+            # saves in case this instance was loaded before an attachment was
+            # added or removed. Deferred fields are left out too, as Django
+            # would for an instance loaded with only() or defer().
+            skip_fields = {"attachments_payload_bytes", *self.get_deferred_fields()}
+            update_fields = [
+                f.name
+                for f in self._meta.concrete_fields
+                if not f.primary_key and f.attname not in skip_fields
+            ]
+            try:
+                return self._save(*args, update_fields=update_fields, **kwargs)
+            except DatabaseError as e:
+                # Django raises a plain DatabaseError when no row was updated.
+                # The row was deleted, so insert it again like a full save of
+                # any other model would.
+                if type(e) is not DatabaseError:
+                    raise
+
+        self._save(*args, **kwargs)
+
+    def _save(self, *args, **kwargs):
         # Catch unique violation error for received_data_hash and convert to
         # something that is easier to use elsewhere.
         try:
@@ -124,6 +162,19 @@ class Email(models.Model):
         )
 
 
+class EmailArchive(models.Model):
+    """
+    The raw received_data of an ingested email, compressed and moved out of
+    the email table, see emails.service.archive.
+    """
+
+    email = models.OneToOneField(
+        Email, primary_key=True, on_delete=models.CASCADE, related_name="archive"
+    )
+    received_data = models.BinaryField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+
 class EmailTemplate(TimestampedModel):
     name = models.CharField(max_length=64, db_collation="natural")
     topic = models.CharField(
@@ -150,7 +201,7 @@ class EmailAttachment(models.Model):
         blank=True,
         related_name="attachments",
     )
-    file = models.FileField(upload_to=get_s3_key, max_length=FILE_FIELD_MAX_LENGTH_S3)
+    file = BlobFileField(upload_to=get_s3_key, max_length=FILE_FIELD_MAX_LENGTH_S3)
     content_type = models.CharField(max_length=128)
     created_at = models.DateTimeField(default=timezone.now)
     actionstep_id = models.IntegerField(blank=True, null=True)
@@ -159,6 +210,36 @@ class EmailAttachment(models.Model):
         default=SharepointState.NOT_UPLOADED,
         choices=SharepointState.choices,
     )
+    # Size of the file, stored so that it can be read without asking storage.
+    size_bytes = models.PositiveBigIntegerField(null=True, blank=True)
+
+    def save(self, *args, **kwargs):
+        is_new = self._state.adding
+        if self.size_bytes is None and self.file:
+            self.size_bytes = self.file.size
+
+        super().save(*args, **kwargs)
+        if is_new and self.email_id:
+            self.update_email_payload(self.email_id, self.payload_bytes)
+
+    def delete(self, *args, **kwargs):
+        email_id = self.email_id
+        result = super().delete(*args, **kwargs)
+        if email_id:
+            self.update_email_payload(email_id, -self.payload_bytes)
+
+        return result
+
+    @property
+    def payload_bytes(self) -> int:
+        """Size of the attachment once base64 encoded for sending."""
+        return base64_size(self.size_bytes or 0)
+
+    @staticmethod
+    def update_email_payload(email_id: int, delta: int):
+        Email.objects.filter(pk=email_id).update(  # ty:ignore[unresolved-attribute]
+            attachments_payload_bytes=models.F("attachments_payload_bytes") + delta
+        )
 
     def check_permission(self, user: User) -> bool:
         """
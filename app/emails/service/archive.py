@@ -0,0 +1,91 @@
+import json
+import logging
+import zlib
+from datetime import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import QuerySet
+from emails.models import Email, EmailArchive, EmailState
+
+logger = logging.getLogger(__name__)
+
+# Ingested emails keep their received_data in the email table for this long,
+# in case they need to be looked at.
+ARCHIVE_AFTER_DAYS = 30
+COMPRESSION_LEVEL = 9
+
+
+def compress_received_data(data: dict) -> bytes:
+    return zlib.compress(
+        json.dumps(data, cls=DjangoJSONEncoder).encode("utf-8"), COMPRESSION_LEVEL
+    )
+
+
+def decompress_received_data(data: bytes) -> dict:
+    return json.loads(zlib.decompress(data))
+
+
+def archive_received_data(ingested_before: datetime, batch_size: int = 500) -> int:
+    """
+    Moves the received_data of emails ingested before the given time into
+    compressed EmailArchives. The received_data_hash stays on the email, so
+    that duplicates are still rejected. Returns the number of emails archived.
+    """
+    # Emails are selected by whether they still have received_data, so this can
+    # be stopped and re-run to pick up where it left off.
+    email_qs = (
+        Email.objects.filter(  # ty:ignore[unresolved-attribute]
+            state=EmailState.INGESTED,
+            processed_at__lt=ingested_before,
+            received_data__isnull=False,
+        )
+        .only("pk", "received_data")
+        .order_by("pk")
+    )
+    count, last_pk = 0, 0
+    while True:
+        emails = list(email_qs.filter(pk__gt=last_pk)[:batch_size])
+        if not emails:
+            break
+
+        with transaction.atomic():
+            EmailArchive.objects.bulk_create(  # ty:ignore[unresolved-attribute]
+                [
+                    EmailArchive(
+                        email=email,
+                        received_data=compress_received_data(email.received_data),
+                    )
+                    for email in emails
+                ]
+            )
+            Email.objects.filter(  # ty:ignore[unresolved-attribute]
+                pk__in=[email.pk for email in emails]
+            ).update(received_data=None)
+
+        count += len(emails)
+        last_pk = emails[-1].pk
+
+    logger.info("Archived received data for %s emails", count)
+    return count
+
+
+def restore_received_data(email_qs: QuerySet) -> int:
+    """
+    Moves archived received_data back into the email table, so that it can be
+    looked at. Returns the number of emails restored.
+    """
+    archive_qs = EmailArchive.objects.filter(  # ty:ignore[unresolved-attribute]
+        email__in=email_qs
+    )
+    count = 0
+    with transaction.atomic():
+        for archive in archive_qs.select_for_update():
+            Email.objects.filter(  # ty:ignore[unresolved-attribute]
+                pk=archive.email_id
+            ).update(received_data=decompress_received_data(archive.received_data))
+            archive.delete()
+            count += 1
+
+    logger.info("Restored received data for %s emails", count)
+    return count
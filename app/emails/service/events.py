@@ -1,112 +1,256 @@
-from django.utils import timezone
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import timezone as tz
+from functools import partial
+
+from core.services.slack import send_email_failure_alert_slack
 from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django_q.tasks import async_task
 
-from emails.models import Email
+from emails.models import Email, EmailState
 from emails import api
 
+logger = logging.getLogger(__name__)
 
 EMAIL_DOMAIN = settings.EMAIL_DOMAIN
 
+# The email state set by each SendGrid event type, other events are ignored.
+EVENT_STATES = {
+    "delivered": EmailState.DELIVERED,
+    "bounce": EmailState.DELIVERY_FAILURE,
+    "dropped": EmailState.DELIVERY_FAILURE,
+}
+# The email state for each SendGrid message status when reconciling.
+MESSAGE_STATES = {
+    "delivered": EmailState.DELIVERED,
+    "not_delivered": EmailState.DELIVERY_FAILURE,
+}
+# Bounces and blocks are matched to an email sent to the same address within
+# this long of the failure.
+FAILURE_WINDOW = timedelta(minutes=2)
+# Messages which we don't have the sendgrid_id of are matched to an email sent
+# up to this long before SendGrid's last event for it, because SendGrid retries
+# deferred messages for up to 72 hours.
+MESSAGE_WINDOW = timedelta(hours=72)
+# Emails are indexed by recipient in buckets of this size by processed_at.
+BUCKET_SIZE = timedelta(hours=1)
+
+
+def process_email_events(events: list[dict]):
+    """
+    Updates the state of sent emails from a batch of SendGrid events.
+    """
+    # Events are applied in order, so the last event for an email wins.
+    states = {}
+    for event in events:
+        event_type = event["event"]
+        timestamp = event["timestamp"]
 
-def match_attempt():
-    print("Fetching messages...")
-    msgs = api.fetch_messages()
-    bounces = api.fetch_bounces()
-    blocks = api.fetch_blocks()
+        # Get the first part of the sg_message_id, if any.
+        sendgrid_id = None
+        sg_message_id = event.get("sg_message_id")
+        if sg_message_id:
+            sendgrid_id = sg_message_id.split(".")[0]
 
-    print("Matching failures...")
-    for failure_list in [bounces, blocks]:
-        for failure in failure_list:
-            event_at = timezone.datetime.fromtimestamp(
-                failure["created"], tz=timezone.utc
+        if not sendgrid_id:
+            logger.info(
+                f"Could not get sendgrid_id for event '{event_type}' at {timestamp}"
+            )
+            continue
+
+        if event_type not in EVENT_STATES:
+            logger.info(
+                f"Skipping email event '{event_type}' for email with sendgrid id {sendgrid_id}"
             )
-            before = event_at - timezone.timedelta(minutes=2)
-            after = event_at + timezone.timedelta(minutes=2)
-            email = None
-            try:
-                email = Email.objects.get(
-                    to_address=failure["email"],
-                    processed_at__gte=before,
-                    processed_at__lte=after,
-                )
-            except (Email.DoesNotExist, Email.MultipleObjectsReturned):
-                pass
-
-            if email:
-                Email.objects.filter(id=email.id).update(state="DELIVERY_FAILURE")
-
-    print("Matching all messages...")
-    found, missing, multiple = 0, 0, 0
-    count = len(msgs)
-    for idx, msg in enumerate(msgs):
-        print(f"Email {idx} / {count}... ", end="")
-        if not msg["from_email"].endswith(EMAIL_DOMAIN):
-            print("skipping.")
             continue
 
-        email = None
-        try:
-            email = Email.objects.get(sendgrid_id=msg["msg_id"])
-            found += 1
-        except Email.DoesNotExist:
-            pass
-
-        if not email:
-            try:
-                kwargs = {
-                    "from_address": msg["from_email"],
-                    "subject": msg["subject"],
-                }
-                if "to_email" in msg:
-                    kwargs["to_address"] = msg["to_email"]
-
-                email = Email.objects.get(**kwargs)
-                found += 1
-            except Email.DoesNotExist:
-                missing += 1
-            except Email.MultipleObjectsReturned:
-                multiple += 1
-                msg_detail = api.fetch_message(msg["msg_id"])
-                processed_time = None
-                for event in msg_detail["events"]:
-                    if event["event_name"] == "processed":
-                        processed_time = event["processed"]
-                        if not processed_time:
-                            continue
-
-                        event_at_naive = timezone.datetime.strptime(
-                            processed_time, "%Y-%m-%dT%H:%M:%SZ"
-                        )
-                        event_at = timezone.make_aware(event_at_naive, timezone.utc)
-                        before = event_at - timezone.timedelta(seconds=30)
-                        after = event_at + timezone.timedelta(seconds=30)
-                        try:
-                            email = Email.objects.get(
-                                to_address=msg["to_email"],
-                                from_address=msg["from_email"],
-                                subject=msg["subject"],
-                                processed_at__gte=before,
-                                processed_at__lte=after,
-                            )
-                            found += 1
-                            multiple -= 1
-                        except Email.DoesNotExist:
-                            missing += 1
-                            multiple -= 1
-                        except Email.MultipleObjectsReturned:
-                            pass
+        states[sendgrid_id] = EVENT_STATES[event_type]
+
+    if not states:
+        return
+
+    with transaction.atomic():
+        # Lock in a consistent order so that concurrent batches don't deadlock.
+        emails = list(
+            Email.objects.select_for_update()  # ty:ignore[unresolved-attribute]
+            .filter(sendgrid_id__in=states)
+            .only("pk", "state", "sendgrid_id", "is_alert_sent")
+            .order_by("pk")
+        )
+        for sendgrid_id in states.keys() - {email.sendgrid_id for email in emails}:
+            logger.info(f"Could not find email with sendgrid id {sendgrid_id}")
+
+        changed = []
+        for email in emails:
+            state = states[email.sendgrid_id]
+            # Skip if the email state is already the same.
+            if email.state != state:
+                logger.info(f"Setting Email<{email.pk}> state to '{state}'")
+                email.state = state
+                changed.append(email)
+
+        # A bulk update doesn't send post_save, so send the failure alerts that
+        # the signal would have sent.
+        Email.objects.bulk_update(changed, ["state"])  # ty:ignore[unresolved-attribute]
+        for email in changed:
+            if email.state == EmailState.DELIVERY_FAILURE and not email.is_alert_sent:
+                transaction.on_commit(
+                    partial(async_task, send_email_failure_alert_slack, email.pk)
+                )
+
+
+@dataclass
+class ReconcileReport:
+    matched: int = 0
+    missing: int = 0
+    ambiguous: int = 0
+    # Emails which were updated, or would be updated for a dry run.
+    updated: list[Email] = field(default_factory=list)
+
+
+class EmailIndex:
+    """
+    Emails indexed in memory by sendgrid_id and by recipient and the time
+    they were sent.
+    """
+
+    def __init__(self, emails):
+        self.by_sendgrid_id = {}
+        self.by_recipient = defaultdict(list)
+        for email in emails:
+            if email.sendgrid_id:
+                self.by_sendgrid_id[email.sendgrid_id] = email
+            if email.processed_at:
+                key = (email.to_address.lower(), get_bucket(email.processed_at))
+                self.by_recipient[key].append(email)
+
+    def find_sent_to(self, to_address: str, start, end) -> list[Email]:
+        to_address = to_address.lower()
+        emails = []
+        for bucket in range(get_bucket(start), get_bucket(end) + 1):
+            for email in self.by_recipient.get((to_address, bucket), []):
+                if start <= email.processed_at <= end:
+                    emails.append(email)
+
+        return emails
 
+
+def get_bucket(dt) -> int:
+    return int(dt.timestamp() // BUCKET_SIZE.total_seconds())
+
+
+def reconcile_emails(
+    messages: list[dict], failures: list[dict], dry_run: bool = False
+) -> ReconcileReport:
+    """
+    Matches SendGrid messages, bounces and blocks to emails and updates their
+    state and sendgrid_id. All the emails they could match are loaded in one
+    query.
+    """
+    report = ReconcileReport()
+    messages = [msg for msg in messages if msg["from_email"].endswith(EMAIL_DOMAIN)]
+    for msg in messages:
+        msg["sendgrid_id"] = msg["msg_id"].split(".")[0]
+        msg["last_event_at"] = datetime.fromisoformat(msg["last_event_time"])
+
+    for failure in failures:
+        failure["created_at"] = datetime.fromtimestamp(failure["created"], tz=tz.utc)
+
+    times = [msg["last_event_at"] for msg in messages]
+    times += [failure["created_at"] for failure in failures]
+    if not times:
+        return report
+
+    emails = Email.objects.filter(  # ty:ignore[unresolved-attribute]
+        Q(sendgrid_id__in=[msg["sendgrid_id"] for msg in messages])
+        | Q(
+            processed_at__gte=min(times) - MESSAGE_WINDOW,
+            processed_at__lte=max(times) + FAILURE_WINDOW,
+        )
+    ).only(
+        "pk",
+        "state",
+        "sendgrid_id",
+        "from_address",
+        "to_address",
+        "subject",
+        "processed_at",
+    )
+    index = EmailIndex(emails)
+    updated = {}
+
+    def update(email: Email, **fields):
+        for name, value in fields.items():
+            if getattr(email, name) != value:
+                setattr(email, name, value)
+                updated[email.pk] = email
+
+    def match(emails: list[Email]) -> Email | None:
+        if len(emails) == 1:
+            report.matched += 1
+            return emails[0]
+        elif emails:
+            report.ambiguous += 1
+        else:
+            report.missing += 1
+
+        return None
+
+    for failure in failures:
+        created_at = failure["created_at"]
+        email = match(
+            index.find_sent_to(
+                failure["email"],
+                created_at - FAILURE_WINDOW,
+                created_at + FAILURE_WINDOW,
+            )
+        )
         if email:
-            if msg["status"] == "delivered":
-                state = "DELIVERED"
-            elif msg["status"] == "not_delivered":
-                state = "DELIVERY_FAILURE"
-
-            print("updating email... ", end="")
-            Email.objects.filter(id=email.id).update(
-                sendgrid_id=msg["msg_id"], state=state
+            update(email, state=EmailState.DELIVERY_FAILURE)
+
+    # Messages are matched after failures, so that their status wins.
+    for msg in messages:
+        email = index.by_sendgrid_id.get(msg["sendgrid_id"])
+        if email:
+            report.matched += 1
+        elif "to_email" in msg:
+            last_event_at = msg["last_event_at"]
+            email = match(
+                [
+                    email
+                    for email in index.find_sent_to(
+                        msg["to_email"], last_event_at - MESSAGE_WINDOW, last_event_at
+                    )
+                    if email.from_address == msg["from_email"]
+                    and email.subject == msg["subject"]
+                ]
             )
         else:
-            print("not found... ", end="")
+            report.missing += 1
+
+        if email:
+            update(email, sendgrid_id=msg["sendgrid_id"])
+            if msg["status"] in MESSAGE_STATES:
+                update(email, state=MESSAGE_STATES[msg["status"]])
+
+    report.updated = list(updated.values())
+    if not dry_run:
+        Email.objects.bulk_update(  # ty:ignore[unresolved-attribute]
+            report.updated, ["state", "sendgrid_id"], batch_size=500
+        )
+
+    return report
+
 
-        print(f"found {found} missing {missing} multiple {multiple}")
+def reconcile_sendgrid_activity(dry_run: bool = False) -> ReconcileReport:
+    """
+    Updates the state of sent emails from SendGrid's recent email activity,
+    bounces and blocks, in case we missed some events.
+    """
+    messages = api.fetch_messages()
+    failures = api.fetch_bounces() + api.fetch_blocks()
+    return reconcile_emails(messages, failures, dry_run=dry_run)
@@ -1,12 +1,17 @@
+import hashlib
 import json
 import logging
+from functools import partial
 from email.utils import getaddresses
 
+from core.models import Blob
 from core.models.issue import CaseStage, Issue
 from core.models.issue_note import IssueNote, NoteType
 from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import transaction
-from django.db.models import Q, QuerySet
+from django.db.models import F, QuerySet
 from django.utils import timezone
 from django.utils.datastructures import MultiValueDict
 from emails.models import (
@@ -15,6 +20,8 @@ from emails.models import (
     EmailAttachment,
     EmailState,
 )
+from emails.utils.html import set_display_html
+from emails.utils.uploads import StagedUpload, stage_upload, store_staged_upload
 from utils.sentry import sentry_task
 from .send import build_clerk_address
 
@@ -32,20 +39,24 @@ EMAIL_RECEIVE_RULES = (
 
 def save_inbound_email(data: MultiValueDict, files: MultiValueDict) -> bool:
     """
-    Parse inbound email and attachment data from SendGrid and save to the database.
+    Save inbound email data from SendGrid to the database.
 
     Some ESPs impose strict time limits on webhooks, and will consider them
-    failed if they don't respond within a certain timeframe. We have to have a
-    mechanism to prevent adding duplicate emails when SendGrid resends the email
-    data after a timeout because we haven't finished processing it.
+    failed if they don't respond within a certain timeframe. To respond quickly
+    the attachments are already in storage by the time this is called (they're
+    streamed there by the StagedUploadHandler as the request is read) and only
+    the email row is saved here. The EmailAttachments are created later by
+    ingest_email_task. A hash of the email data is used to prevent adding
+    duplicate emails when SendGrid resends it after a timeout.
 
     ### Parameters
         1. data: data in SendGrid inbound parse default (i.e. not raw) format.
-        2. files: Django file upload objects for the files attached to the email.
+        2. files: StagedUploads (or Django file uploads) for the files attached
+           to the email.
 
     ### Returns
-        A boolean indicating whether the email and all attachments have been
-        successfully saved to the database.
+        A boolean indicating whether the email has been successfully saved to
+        the database.
 
     ### See
         - https://www.twilio.com/docs/sendgrid/for-developers/parsing-email/setting-up-the-inbound-parse-webhook#default-parameters
@@ -53,40 +64,93 @@ def save_inbound_email(data: MultiValueDict, files: MultiValueDict) -> bool:
     """
 
     logger.info("Saving inbound email data")
+    uploads = [stage_upload(file) for file in files.values()]
     try:
-        email = Email.objects.create(received_data=data, state=EmailState.SAVING)  # ty:ignore[unresolved-attribute]
+        with transaction.atomic():
+            email = Email.objects.create(  # ty:ignore[unresolved-attribute]
+                received_data=data,
+                received_data_hash=get_received_data_hash(data, uploads),
+                staged_attachments=[upload.to_json() for upload in uploads],
+                state=EmailState.RECEIVED,
+            )
     except DuplicateEmailDataError as e:
-        # We need to figure out if we are still saving the email and attachments
-        # so we can respond appropriately back to SendGrid. Note that we
-        # indicate that we haven't successfully saved to the database if the
-        # save is still in progress so we can get SendGrid to resend in case
-        # something goes wrong before we finish.
-        is_saved = (
-            Email.objects.filter(received_data_hash=e.hash)  # ty:ignore[unresolved-attribute]
-            .exclude(state=EmailState.SAVING)
-            .exists()
-        )
-        logger.info(f"{str(e)} - finished saving? {is_saved}")
-        return is_saved
+        # The email is saved in a single insert, so if it exists it has already
+        # been saved. Remove the copies of its attachments from this request.
+        logger.info(str(e))
+        for upload in uploads:
+            default_storage.delete(upload.name)
+
+        return True
 
     logger.info(f"Saved inbound email data, hash: {email.received_data_hash}")
+    return True
+
 
-    with transaction.atomic():
-        try:
-            for file in files.values():
-                EmailAttachment.objects.create(  # ty:ignore[unresolved-attribute]
-                    email=email, file=file, content_type=file.content_type
+def get_received_data_hash(data: MultiValueDict, uploads: list[StagedUpload]) -> str:
+    """
+    Returns a hash of an inbound email's data and attachments.
+    """
+    hasher = hashlib.sha256()
+    for key, value in sorted(data.items()):
+        hasher.update(json.dumps([key, value], cls=DjangoJSONEncoder).encode())
+    for upload in uploads:
+        hasher.update(upload.sha256.encode())
+
+    return hasher.hexdigest()
+
+
+def save_staged_attachments(email: Email):
+    """
+    Creates EmailAttachments for the inbound email's staged attachments.
+    """
+    if not email.staged_attachments:
+        return
+
+    staged_names = {staged["name"] for staged in email.staged_attachments}
+    # Storage isn't rolled back with the database, so the files are stored
+    # before the transaction and their references removed if it fails.
+    keys = []
+    try:
+        for staged in email.staged_attachments:
+            keys.append(store_staged_upload(staged))
+
+        with transaction.atomic():
+            attachments = [
+                EmailAttachment(
+                    email=email,
+                    file=key,
+                    content_type=staged["content_type"],
+                    # Attachments staged before sizes were recorded are filled
+                    # in by the backfill_file_sizes command.
+                    size_bytes=staged.get("size"),
                 )
-            email.state = EmailState.RECEIVED
-            email.save()
-        except Exception:
-            # Remove the email instance we created so that we can retry when
-            # SendGrid sends the email again.
-            email.delete()
-            raise
+                for staged, key in zip(email.staged_attachments, keys)
+            ]
+            EmailAttachment.objects.bulk_create(  # ty:ignore[unresolved-attribute]
+                attachments
+            )
+            # bulk_create skips EmailAttachment.save, so add up the payload here.
+            payload_bytes = sum(att.payload_bytes for att in attachments)
+            # Update the row directly so that the post_save signal isn't sent.
+            Email.objects.filter(pk=email.pk).update(  # ty:ignore[unresolved-attribute]
+                staged_attachments=[],
+                attachments_payload_bytes=F("attachments_payload_bytes")
+                + payload_bytes,
+            )
+    except Exception:
+        # Staged copies which are kept where they are (see store_staged_upload)
+        # are still needed to try again.
+        for key in keys:
+            Blob.remove_ref(key, keep_file=key in staged_names)
+        raise
 
-    logger.info(f"Finished saving inbound email, hash: {email.received_data_hash}")
-    return True
+    email.refresh_from_db(fields=["attachments_payload_bytes"])
+    # Staged copies which were stored under another key aren't needed once
+    # the attachments have been saved.
+    for name in staged_names - set(keys):
+        transaction.on_commit(partial(default_storage.delete, name))
+
+    email.staged_attachments = []
 
 
 @sentry_task
@@ -100,6 +164,8 @@ def ingest_email_task(email_pk: int):
             logger.error(f"Cannot ingest Email[{email_pk}]: {msg}")
             return
 
+    save_staged_attachments(email)
+
     try:
         if not email.received_data:
             raise Exception("No received data to parse")
@@ -115,6 +181,7 @@ def ingest_email_task(email_pk: int):
             email.subject = parsed_data["subject"]
             email.text = parsed_data["text"]
             email.html = parsed_data["html"]
+            set_display_html(email)
             email.processed_at = timezone.now()
             email.save()
 
@@ -154,11 +221,11 @@ def parse_received_data(email_data: dict) -> dict:
     if not local_to_addrs:
         raise Exception(f"No local 'to' addresses found: {to_addrs}")
 
-    issues = get_issues_from_addresses(local_to_addrs)
-    if issues.count() == 0:
+    issues = list(get_issues_from_addresses(local_to_addrs))
+    if len(issues) == 0:
         raise Exception(f"No issues found for 'to' addresses: {local_to_addrs}")
-    elif issues.count() == 1:
-        issue = issues.first()
+    elif len(issues) == 1:
+        issue = issues[0]
     else:
         # The email has been sent to multiple local addresses associated with
         # different issues. Select the latest open issue otherwise just the
@@ -167,9 +234,8 @@ def parse_received_data(email_data: dict) -> dict:
         # from our ESP from the creation of the email record. We could then
         # create an email record for each local "to" address and associate it
         # with the relevant issue.
-        issue = issues.exclude(stage=CaseStage.CLOSED).order_by("-created_at").first()
-        if not issue:
-            issue = issues.order_by("-created_at").first()
+        open_issues = [i for i in issues if i.stage != CaseStage.CLOSED]
+        issue = max(open_issues or issues, key=lambda i: i.created_at)
 
         logger.warning(
             "Multiple issues found for 'to' addresses %s, selecting Issue pk=%s, stage=%s, created_at=%s",
@@ -209,14 +275,15 @@ def parse_received_data(email_data: dict) -> dict:
 
 
 def get_issues_from_addresses(addresses: list[str]) -> QuerySet[Issue]:
-    query = Q()
+    prefixes = []
     for address in addresses:
         user, _ = address.split("@")
         user_parts = user.split(".")
-        issue_prefix = user_parts[-1]
-        query |= Q(id__startswith=issue_prefix)
+        prefixes.append(user_parts[-1].lower())
 
-    return Issue.objects.filter(query)  # ty:ignore[unresolved-attribute]
+    return Issue.objects.filter(  # ty:ignore[unresolved-attribute]
+        email_prefix__in=prefixes
+    )
 
 
 def is_inbound_email_domain(email_addr: str) -> bool:
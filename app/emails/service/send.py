@@ -1,14 +1,14 @@
 import os
 import logging
-from urllib.error import URLError
 
+import requests
 from django.conf import settings
 from django.utils import timezone
-from python_http_client.exceptions import HTTPError
 
 from core.models import IssueNote, Issue
 from core.models.issue_note import NoteType
 from emails.models import Email, EmailState
+from emails.utils.html import set_display_html
 from utils.sentry import sentry_task
 from emails.api import send_email
 
@@ -40,9 +40,9 @@ def send_email_task(email_pk: int):
     if email.issue:
         from_addr = build_clerk_address(email.issue, email_only=True)
         for att in email.attachments.all():
+            # Pass the file rather than its contents, send_email reads it in chunks.
             file_name = os.path.basename(att.file.name)
-            file_bytes = att.file.read()
-            attachments.append((file_name, file_bytes, att.content_type))
+            attachments.append((file_name, att.file, att.content_type))
 
     logger.info("Sending email to %s from %s", email.to_address, from_addr)
     try:
@@ -55,11 +55,12 @@ def send_email_task(email_pk: int):
             attachments,
             html=email.html,
         )
-    except (HTTPError, URLError):
+    except requests.RequestException:
         # SendGrid rejected the message. An oversized email (over 30MB once
         # base64 encoded) usually surfaces as an HTTPError (413), but the load
         # balancer may instead sever the connection mid-upload, which raises a
-        # URLError ("EOF occurred in violation of protocol") with no response.
+        # ConnectionError ("EOF occurred in violation of protocol") with no
+        # response.
         # Either way, mark it as failed so it isn't left stuck in READY_TO_SEND;
         # this fires the post_save signal that alerts the case team via Slack.
         # Re-raise so @sentry_task still captures the error.
@@ -67,10 +68,13 @@ def send_email_task(email_pk: int):
         email.state = EmailState.DELIVERY_FAILURE
         email.save()
         raise
+    set_display_html(email)
     Email.objects.filter(pk=email_pk).update(
         state=EmailState.SENT,
         processed_at=timezone.now(),
         sendgrid_id=message_id,
+        display_html=email.display_html,
+        display_html_version=email.display_html_version,
     )
     if email.issue:
         IssueNote.objects.create(
@@ -83,8 +87,8 @@ def send_email_task(email_pk: int):
 
 def build_clerk_address(issue: Issue, email_only=False):
     """
-    FIXME: TEST ME.
+    Returns the case's email address. Inbound emails are routed back to the
+    case by the address's Issue.email_prefix.
     """
-    issue_prefix = str(issue.id).split("-")[0]
-    email = f"case.{issue_prefix}@{settings.EMAIL_DOMAIN}"
+    email = f"case.{issue.get_email_prefix()}@{settings.EMAIL_DOMAIN}"
     return email if email_only else f"Anika Legal <{email}>"
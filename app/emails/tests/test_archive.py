@@ -0,0 +1,94 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from core.factories import EmailFactory
+from django.contrib import admin
+from django.core.management import call_command
+from django.utils import timezone
+from emails.admin import EmailAdmin
+from emails.models import Email, EmailArchive, EmailState
+from emails.service.archive import (
+    decompress_received_data,
+    restore_received_data,
+)
+from emails.service.receive import ingest_email_task
+
+RECEIVED_DATA = {"subject": "Hello", "text": "Hello " * 1000}
+
+
+@pytest.mark.django_db
+def test_archive_email_data():
+    old = timezone.now() - timedelta(days=60)
+    archived = EmailFactory(
+        state=EmailState.INGESTED,
+        processed_at=old,
+        received_data=RECEIVED_DATA,
+        received_data_hash="abc",
+    )
+    recent = EmailFactory(
+        state=EmailState.INGESTED,
+        processed_at=timezone.now(),
+        received_data=RECEIVED_DATA,
+    )
+    failed = EmailFactory(
+        state=EmailState.INGEST_FAILURE,
+        processed_at=old,
+        received_data=RECEIVED_DATA,
+    )
+
+    call_command("archive_email_data", days=30, batch_size=1)
+
+    archived.refresh_from_db()
+    assert archived.received_data is None
+    # The hash is kept to reject duplicates.
+    assert archived.received_data_hash == "abc"
+    data = bytes(archived.archive.received_data)
+    assert len(data) < len(RECEIVED_DATA["text"]) / 10
+    assert decompress_received_data(data) == RECEIVED_DATA
+    for email in (recent, failed):
+        email.refresh_from_db()
+        assert email.received_data == RECEIVED_DATA
+
+    assert EmailArchive.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_restore_received_data():
+    email = EmailFactory(
+        state=EmailState.INGESTED,
+        processed_at=timezone.now() - timedelta(days=60),
+        received_data=RECEIVED_DATA,
+    )
+    call_command("archive_email_data")
+
+    assert restore_received_data(Email.objects.filter(pk=email.pk)) == 1
+
+    email.refresh_from_db()
+    assert email.received_data == RECEIVED_DATA
+    assert not EmailArchive.objects.exists()
+
+
+@pytest.mark.django_db
+@patch("emails.admin.async_task")
+def test_admin_ingest_skips_ingested_emails(mock_async_task, rf, superuser):
+    received = EmailFactory(state=EmailState.INGEST_FAILURE)
+    archived = EmailFactory(
+        state=EmailState.INGESTED,
+        processed_at=timezone.now() - timedelta(days=60),
+        received_data=RECEIVED_DATA,
+    )
+    call_command("archive_email_data")
+    email_admin = EmailAdmin(Email, admin.site)
+    request = rf.post("/")
+    request.user = superuser
+
+    with patch.object(email_admin, "message_user") as mock_message_user:
+        email_admin.ingest(request, Email.objects.all())
+
+    mock_async_task.assert_called_once_with(ingest_email_task, str(received.pk))
+    assert "skipped 1" in mock_message_user.call_args.args[1]
+    # The archived email's data is left in the archive.
+    archived.refresh_from_db()
+    assert archived.received_data is None
+    assert EmailArchive.objects.filter(email=archived).exists()
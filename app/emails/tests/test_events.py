@@ -0,0 +1,118 @@
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from core.factories import EmailFactory
+from core.services.slack import send_email_failure_alert_slack
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from emails.models import Email, EmailState
+from emails.service.events import reconcile_emails
+
+
+def _event(event_type, sendgrid_id):
+    return {
+        "event": event_type,
+        "timestamp": 1700000000,
+        "sg_message_id": f"{sendgrid_id}.filterdrecv-1234",
+    }
+
+
+@pytest.mark.django_db
+@patch("emails.service.events.async_task")
+def test_events_email_view(mock_async_task, client, django_capture_on_commit_callbacks):
+    delivered = EmailFactory(state=EmailState.SENT, sendgrid_id="delivered")
+    bounced = EmailFactory(state=EmailState.SENT, sendgrid_id="bounced")
+    alerted = EmailFactory(
+        state=EmailState.SENT, sendgrid_id="alerted", is_alert_sent=True
+    )
+    failed = EmailFactory(state=EmailState.DELIVERY_FAILURE, sendgrid_id="failed")
+    events = [
+        _event("processed", "delivered"),
+        _event("delivered", "delivered"),
+        _event("delivered", "bounced"),
+        _event("bounce", "bounced"),
+        _event("dropped", "alerted"),
+        _event("bounce", "failed"),
+        _event("delivered", "unknown"),
+        {"event": "delivered", "timestamp": 1700000000},
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = client.post(
+            "/email/events/", events, content_type="application/json"
+        )
+
+    assert response.status_code == 200
+    for email in (delivered, bounced, alerted, failed):
+        email.refresh_from_db()
+
+    assert delivered.state == EmailState.DELIVERED
+    # The last event for an email wins.
+    assert bounced.state == EmailState.DELIVERY_FAILURE
+    assert alerted.state == EmailState.DELIVERY_FAILURE
+    assert failed.state == EmailState.DELIVERY_FAILURE
+    # Alerts are only sent for emails which changed to failed and weren't alerted.
+    mock_async_task.assert_called_once_with(send_email_failure_alert_slack, bounced.pk)
+
+
+def _message(sendgrid_id, status, to_email="client@example.com", **kwargs):
+    return {
+        "msg_id": f"{sendgrid_id}.filterdrecv-1234",
+        "from_email": f"case@{settings.EMAIL_DOMAIN}",
+        "to_email": to_email,
+        "subject": "Hello",
+        "status": status,
+        "last_event_time": "2024-01-01T10:05:00Z",
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+def test_reconcile_emails():
+    sent_at = datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+    kwargs = {
+        "state": EmailState.SENT,
+        "from_address": f"case@{settings.EMAIL_DOMAIN}",
+        "subject": "Hello",
+        "processed_at": sent_at,
+    }
+    by_id = EmailFactory(sendgrid_id="known", to_address="a@example.com", **kwargs)
+    by_recipient = EmailFactory(to_address="B@example.com", **kwargs)
+    bounced = EmailFactory(to_address="c@example.com", **kwargs)
+    # Two emails which could match the same message.
+    ambiguous = [EmailFactory(to_address="d@example.com", **kwargs) for _ in range(2)]
+    messages = [
+        _message("known", "delivered", to_email="a@example.com"),
+        _message("new", "delivered", to_email="b@example.com"),
+        _message("unknown", "delivered", to_email="x@example.com"),
+        _message("other", "not_delivered", to_email="d@example.com"),
+        _message("skipped", "delivered", from_email="someone@example.com"),
+    ]
+    failures = [{"email": "c@example.com", "created": sent_at.timestamp() + 60}]
+
+    report = reconcile_emails(messages, failures, dry_run=True)
+
+    assert (report.matched, report.missing, report.ambiguous) == (3, 1, 1)
+    assert {email.pk for email in report.updated} == {
+        by_id.pk,
+        by_recipient.pk,
+        bounced.pk,
+    }
+    # Nothing is saved in a dry run.
+    assert Email.objects.filter(state=EmailState.SENT).count() == 5
+
+    with CaptureQueriesContext(connection) as queries:
+        reconcile_emails(messages, failures)
+
+    # One query to load the emails and one to update them.
+    assert len(queries) == 2
+    for email in (by_id, by_recipient, bounced, *ambiguous):
+        email.refresh_from_db()
+
+    assert by_id.state == EmailState.DELIVERED
+    assert by_recipient.state == EmailState.DELIVERED
+    assert by_recipient.sendgrid_id == "new"
+    assert bounced.state == EmailState.DELIVERY_FAILURE
+    assert all(email.state == EmailState.SENT for email in ambiguous)
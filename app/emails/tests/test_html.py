@@ -0,0 +1,36 @@
+import pytest
+from core.factories import EmailFactory
+from django.core.management import call_command
+from emails.models import EmailState
+from emails.utils.html import SANITIZER_VERSION, get_display_html
+
+
+@pytest.mark.django_db
+def test_get_display_html():
+    email = EmailFactory(html="<p>Hi</p><script>alert(1)</script>")
+    assert get_display_html(email) == "<p>Hi</p>"
+
+    # Current stored HTML is used as is.
+    email.display_html = "<p>Stored</p>"
+    email.display_html_version = SANITIZER_VERSION
+    assert get_display_html(email) == "<p>Stored</p>"
+
+    # Stored HTML from an older sanitizer is ignored.
+    email.display_html_version = SANITIZER_VERSION - 1
+    assert get_display_html(email) == "<p>Hi</p>"
+
+
+@pytest.mark.django_db
+def test_backfill_email_display_html():
+    sent = EmailFactory(state=EmailState.SENT, html="", text="Hello\n\nthere")
+    draft = EmailFactory(state=EmailState.DRAFT, html="<p>Draft</p>")
+
+    call_command("backfill_email_display_html", batch_size=1)
+
+    sent.refresh_from_db()
+    assert sent.display_html == "<p>Hello</p><p>there</p>"
+    assert sent.display_html_version == SANITIZER_VERSION
+    # Drafts are still being edited, so are skipped.
+    draft.refresh_from_db()
+    assert draft.display_html == ""
+    assert draft.display_html_version == 0
@@ -4,8 +4,13 @@ import uuid
 import pytest
 from core.factories import EmailFactory, IssueFactory
 from core.models.issue import CaseStage, Issue
+from django.core.files.uploadedfile import SimpleUploadedFile
 from emails.models import EmailState
 from emails.service import ingest_email_task
+from emails.service.receive import get_issues_from_addresses
+from emails.utils.html import SANITIZER_VERSION
+from emails.utils.size import base64_size
+from emails.utils.uploads import stage_upload
 
 SUCCESS_TEST_CASES = [
     # Single recipient.
@@ -105,6 +110,51 @@ def test_ingest_email__with_success(settings, test_data):
     assert email.cc_addresses == expected_parsed["cc_addresses"], email.to_address
     assert email.subject == expected_parsed["subject"]
     assert email.text == expected_parsed["text"]
+    assert email.display_html == f"<p>{expected_parsed['text']}</p>"
+    assert email.display_html_version == SANITIZER_VERSION
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "envelope,expected_state",
+    [
+        (SUCCESS_TEST_CASES[0]["received_data"]["envelope"], EmailState.INGESTED),
+        (
+            '{"to":["to@example.com"],"from":"from@example.com"}',
+            EmailState.INGEST_FAILURE,
+        ),
+    ],
+)
+def test_ingest_email__stores_attachments_payload_bytes(
+    settings, tmpdir, envelope, expected_state
+):
+    """
+    The payload total added by save_staged_attachments isn't overwritten when
+    the ingested email is saved.
+    """
+    settings.MEDIA_ROOT = str(tmpdir)
+    settings.EMAIL_DOMAIN = "mail.fake.anikalegal.org.au"
+    IssueFactory(id=uuid.UUID("0e62ccc2-b9ee-4a07-979a-da8a9d450404"))
+    uploads = [
+        stage_upload(SimpleUploadedFile("a.txt", b"12345", content_type="text/plain")),
+        stage_upload(
+            SimpleUploadedFile("b.txt", b"1234567", content_type="text/plain")
+        ),
+    ]
+    received_data = {**SUCCESS_TEST_CASES[0]["received_data"], "envelope": envelope}
+    email = EmailFactory(
+        state=EmailState.INGEST_FAILURE,
+        received_data=received_data,
+        staged_attachments=[upload.to_json() for upload in uploads],
+        issue=None,
+    )
+    ingest_email_task(email.pk)
+    email.refresh_from_db()
+
+    assert email.state == expected_state
+    assert email.attachments.count() == 2
+    assert email.staged_attachments == []
+    assert email.attachments_payload_bytes == base64_size(5) + base64_size(7)
 
 
 SUCCESS_TEST_CASES_MULTIPLE_LOCAL_RECIPIENTS = [
@@ -188,3 +238,17 @@ def test_ingest_email__with_multiple_local_recipients(settings, test_data):
 
     assert email.state == EmailState.INGESTED
     assert email.issue == Issue.objects.get(pk=expected_issue_id)
+
+
+@pytest.mark.django_db
+def test_get_issues_from_addresses():
+    issue = IssueFactory(id=uuid.UUID("0e62ccc2-b9ee-4a07-979a-da8a9d450404"))
+    IssueFactory(id=uuid.UUID("0e62ccc3-b9ee-4a07-979a-da8a9d450404"))
+    assert issue.email_prefix == "0e62ccc2"
+
+    addresses = [
+        "case.0e62ccc2@mail.fake.anikalegal.org.au",
+        "CASE.0E62CCC2@mail.legacy.fake.anikalegal.org.au",
+    ]
+    assert list(get_issues_from_addresses(addresses)) == [issue]
+    assert not get_issues_from_addresses(["case.0e62cc@mail.fake.anikalegal.org.au"])
@@ -4,12 +4,18 @@ TODO: Rewrite tests to test the view as well as the service functions.
 """
 
 from io import BytesIO
+from unittest.mock import patch
 
 import pytest
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from core.models import Blob
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import InMemoryUploadedFile, SimpleUploadedFile
 from django.utils.datastructures import MultiValueDict
 from emails.models import Email, EmailAttachment
 from emails.service import save_inbound_email
+from emails.service.receive import save_staged_attachments
+from emails.utils.uploads import store_staged_upload
+from emails.utils.size import base64_size
 
 data = MultiValueDict(
     {
@@ -68,6 +74,8 @@ def test_save_inbound_email_with_single_attachment(settings, tmpdir):
 
     assert Email.objects.count() == 1
     email = Email.objects.last()
+    assert email.attachments.count() == 0
+    save_staged_attachments(email)
 
     assert email.attachments.count() == 1
     attachment = email.attachments.first()
@@ -88,12 +96,19 @@ def test_save_inbound_email_with_multiple_attachments(settings, tmpdir):
 
     assert Email.objects.count() == 1
     email = Email.objects.last()
+    assert email.attachments.count() == 0
+    save_staged_attachments(email)
     assert email.attachments.count() == 2
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == sum(
+        base64_size(f.size) for f in (file_1, file_2)
+    )
 
     attachment_1 = email.attachments.first()
     assert attachment_1.content_type == file_1.content_type
     assert attachment_1.file.name.endswith(file_1.name)
     assert attachment_1.file.read() == file_1_content.getvalue()
+    assert attachment_1.size_bytes == file_1.size
 
     attachment_2 = email.attachments.last()
     assert attachment_2.content_type == file_2.content_type
@@ -102,7 +117,9 @@ def test_save_inbound_email_with_multiple_attachments(settings, tmpdir):
 
 
 @pytest.mark.django_db
-def test_save_inbound_email_with_duplicate_attachments(settings, tmpdir):
+def test_save_inbound_email_with_duplicate_attachments(
+    settings, tmpdir, django_capture_on_commit_callbacks
+):
     settings.MEDIA_ROOT = str(tmpdir)
     files = MultiValueDict({"attachment1": [file_1], "attachment2": [file_1]})
 
@@ -113,7 +130,13 @@ def test_save_inbound_email_with_duplicate_attachments(settings, tmpdir):
 
     assert Email.objects.count() == 1
     email = Email.objects.last()
+    assert email.attachments.count() == 0
+    with django_capture_on_commit_callbacks(execute=True):
+        save_staged_attachments(email)
+
     assert email.attachments.count() == 2
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == 2 * base64_size(file_1.size)
 
     attachment_1 = email.attachments.first()
     assert attachment_1.content_type == file_1.content_type
@@ -122,7 +145,82 @@ def test_save_inbound_email_with_duplicate_attachments(settings, tmpdir):
 
     attachment_2 = email.attachments.last()
     assert attachment_2.content_type == file_1.content_type
-    # Note that the file name will be different due to how Django handles
-    # duplicate file names.
-    assert not attachment_2.file.name.endswith(file_1.name)
-    assert attachment_2.file.read() == file_1_content.getvalue()
+    # Attachments with the same content share one file.
+    assert attachment_2.file.name == attachment_1.file.name
+    assert Blob.objects.get(key=attachment_1.file.name).ref_count == 2
+    assert [p.basename for p in tmpdir.visit() if p.isfile()] == ["test_1.txt"]
+
+
+@pytest.mark.django_db
+def test_save_inbound_email_rejects_duplicates(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    files = MultiValueDict({"attachment1": [file_1]})
+
+    assert save_inbound_email(data, files)
+    assert save_inbound_email(data, files)
+
+    assert Email.objects.count() == 1
+    # The duplicate's copy of the attachment is removed.
+    assert len([p for p in tmpdir.visit() if p.isfile()]) == 1
+
+
+@pytest.mark.django_db
+def test_receive_email_view_streams_attachments(client, settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    settings.FILE_UPLOAD_MAX_MEMORY_SIZE = 10
+    attachment = SimpleUploadedFile(
+        "big file.pdf", b"x" * 1000, content_type="application/pdf"
+    )
+    post_data = {
+        "subject": "Test subject",
+        "to": "to@example.com",
+        "text": "Body text",
+        "attachment1": attachment,
+    }
+
+    response = client.post("/email/receive/", post_data)
+
+    assert response.status_code == 200
+    email = Email.objects.get()
+    [staged] = email.staged_attachments
+    assert staged["content_type"] == "application/pdf"
+    assert staged["name"].endswith("/big-file.pdf")
+    assert email.attachments.count() == 0
+    save_staged_attachments(email)
+    assert email.staged_attachments == []
+    assert email.attachments.get().file.read() == b"x" * 1000
+
+
+@pytest.mark.django_db
+def test_save_staged_attachments_failure_removes_stored_files(
+    settings, tmpdir, django_capture_on_commit_callbacks
+):
+    settings.MEDIA_ROOT = str(tmpdir)
+    files = MultiValueDict({"attachment1": [file_1]})
+    save_inbound_email(data, files)
+    email = Email.objects.last()
+    staged_name = email.staged_attachments[0]["name"]
+
+    stored_keys = []
+
+    def store(staged):
+        stored_keys.append(store_staged_upload(staged))
+        return stored_keys[-1]
+
+    with (
+        patch("emails.service.receive.store_staged_upload", side_effect=store),
+        patch.object(
+            EmailAttachment.objects, "bulk_create", side_effect=Exception("Failed")
+        ),
+        django_capture_on_commit_callbacks(execute=True),
+        pytest.raises(Exception, match="Failed"),
+    ):
+        save_staged_attachments(email)
+
+    # The stored blob is removed, the staged file is kept to try again.
+    assert len(stored_keys) == 1
+    assert not default_storage.exists(stored_keys[0])
+    assert not Blob.objects.exists()
+    assert default_storage.exists(staged_name)
+    email.refresh_from_db()
+    assert len(email.staged_attachments) == 1
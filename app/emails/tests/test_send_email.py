@@ -1,11 +1,15 @@
-from unittest.mock import patch
-from urllib.error import URLError
+import base64
+import json
+from unittest.mock import Mock, patch
 
 import pytest
-from python_http_client.exceptions import HTTPError
+import requests
+from django.core.files.base import ContentFile
 
+from emails.api import build_request_body, send_email
 from emails.models import Email, EmailState
 from emails.service.send import build_clerk_address, send_email_task
+from emails.utils.html import SANITIZER_VERSION
 
 from core.factories import EmailFactory, IssueFactory
 
@@ -25,9 +29,9 @@ def test_build_email_address(settings):
     "error",
     [
         # SendGrid returns a structured response (e.g. 413 for an oversized email).
-        HTTPError(413, "Payload Too Large", b"too big", {}),
+        requests.HTTPError("413 Client Error: Payload Too Large"),
         # Or the load balancer severs the connection mid-upload, with no response.
-        URLError("EOF occurred in violation of protocol"),
+        requests.ConnectionError("EOF occurred in violation of protocol"),
     ],
 )
 @patch("emails.service.send.send_email")
@@ -42,3 +46,74 @@ def test_send_email_task_marks_failure_on_sendgrid_error(mock_send_email, error)
 
     email.refresh_from_db()
     assert email.state == EmailState.DELIVERY_FAILURE
+
+
+@pytest.mark.django_db
+@patch("emails.service.send.send_email")
+def test_send_email_task_stores_display_html(mock_send_email):
+    mock_send_email.return_value = "sendgrid-id"
+    email = EmailFactory(
+        state=EmailState.READY_TO_SEND, html="<p>Hello</p><script>alert(1)</script>"
+    )
+
+    send_email_task(email.pk)
+
+    email.refresh_from_db()
+    assert email.state == EmailState.SENT
+    assert email.display_html == "<p>Hello</p>"
+    assert email.display_html_version == SANITIZER_VERSION
+
+
+@patch("emails.api.ENCODE_CHUNK_SIZE", 4)
+@patch("emails.api.requests.post")
+def test_send_email_request_body(mock_post):
+    def post(url, data, headers, timeout):
+        assert len(data) == len(data.read())
+        data.seek(0)
+        post.body = json.loads(data.read())
+        return Mock(headers={"X-Message-Id": "sendgrid-id"})
+
+    mock_post.side_effect = post
+    attachments = [
+        ("a.txt", ContentFile(b"Hello world", name="a.txt"), "text/plain"),
+        ("b.bin", ContentFile(bytes(range(256)), name="b.bin"), "application/x"),
+    ]
+
+    message_id = send_email(
+        "from@example.com",
+        "to@example.com",
+        [],
+        "Subject",
+        "Body",
+        attachments,
+        html="<p>Body</p>",
+    )
+
+    assert message_id == "sendgrid-id"
+    assert post.body["subject"] == "Subject"
+    assert [a["filename"] for a in post.body["attachments"]] == ["a.txt", "b.bin"]
+    assert post.body["attachments"][0]["type"] == "text/plain"
+    assert post.body["attachments"][0]["disposition"] == "attachment"
+    assert base64.b64decode(post.body["attachments"][0]["content"]) == b"Hello world"
+    assert base64.b64decode(post.body["attachments"][1]["content"]) == bytes(range(256))
+
+
+def test_build_request_body_closes_buffers_on_failure():
+    encoded = Mock()
+
+    def encode(file):
+        if file.name == "bad.txt":
+            raise OSError("Can't read file")
+        return encoded
+
+    attachments = [
+        ("a.txt", ContentFile(b"Hello", name="a.txt"), "text/plain"),
+        ("bad.txt", ContentFile(b"", name="bad.txt"), "text/plain"),
+    ]
+    with (
+        patch("emails.api.encode_file", side_effect=encode),
+        pytest.raises(OSError),
+    ):
+        build_request_body({"subject": "Subject"}, attachments)
+
+    encoded.close.assert_called_once()
@@ -1,12 +1,10 @@
-from types import SimpleNamespace
-
+import pytest
+from core.factories import EmailAttachmentFactory, EmailFactory, get_dummy_file
+from django.core.management import call_command
+from emails.models import Email, EmailAttachment
 from emails.utils.size import base64_size, format_size, get_email_payload_size
 
 
-def _attachment(size):
-    return SimpleNamespace(file=SimpleNamespace(size=size))
-
-
 def test_base64_size():
     # base64 encodes 3 bytes into 4, padding partial groups.
     assert base64_size(0) == 0
@@ -17,13 +15,13 @@ def test_base64_size():
 
 
 def test_get_email_payload_size_counts_body_and_encoded_attachments():
-    size = get_email_payload_size("ab", "cde", [_attachment(3), _attachment(6)])
+    size = get_email_payload_size("ab", "cde", base64_size(3) + base64_size(6))
     # body: 2 + 3 bytes; attachments: base64_size(3)=4, base64_size(6)=8
     assert size == 2 + 3 + 4 + 8
 
 
 def test_get_email_payload_size_handles_no_body():
-    assert get_email_payload_size(None, None, []) == 0
+    assert get_email_payload_size(None, None, 0) == 0
 
 
 def test_format_size():
@@ -37,4 +35,65 @@ def test_get_email_payload_size_accounts_for_base64_inflation():
     # bug the old per-file `size / 1024 / 1024 > 30` check missed.
     raw = 25 * 1024 * 1024
     assert raw < 30 * 1024 * 1024
-    assert get_email_payload_size("", "", [_attachment(raw)]) > 30 * 1024 * 1024
+    assert get_email_payload_size("", "", base64_size(raw)) > 30 * 1024 * 1024
+
+
+@pytest.mark.django_db
+def test_attachments_payload_bytes_running_total(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    email = EmailFactory()
+    att_1 = EmailAttachmentFactory(email=email, file=get_dummy_file("a.png"))
+    att_2 = EmailAttachmentFactory(email=email, file=get_dummy_file("b.png"))
+    assert att_1.size_bytes == att_1.file.size
+
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == 2 * base64_size(att_1.size_bytes)
+
+    att_2.delete()
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == base64_size(att_1.size_bytes)
+
+
+@pytest.mark.django_db
+def test_backfill_file_sizes(settings, tmpdir):
+    settings.MEDIA_ROOT = str(tmpdir)
+    email = EmailFactory()
+    att = EmailAttachmentFactory(email=email, file=get_dummy_file("a.png"))
+    size = att.size_bytes
+    # Attachment saved before sizes were stored.
+    EmailAttachment.objects.filter(pk=att.pk).update(size_bytes=None)
+    Email.objects.filter(pk=email.pk).update(attachments_payload_bytes=0)
+
+    call_command("backfill_file_sizes", batch_size=1)
+
+    att.refresh_from_db()
+    assert att.size_bytes == size
+    email.refresh_from_db()
+    assert email.attachments_payload_bytes == base64_size(size)
+
+
+@pytest.mark.django_db
+def test_email_save_keeps_attachments_payload_bytes(django_assert_num_queries):
+    email = EmailFactory()
+    Email.objects.filter(pk=email.pk).update(attachments_payload_bytes=100)
+
+    # Deferred fields aren't loaded or written by the save.
+    email = Email.objects.defer("received_data").get(pk=email.pk)
+    Email.objects.filter(pk=email.pk).update(attachments_payload_bytes=200)
+    email.subject = "Updated"
+    with django_assert_num_queries(1):
+        email.save()
+
+    email.refresh_from_db()
+    assert email.subject == "Updated"
+    assert email.attachments_payload_bytes == 200
+
+
+@pytest.mark.django_db
+def test_email_save_after_delete():
+    email = EmailFactory()
+    Email.objects.filter(pk=email.pk).delete()
+
+    # Like any other model, saving a deleted email inserts it again.
+    email.save()
+    assert Email.objects.filter(pk=email.pk).exists()
@@ -31,6 +31,29 @@ def render_email_template(html: str) -> str:
     return render_to_string("case/email_preview.html", context)
 
 
+# Bump this whenever the sanitizer settings or parse_email_html change, so
+# that the stored display HTML is rebuilt.
+SANITIZER_VERSION = 1
+
+
+def get_display_html(email: Email) -> str:
+    """
+    Returns the email's sanitized HTML, using the stored copy if it is current.
+    """
+    if email.display_html_version == SANITIZER_VERSION:
+        return email.display_html
+
+    return parse_email_html(email)
+
+
+def set_display_html(email: Email):
+    """
+    Stores the email's sanitized HTML on the email, without saving it.
+    """
+    email.display_html = parse_email_html(email)
+    email.display_html_version = SANITIZER_VERSION
+
+
 def parse_email_html(email: Email) -> str:
     if email.html:
         return sanitizer.sanitize(email.html)
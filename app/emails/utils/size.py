@@ -11,17 +11,15 @@ def base64_size(num_bytes: int) -> int:
     return math.ceil(num_bytes / 3) * 4
 
 
-def get_email_payload_size(text: str, html: str, attachments) -> int:
+def get_email_payload_size(text: str, html: str, attachments_payload_bytes: int) -> int:
     """
     Approximate the SendGrid payload size of an email: the body plus all
-    attachments after base64 encoding.
+    attachments after base64 encoding, which is tracked by
+    Email.attachments_payload_bytes so that storage doesn't need to be asked
+    for the size of each file.
     """
     size = len((text or "").encode("utf-8")) + len((html or "").encode("utf-8"))
-    for att in attachments:
-        # `file.size` reads object metadata from storage (e.g. an S3 HEAD
-        # request) without downloading the file.
-        size += base64_size(att.file.size)
-    return size
+    return size + attachments_payload_bytes
 
 
 def format_size(num_bytes: int) -> str:
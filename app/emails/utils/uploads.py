@@ -0,0 +1,125 @@
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import UploadedFile
+from django.core.files.uploadhandler import FileUploadHandler
+from core.models import Blob
+from emails.models import EmailAttachment
+from utils.uploads import FILE_FIELD_MAX_LENGTH_S3, get_content_key, slugify_filename
+
+
+@dataclass
+class StagedUpload:
+    """
+    An inbound email attachment which has been written to storage but doesn't
+    have an EmailAttachment yet.
+    """
+
+    # Storage key of the file.
+    name: str
+    content_type: str
+    size: int
+    # SHA-256 hash of the file, used to detect duplicate emails.
+    sha256: str
+
+    def to_json(self) -> dict:
+        return {
+            "name": self.name,
+            "content_type": self.content_type,
+            "size": self.size,
+            "sha256": self.sha256,
+        }
+
+
+class StagedUploadHandler(FileUploadHandler):
+    """
+    Upload handler which streams each uploaded file to storage in chunks as
+    the request body is read, instead of buffering the whole file in memory or
+    a temporary file, and hashes it along the way. Files are returned as
+    StagedUploads.
+    """
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.key = get_staged_key(self.file_name)
+        self.hasher = hashlib.sha256()
+        self.file = open_for_write(self.key)
+
+    def receive_data_chunk(self, raw_data, start):
+        self.hasher.update(raw_data)
+        self.file.write(raw_data)
+
+    def file_complete(self, file_size):
+        self.file.close()
+        return StagedUpload(
+            name=self.key,
+            content_type=self.content_type or "",
+            size=file_size,
+            sha256=self.hasher.hexdigest(),
+        )
+
+    def upload_interrupted(self):
+        if hasattr(self, "file"):
+            self.file.close()
+            default_storage.delete(self.key)
+
+
+def stage_upload(file: StagedUpload | UploadedFile) -> StagedUpload:
+    """
+    Writes a file which was not streamed by the StagedUploadHandler to storage.
+    """
+    if isinstance(file, StagedUpload):
+        return file
+
+    key = get_staged_key(file.name)
+    hasher = hashlib.sha256()
+    with open_for_write(key) as f:
+        for chunk in file.chunks():
+            hasher.update(chunk)
+            f.write(chunk)
+
+    return StagedUpload(
+        name=key,
+        content_type=file.content_type or "",
+        size=file.size,
+        sha256=hasher.hexdigest(),
+    )
+
+
+def store_staged_upload(staged: dict) -> str:
+    """
+    Stores a staged upload as a blob under its content addressed key, so that
+    attachments with the same content share one file. Returns the key.
+    """
+    if not staged.get("sha256"):
+        # Staged before uploads were stored as blobs, keep it where it is.
+        Blob.add_ref(staged["name"])
+        return staged["name"]
+
+    key = get_content_key(
+        EmailAttachment.UPLOAD_KEY,
+        staged["sha256"],
+        os.path.basename(staged["name"]),
+    )
+    # Opening the staged file is lazy, it is only read if the blob is new.
+    with default_storage.open(staged["name"], "rb") as f:
+        return Blob.store(key, f, max_length=FILE_FIELD_MAX_LENGTH_S3)
+
+
+def get_staged_key(filename: str) -> str:
+    # The file's hash isn't known until it has been written, so use a random
+    # directory to keep keys unique and hard to guess.
+    filename = slugify_filename(os.path.basename(filename or "attachment"))
+    return f"{EmailAttachment.UPLOAD_KEY}/{uuid.uuid4().hex}/{filename}"
+
+
+def open_for_write(name: str):
+    try:
+        os.makedirs(os.path.dirname(default_storage.path(name)), exist_ok=True)
+    except NotImplementedError:
+        pass  # Remote storage (eg. S3) doesn't have directories.
+
+    return default_storage.open(name, "wb")
@@ -1,8 +1,6 @@
-from django.conf import settings
-
 from .folder import FolderEndpoint
 from .group import GroupEndpoint
-from .helpers import create_client
+from .helpers import get_client
 from .user import UserEndpoint
 
 
@@ -14,13 +12,10 @@ class MSGraphAPI:
     def __init__(self):
         """
         Create a new MSGraphAPI instance.
-        This will create a new client using the credentials from the settings.
+        This will use this process's client, made from the credentials in the
+        settings, so that all instances share its access token.
         """
-        client = create_client(
-            settings.AZURE_AD_CLIENT_ID,
-            settings.MS_AUTHORITY_URL,
-            settings.AZURE_AD_CLIENT_SECRET,
-        )
+        client = get_client()
         self.group = GroupEndpoint(client)
         self.user = UserEndpoint(client)
         self.folder = FolderEndpoint(client)
@@ -1,10 +1,20 @@
 import logging
+import time
 
 import requests
 from microsoft.endpoints.helpers import BASE_URL, HTTP_HEADERS, get_token
+from microsoft.endpoints.session import (
+    MAX_RETRIES,
+    get_retry_delay,
+    get_session,
+    is_retryable,
+)
 
 logger = logging.getLogger(__name__)
 
+# Max number of sub-requests Graph accepts in one $batch request.
+BATCH_SIZE = 20
+
 
 class MSGraphTokenError(Exception):
     """Exception raised when no token is available for MS Graph API."""
@@ -12,6 +22,20 @@ class MSGraphTokenError(Exception):
     pass
 
 
+class MSGraphBatchError(requests.HTTPError):
+    """
+    Exception raised when sub-requests of a $batch request fail.
+    The other sub-requests were still sent, their responses are in results.
+    """
+
+    def __init__(self, errors: dict[int, str], results: list):
+        self.errors = errors
+        self.results = results
+        super().__init__(
+            f"{len(errors)} batched requests failed:\n" + "\n".join(errors.values())
+        )
+
+
 class BaseEndpoint:
     """Base class for MS Graph endpoints."""
 
@@ -27,23 +51,33 @@ class BaseEndpoint:
         token = self.token
         if not token:
             raise MSGraphTokenError("No token available for MS Graph API")
-        HTTP_HEADERS["Authorization"] = "Bearer " + token
-        return HTTP_HEADERS
+        return {**HTTP_HEADERS, "Authorization": "Bearer " + token}
+
+    def request(self, method, url, **kwargs):
+        """
+        Sends a request using this process's pooled Graph session.
+        """
+        return get_session().request(
+            method, url, endpoint=type(self).__name__, **kwargs
+        )
 
     def get(self, path):
-        resp = requests.get(BASE_URL + path, headers=self.headers, stream=False)
+        resp = self.request("GET", BASE_URL + path, headers=self.headers, stream=False)
         return self.handle(resp)
 
     def get_list(self, path) -> list:
         """Get request but follows pagination and always returns a list"""
-        resp = requests.get(BASE_URL + path, headers=self.headers, stream=False)
-        json = self.handle(resp)
+        resp = self.request("GET", BASE_URL + path, headers=self.headers, stream=False)
+        return self.get_pages(self.handle(resp))
+
+    def get_pages(self, json) -> list:
+        """Returns the values in a list response, fetching any later pages"""
         resp_list = []
         if json:
             resp_list += json["value"]
             next_url = json.get("@odata.nextLink", "")
             while next_url:
-                resp = requests.get(next_url, headers=self.headers, stream=False)
+                resp = self.request("GET", next_url, headers=self.headers, stream=False)
                 next_json = self.handle(resp)
                 resp_list += next_json["value"]
                 next_url = next_json.get("@odata.nextLink", "")
@@ -51,21 +85,88 @@ class BaseEndpoint:
         return resp_list
 
     def post(self, path, data):
-        resp = requests.post(
-            BASE_URL + path, headers=self.headers, json=data, stream=False
+        resp = self.request(
+            "POST", BASE_URL + path, headers=self.headers, json=data, stream=False
         )
         return self.handle(resp)
 
     def patch(self, path, data):
-        resp = requests.patch(
-            BASE_URL + path, headers=self.headers, json=data, stream=False
+        resp = self.request(
+            "PATCH", BASE_URL + path, headers=self.headers, json=data, stream=False
         )
         return self.handle(resp)
 
     def delete(self, path):
-        resp = requests.delete(BASE_URL + path, headers=self.headers, stream=False)
+        resp = self.request(
+            "DELETE", BASE_URL + path, headers=self.headers, stream=False
+        )
         return self.handle(resp)
 
+    def batch(self, sub_requests: list[dict]) -> list:
+        """
+        Sends many requests to Graph in as few round-trips as possible, by
+        grouping them into $batch requests of up to BATCH_SIZE each.
+        Each sub-request is a dict with a "method", a "url" relative to BASE_URL
+        and optionally a JSON "body".
+        Returns the JSON response for each sub-request in the same order, or None
+        if it wasn't found. If any other sub-request fails, the rest are still
+        sent, then MSGraphBatchError is raised with every failure.
+        https://learn.microsoft.com/en-us/graph/json-batching
+        """
+        results = [None] * len(sub_requests)
+        errors = {}
+        pending = list(range(len(sub_requests)))
+        attempt = 0
+        while pending:
+            throttled, delay = [], 0.0
+            for start in range(0, len(pending), BATCH_SIZE):
+                batch_ids = pending[start : start + BATCH_SIZE]
+                data = {
+                    "requests": [
+                        get_batch_request(str(i), sub_requests[i]) for i in batch_ids
+                    ]
+                }
+                for sub_resp in self.post("$batch", data)["responses"]:
+                    i = int(sub_resp["id"])
+                    status = sub_resp["status"]
+                    method = sub_requests[i]["method"]
+                    if is_retryable(method, status) and attempt < MAX_RETRIES:
+                        throttled.append(i)
+                        headers = sub_resp.get("headers") or {}
+                        delay = max(delay, get_retry_delay(headers, attempt))
+                    elif status == 404:
+                        results[i] = None
+                    elif status >= 400:
+                        error = (sub_resp.get("body") or {}).get("error", {})
+                        errors[i] = (
+                            f"{status} response to batched "
+                            f"{sub_requests[i]['method']} {sub_requests[i]['url']}: "
+                            f"{error.get('message', '')}"
+                        )
+                    else:
+                        results[i] = sub_resp.get("body")
+
+            if throttled:
+                logger.warning(
+                    "MS Graph throttled %s batched requests, retrying in %.1fs",
+                    len(throttled),
+                    delay,
+                )
+                time.sleep(delay)
+
+            pending = sorted(throttled)
+            attempt += 1
+
+        if errors:
+            raise MSGraphBatchError(dict(sorted(errors.items())), results)
+
+        return results
+
+    def batch_get_list(self, paths: list[str]) -> list[list]:
+        """Batched get_list, returns a list of values for each path"""
+        results = self.batch([{"method": "GET", "url": path} for path in paths])
+        return [self.get_pages(json) for json in results]
+
     def handle(self, resp):
         # Collect response body as JSON.
         json = resp.json() if resp.content else None
@@ -79,3 +180,19 @@ class BaseEndpoint:
             raise
 
         return json
+
+
+def get_batch_request(request_id: str, sub_request: dict) -> dict:
+    """
+    Builds a sub-request for a $batch request body.
+    """
+    batch_request = {
+        "id": request_id,
+        "method": sub_request["method"],
+        "url": "/" + sub_request["url"].lstrip("/"),
+    }
+    if "body" in sub_request:
+        batch_request["body"] = sub_request["body"]
+        batch_request["headers"] = {"Content-Type": "application/json"}
+
+    return batch_request
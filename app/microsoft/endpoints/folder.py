@@ -20,6 +20,18 @@ logger = logging.getLogger(__name__)
 
 FILE_UPLOAD_SIZE_LIMIT = 4194304  # bytes
 
+# Colons aren't allowed in Sharepoint names, so paths with this prefix can't
+# clash with real ones.
+ITEM_ID_PREFIX = "id:"
+
+
+def item_path(item_id: str) -> str:
+    """
+    Path which addresses a drive item by its ID rather than its location, for
+    the FolderEndpoint methods which take a path.
+    """
+    return ITEM_ID_PREFIX + item_id
+
 
 class FolderEndpoint(BaseEndpoint):
     """
@@ -28,22 +40,75 @@ class FolderEndpoint(BaseEndpoint):
     """
 
     MIDDLE_URL = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/root:/"
+    ITEMS_URL = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/"
+
+    def get_url(self, path: str, action: str = "") -> str:
+        """
+        URL of a drive item, or of an action on it, given its path from the
+        root folder or an item_path.
+        """
+        if path.startswith(ITEM_ID_PREFIX):
+            url = self.ITEMS_URL + path.removeprefix(ITEM_ID_PREFIX)
+            return f"{url}/{action}" if action else url
+
+        url = os.path.join(self.MIDDLE_URL, path)
+        return f"{url}:/{action}" if action else url
 
     def get(self, path):
         """
         Get the Folder inside the Group Drive (filesystem).
         Returns driveItem object or None.
         """
-        url = os.path.join(self.MIDDLE_URL, path)
+        url = self.get_url(path)
         return super().get(url)
 
+    def batch_get(self, paths: list[str]) -> list:
+        """
+        Get many Folders in as few requests as possible.
+        Returns a driveItem object or None for each path.
+        """
+        return super().batch(
+            [{"method": "GET", "url": self.get_url(path)} for path in paths]
+        )
+
     def get_children(self, path):
         """
         Get child items (folders, files) inside current folder
         """
-        url = os.path.join(self.MIDDLE_URL, f"{path}:/children")
+        url = self.get_url(path, "children")
         return super().get_list(url)
 
+    def batch_get_children(self, paths: list[str]) -> list[list]:
+        """
+        Get the child items of many folders in as few requests as possible.
+        Returns a list of child items for each path, empty if it does not exist.
+        """
+        urls = [self.get_url(path, "children") for path in paths]
+        return super().batch_get_list(urls)
+
+    def get_delta(self, delta_link: str | None = None) -> tuple[list, str]:
+        """
+        Get the items in the drive which have changed since the delta link was
+        returned, and a new delta link for the next call.
+        Without a delta link, no items are returned, only a link to changes
+        from now on.
+        Raises HTTPError with a 410 status if the delta link has expired.
+        https://learn.microsoft.com/en-us/graph/api/driveitem-delta
+        """
+        url = delta_link or os.path.join(
+            BASE_URL,
+            f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/root/delta?token=latest",
+        )
+        items = []
+        while True:
+            resp = self.request("GET", url, headers=self.headers, stream=False)
+            json = self.handle(resp)
+            items += json["value"]
+            if "@odata.deltaLink" in json:
+                return items, json["@odata.deltaLink"]
+
+            url = json["@odata.nextLink"]
+
     def get_all_files(self, path):
         """
         Recursively get all files inside current folder.
@@ -57,9 +122,7 @@ class FolderEndpoint(BaseEndpoint):
                 has_children = item.get("folder", {}).get("childCount", 0) > 0
 
                 if has_children:
-                    folder_children = self.get_all_files(
-                        os.path.join(path, item["name"])
-                    )
+                    folder_children = self.get_all_files(item_path(item["id"]))
                     all_files += folder_children
 
         return all_files
@@ -121,12 +184,13 @@ class FolderEndpoint(BaseEndpoint):
         return data
 
     def get_child_if_exists(self, filename, parent_id):
-        # Check for existing file.
-        url = f"/groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{parent_id}/children"
-        children = super().get_list(url)
-        for f in children:
-            if filename == f["name"]:
-                return f
+        """
+        Get a child item of the parent by its name.
+        Returns driveItem object or None.
+        """
+        # Addressing the child by name avoids listing all of the parent's children.
+        url = self.ITEMS_URL + f"{parent_id}:/{quote(filename)}"
+        return super().get(url)
 
     def delete_file(self, file_id):
         url = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{file_id}"
@@ -146,7 +210,7 @@ class FolderEndpoint(BaseEndpoint):
             BASE_URL,
             f"groups/{settings.MS_GRAPH_GROUP_ID}/drive/items/{file_id}/content",
         )
-        resp = requests.get(url, headers=self.headers, stream=False)
+        resp = self.request("GET", url, headers=self.headers, stream=False)
         resp.raise_for_status()
 
         return file_name, mimetype, resp.content
@@ -171,36 +235,80 @@ class FolderEndpoint(BaseEndpoint):
         List the items users or groups that have permissions for a resource.
         Returns a list of permissions or None if the resource does not exist.
         """
-        url = os.path.join(self.MIDDLE_URL, f"{path}:/permissions")
+        url = self.get_url(path, "permissions")
         return super().get_list(url)
 
+    def batch_list_permissions(self, paths: list[str]) -> list[list]:
+        """
+        List the permissions for many resources in as few requests as possible.
+        Returns a list of permissions for each path, empty if it does not exist.
+        """
+        urls = [self.get_url(path, "permissions") for path in paths]
+        return super().batch_get_list(urls)
+
     def delete_permission(self, path, perm_id):
         """
         Delete specific permission for a Folder.
         Returns None if successful or Folder doesn't exist.
         Raises HTTPError if permission doesn't exist.
         """
-        url = os.path.join(self.MIDDLE_URL, f"{path}:/permissions/{perm_id}")
+        url = self.get_url(path, f"permissions/{perm_id}")
 
         return super().delete(url)
 
+    def batch_delete_permissions(self, permissions: list[tuple[str, str]]):
+        """
+        Delete many (path, permission id) pairs in as few requests as possible.
+        Raises HTTPError if any permission fails to be deleted.
+        """
+        super().batch(
+            [
+                {
+                    "method": "DELETE",
+                    "url": self.get_url(path, f"permissions/{perm_id}"),
+                }
+                for path, perm_id in permissions
+            ]
+        )
+
     def create_permissions(self, path, role, emails):
         """
         Create permissions (read or write) for a Folder.
         Returns permissions created or None if Folder doesn't exist.
         """
+        data = self._get_invite_data(role, emails)
+        url = self.get_url(path, "invite")
+
+        return super().post(url, data)
+
+    def batch_create_permissions(self, paths: list[str], role, emails) -> list:
+        """
+        Create the same permissions (read or write) for many Folders in as few
+        requests as possible.
+        Returns permissions created or None for each path.
+        """
+        data = self._get_invite_data(role, emails)
+        return super().batch(
+            [
+                {
+                    "method": "POST",
+                    "url": self.get_url(path, "invite"),
+                    "body": data,
+                }
+                for path in paths
+            ]
+        )
+
+    def _get_invite_data(self, role, emails):
         assert role in ["read", "write"]
 
-        data = {
+        return {
             # Do not remove fields or POST request might fail.
             "requireSignIn": True,
             "sendInvitation": False,
             "roles": [role],
             "recipients": [{"email": email} for email in emails],
         }
-        url = os.path.join(self.MIDDLE_URL, f"{path}:/invite")
-
-        return super().post(url, data)
 
     def _upload_small_file(
         self,
@@ -221,7 +329,9 @@ class FolderEndpoint(BaseEndpoint):
         content_type = getattr(file, "content_type", "")
         if content_type:
             headers["Content-Type"] = content_type
-        resp = requests.put(url, params=params, data=file, headers=headers, stream=True)
+        resp = self.request(
+            "PUT", url, params=params, data=file, headers=headers, stream=True
+        )
         return self.handle(resp)
 
     def _upload_large_file(
@@ -241,8 +351,8 @@ class FolderEndpoint(BaseEndpoint):
         }
 
         data = {"name": filename}
-        resp = requests.post(
-            url, params=params, json=data, headers=self.headers, stream=False
+        resp = self.request(
+            "POST", url, params=params, json=data, headers=self.headers, stream=False
         )
 
         session_data = self.handle(resp)
@@ -256,7 +366,8 @@ class FolderEndpoint(BaseEndpoint):
             chunk = file.read(CHUNK_SIZE)
             bytes_read = len(chunk)
             upload_range = f"bytes {start}-{start + bytes_read - 1}/{file.size}"
-            resp = requests.put(
+            resp = self.request(
+                "PUT",
                 upload_url,
                 headers={
                     "Content-Length": str(bytes_read),
@@ -1,8 +1,14 @@
 import logging
+import os
 import secrets
 import string
+import threading
+import time
 
 import msal
+from django.conf import settings
+from django.db import transaction
+from microsoft.models import TokenCache
 
 logger = logging.getLogger(__name__)
 
@@ -14,36 +20,112 @@ HTTP_HEADERS = {
     "Content-Type": "application/json",
 }
 
+# Token is for app rather than user, so we request all of the app's permissions.
+SCOPES = ["https://graph.microsoft.com/.default"]
 
-def create_client(client_id, authority_url, client_secret):
+# Seconds before a token expires that we get a new one, so that requests don't
+# have to wait for Azure AD. MSAL itself only refreshes in the last 5 minutes.
+TOKEN_REFRESH_SECONDS = 10 * 60
+
+_client = None
+_client_pid = None
+_client_lock = threading.Lock()
+# Access token and its expiry time for each client_id, shared by this process.
+_tokens: dict[str, tuple[str, float]] = {}
+_tokens_lock = threading.Lock()
+
+
+def create_client(client_id, authority_url, client_secret, token_cache=None):
     """Authenticate our app with Azure Active Directory."""
     client = msal.ConfidentialClientApplication(
-        client_id=client_id, authority=authority_url, client_credential=client_secret
+        client_id=client_id,
+        authority=authority_url,
+        client_credential=client_secret,
+        token_cache=token_cache,
     )
     return client
 
 
+def get_client():
+    """
+    Returns this process's client, so that all endpoints share its token.
+    A new one is made after a fork, so that worker processes don't share
+    connections.
+    """
+    global _client, _client_pid
+    with _client_lock:
+        if _client is None or _client_pid != os.getpid():
+            _client_pid = os.getpid()
+            _client = create_client(
+                settings.AZURE_AD_CLIENT_ID,
+                settings.MS_AUTHORITY_URL,
+                settings.AZURE_AD_CLIENT_SECRET,
+                token_cache=msal.SerializableTokenCache(),
+            )
+
+        return _client
+
+
 def get_token(client) -> str | None:
-    """Get access token after authenticating our app."""
-    # Begin by looking in token cache, first arg is for scopes,
-    # because token is for app rather than user, second arg is None.
-    result = client.acquire_token_silent(
-        ["https://graph.microsoft.com/.default"], account=None
-    )
+    """
+    Get access token after authenticating our app.
+    The token is kept in memory until it is close to expiring, then renewed from
+    the token cache shared by all processes, or from Azure AD if that is stale.
+    """
+    with _tokens_lock:
+        token, expires_at = _tokens.get(client.client_id, (None, 0.0))
+        if expires_at - time.time() > TOKEN_REFRESH_SECONDS:
+            return token
 
-    if not result:
-        logger.debug("No suitable token exists in cache. Get new one from Azure AD")
-        result = client.acquire_token_for_client(
-            scopes=["https://graph.microsoft.com/.default"]
-        )
+        result = _acquire_token(client)
 
-    # If we can't get access token, see what went wrong, otherwise return it.
-    if "access_token" not in result:
-        logger.exception(f"{result['error_description']} - {result['correlation_id']}")
-    else:
+        # If we can't get access token, see what went wrong, otherwise return it.
+        if "access_token" not in result:
+            logger.exception(
+                f"{result['error_description']} - {result['correlation_id']}"
+            )
+            return None
+
+        expires_at = time.time() + int(result["expires_in"])
+        _tokens[client.client_id] = (result["access_token"], expires_at)
         return result["access_token"]
 
 
+def _acquire_token(client) -> dict:
+    token_cache = client.token_cache
+    if not isinstance(token_cache, msal.SerializableTokenCache):
+        return client.acquire_token_for_client(scopes=SCOPES)
+
+    # Lock the shared cache so that only one process asks Azure AD for a token.
+    with transaction.atomic():
+        row, _ = TokenCache.objects.select_for_update().get_or_create(
+            client_id=client.client_id
+        )
+        if row.data:
+            token_cache.deserialize(row.data)
+
+        # Looks in the token cache first, and only asks Azure AD on a miss.
+        result = client.acquire_token_for_client(scopes=SCOPES)
+        if int(result.get("expires_in", 0)) <= TOKEN_REFRESH_SECONDS:
+            logger.debug("Token is close to expiring. Get new one from Azure AD")
+            _remove_access_tokens(token_cache)
+            result = client.acquire_token_for_client(scopes=SCOPES)
+
+        if token_cache.has_state_changed:
+            row.data = token_cache.serialize()
+            row.save()
+
+    return result
+
+
+def _remove_access_tokens(token_cache):
+    access_tokens = list(
+        token_cache.search(msal.TokenCache.CredentialType.ACCESS_TOKEN)
+    )
+    for access_token in access_tokens:
+        token_cache.remove_at(access_token)
+
+
 def generate_password():
     """
     Generate password of length 16 that meets complexity requirements.
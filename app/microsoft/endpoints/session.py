@@ -0,0 +1,169 @@
+"""
+Pooled HTTP session shared by all MS Graph endpoints in a process.
+"""
+
+import logging
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# Max number of connections kept open to Graph.
+MAX_CONNECTIONS = 10
+# Max number of requests sent to Graph at once, across all threads.
+MAX_CONCURRENT_REQUESTS = 8
+# Graph sends these when it is throttling us or is briefly unavailable.
+RETRY_STATUS_CODES = {429, 503, 504}
+# Methods which are safe to send again after a 503 or 504, where Graph may
+# have applied the request before failing. A 429 means it wasn't applied.
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "DELETE"}
+MAX_RETRIES = 5
+# Seconds to wait before the first retry when Graph doesn't send Retry-After,
+# doubled for each retry after that.
+BACKOFF_BASE = 1
+MAX_BACKOFF = 60
+# Seconds to wait for Graph to connect or send data.
+REQUEST_TIMEOUT = 60
+
+
+@dataclass
+class EndpointStats:
+    # Number of requests sent, including retries.
+    requests: int = 0
+    # Number of responses telling us to back off.
+    throttled: int = 0
+    # Number of requests which failed without a response.
+    errors: int = 0
+    # Total time spent waiting for responses, in seconds.
+    duration: float = 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.duration * 1000 / self.requests if self.requests else 0.0
+
+
+class GraphSession:
+    """
+    Sends requests to Graph over a pool of keep-alive connections, limiting how
+    many are in flight and retrying throttled requests after Graph's
+    Retry-After delay (or an exponential backoff when it doesn't send one).
+    """
+
+    def __init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=MAX_CONNECTIONS)
+        self.session.mount("https://", adapter)
+        self.semaphore = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+        self.stats: dict[str, EndpointStats] = defaultdict(EndpointStats)
+        self.stats_lock = threading.Lock()
+
+    def request(self, method: str, url: str, endpoint: str = "", **kwargs):
+        """
+        Sends a request, counting it under the name of the endpoint which sent
+        it. Takes the same kwargs as requests.request.
+        """
+        kwargs.setdefault("timeout", REQUEST_TIMEOUT)
+        # A file body can be sent again after rewinding it, a stream can't.
+        data = kwargs.get("data")
+        position = data.tell() if hasattr(data, "seek") else None
+        can_resend = data is None or position is not None or type(data) is bytes
+
+        attempt = 0
+        while True:
+            with self.semaphore:
+                start = time.monotonic()
+                try:
+                    resp = self.session.request(method, url, **kwargs)
+                except requests.RequestException:
+                    self.record(endpoint, start, errors=1)
+                    raise
+
+            is_throttled = resp.status_code in RETRY_STATUS_CODES
+            self.record(endpoint, start, throttled=int(is_throttled))
+            if (
+                not is_retryable(method, resp.status_code)
+                or not can_resend
+                or attempt >= MAX_RETRIES
+            ):
+                return resp
+
+            delay = get_retry_delay(resp.headers, attempt)
+            logger.warning(
+                "MS Graph returned %s for %s %s, retrying in %.1fs",
+                resp.status_code,
+                method,
+                url,
+                delay,
+            )
+            # Release the connection, the response body isn't needed.
+            resp.close()
+            time.sleep(delay)
+            if position is not None:
+                data.seek(position)
+
+            attempt += 1
+
+    def record(self, endpoint: str, start: float, throttled=0, errors=0):
+        with self.stats_lock:
+            stats = self.stats[endpoint]
+            stats.requests += 1
+            stats.throttled += throttled
+            stats.errors += errors
+            stats.duration += time.monotonic() - start
+
+    def get_stats(self) -> dict[str, EndpointStats]:
+        """
+        Returns a copy of the request counters for each endpoint.
+        """
+        with self.stats_lock:
+            return {
+                name: EndpointStats(**vars(stats)) for name, stats in self.stats.items()
+            }
+
+
+def is_retryable(method: str, status_code: int) -> bool:
+    """
+    Whether a request should be sent again after this response status.
+    """
+    if status_code == 429:
+        return True
+    return status_code in RETRY_STATUS_CODES and method.upper() in IDEMPOTENT_METHODS
+
+
+def get_retry_delay(headers, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a throttled request, given its response
+    headers.
+    """
+    retry_after = headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return min(float(retry_after), MAX_BACKOFF)
+
+    # Add jitter so that throttled workers don't all retry at the same time.
+    return min(BACKOFF_BASE * 2**attempt, MAX_BACKOFF) * random.uniform(0.5, 1)
+
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> GraphSession:
+    """
+    Returns this process's GraphSession. A new one is made after a fork, so
+    that worker processes don't share connections.
+    """
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            _session = GraphSession()
+            _session_pid = os.getpid()
+
+        return _session
@@ -0,0 +1,76 @@
+from core.models import Issue
+from django.core.management.base import BaseCommand
+from microsoft.endpoints import MSGraphAPI
+from microsoft.service import (
+    CLIENT_UPLOAD_FOLDER_NAME,
+    EMAIL_ATTACHMENT_FOLDER_NAME,
+)
+
+FOLDER_ID_FIELDS = [
+    "sharepoint_folder_id",
+    "sharepoint_upload_folder_id",
+    "sharepoint_attachment_folder_id",
+]
+
+
+class Command(BaseCommand):
+    """
+    ./manage.py backfill_sharepoint_folder_ids
+    """
+
+    help = "Store the Sharepoint folder IDs of cases which were set up without them"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **kwargs):
+        batch_size = kwargs["batch_size"]
+        api = MSGraphAPI()
+        # Only cases without a folder ID are selected, so the command can be
+        # stopped and re-run to pick up where it left off.
+        qs = Issue.objects.filter(is_sharepoint_set_up=True, sharepoint_folder_id="")
+        qs = qs.only("pk", *FOLDER_ID_FIELDS).order_by("pk")
+        total = qs.count()
+        self.stdout.write(f"Storing Sharepoint folder IDs for {total} cases")
+
+        count, missing, last_pk = 0, 0, None
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            issues = list(batch_qs[:batch_size])
+            if not issues:
+                break
+
+            # Look up each case folder and its subfolders by path, in batches.
+            paths = []
+            for issue in issues:
+                case_path = f"cases/{issue.pk}"
+                paths += [
+                    case_path,
+                    f"{case_path}/{CLIENT_UPLOAD_FOLDER_NAME}",
+                    f"{case_path}/{EMAIL_ATTACHMENT_FOLDER_NAME}",
+                ]
+
+            folders = api.folder.batch_get(paths)
+            found = []
+            for issue, case_folder, upload_folder, attachment_folder in zip(
+                issues, folders[0::3], folders[1::3], folders[2::3]
+            ):
+                if not case_folder:
+                    missing += 1
+                    continue
+
+                issue.sharepoint_folder_id = case_folder["id"]
+                if upload_folder:
+                    issue.sharepoint_upload_folder_id = upload_folder["id"]
+                if attachment_folder:
+                    issue.sharepoint_attachment_folder_id = attachment_folder["id"]
+                found.append(issue)
+
+            Issue.objects.bulk_update(found, FOLDER_ID_FIELDS)
+            count += len(issues)
+            last_pk = issues[-1].pk
+            self.stdout.write(f"\t{count}/{total}", ending="\r")
+
+        self.stdout.write(
+            f"\nStored folder IDs for {count - missing} cases, {missing} missing"
+        )
@@ -2,6 +2,7 @@ import logging
 
 from accounts.models import CaseGroups, User
 from django.core.management.base import BaseCommand
+from microsoft.endpoints.session import get_session
 from microsoft.tasks import reset_ms_access
 
 logger = logging.getLogger(__name__)
@@ -19,3 +20,9 @@ class Command(BaseCommand):
             User.objects.filter(groups__name__in=CaseGroups.values).distinct().all()
         ):
             reset_ms_access(user)
+
+        for name, stats in get_session().get_stats().items():
+            self.stdout.write(
+                f"{name}: {stats.requests} requests, {stats.throttled} throttled, "
+                f"{stats.errors} errors, {stats.average_ms:.0f}ms average"
+            )
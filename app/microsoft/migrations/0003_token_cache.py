@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 20:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("microsoft", "0002_rename_health_check_document_template_folder"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TokenCache",
+            fields=[
+                (
+                    "client_id",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.TextField(blank=True, default="")),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0108_issue_sharepoint_folder_ids"),
+        ("microsoft", "0003_token_cache"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CaseFolderListing",
+            fields=[
+                (
+                    "issue",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sharepoint_listing",
+                        serialize=False,
+                        to="core.issue",
+                    ),
+                ),
+                ("folder_url", models.TextField(blank=True, default="")),
+                ("documents", models.JSONField(default=list)),
+                ("synced_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name="DriveDelta",
+            fields=[
+                (
+                    "drive_id",
+                    models.CharField(max_length=128, primary_key=True, serialize=False),
+                ),
+                ("delta_link", models.TextField()),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
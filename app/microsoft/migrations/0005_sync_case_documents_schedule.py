@@ -0,0 +1,34 @@
+# Generated by Django 5.1.1 on 2026-10-18 21:05
+
+from django.db import migrations
+
+SCHEDULE_NAME = "Sync case documents"
+
+
+def _create_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.get_or_create(
+        name=SCHEDULE_NAME,
+        defaults={
+            "func": "microsoft.tasks.sync_case_documents_task",
+            "schedule_type": "I",  # Minutes
+            "minutes": 5,
+            "repeats": -1,
+        },
+    )
+
+
+def _delete_schedule(apps, schema_editor):
+    Schedule = apps.get_model("django_q", "Schedule")
+    Schedule.objects.filter(name=SCHEDULE_NAME).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("django_q", "0018_task_success_index"),
+        ("microsoft", "0004_case_folder_listing"),
+    ]
+
+    operations = [
+        migrations.RunPython(_create_schedule, reverse_code=_delete_schedule),
+    ]
@@ -0,0 +1,50 @@
+from django.db import models
+
+
+class TokenCache(models.Model):
+    """
+    MSAL's serialized token cache for an Azure AD app, shared by all web and
+    worker processes so that they don't each fetch their own access tokens.
+    """
+
+    client_id = models.CharField(max_length=64, primary_key=True)
+    data = models.TextField(default="", blank=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.client_id
+
+
+class CaseFolderListing(models.Model):
+    """
+    The last known contents of a case's Sharepoint folder, so that they can be
+    shown without asking Graph. Kept up to date by sync_case_documents and
+    cleared when Clerk uploads to the folder.
+    """
+
+    issue = models.OneToOneField(
+        "core.Issue",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sharepoint_listing",
+    )
+    folder_url = models.TextField(blank=True, default="")
+    documents = models.JSONField(default=list)
+    # When the listing was fetched from Graph.
+    synced_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.issue_id} ({len(self.documents)} documents)"
+
+
+class DriveDelta(models.Model):
+    """
+    Graph's link to the changes in a Sharepoint drive since the last sync.
+    """
+
+    drive_id = models.CharField(max_length=128, primary_key=True)
+    delta_link = models.TextField()
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return self.drive_id
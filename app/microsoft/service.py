@@ -1,9 +1,11 @@
 from PIL.IptcImagePlugin import i
 import logging
 from dataclasses import dataclass
+from datetime import datetime
 from os.path import basename
 from typing import Literal, Tuple
 
+import requests
 from accounts.models import User
 from core.models import DocumentTemplate, FileUpload, Issue
 from django.conf import settings
@@ -12,12 +14,17 @@ from django.utils import timezone
 from emails.models import Email, EmailAttachment
 from microsoft import events
 from microsoft.endpoints import MSGraphAPI
+from microsoft.endpoints.folder import item_path
+from microsoft.models import CaseFolderListing, DriveDelta
 
 logger = logging.getLogger(__name__)
 
 
 CLIENT_UPLOAD_FOLDER_NAME = "client-uploads"
 EMAIL_ATTACHMENT_FOLDER_NAME = "email-attachments"
+# Cached case folder listings older than this are fetched again, in case
+# sync_case_documents has missed a change or isn't running.
+CASE_LISTING_MAX_AGE = timezone.timedelta(minutes=30)
 
 
 @dataclass
@@ -57,19 +64,22 @@ def get_user_permissions(user):
         .filter(Q(paralegal=user) | Q(lawyer=user))
         .all()
     )
-    for issue in queryset:
+    issues = list(queryset)
+    if user_perms.access_level == "PARTIAL_ACCESS":
+        # Fetch the permissions for all cases at once, rather than one at a time.
+        paths = [get_case_path(issue) for issue in issues]
+        issue_permissions = api.folder.batch_list_permissions(paths)
+    else:
+        issue_permissions = [[] for _ in issues]
+
+    for issue, permissions in zip(issues, issue_permissions):
         if user_perms.access_level == "FULL_ACCESS":
             has_access = True
-        elif user_perms.access_level == "NO_ACCESS":
-            has_access = False
         else:
-            has_access = False
-            for permission in api.folder.list_permissions(f"cases/{issue.id}"):
-                if granted_to_v2 := permission.get("grantedToV2"):
-                    email = granted_to_v2.get("user", {}).get("email")
-                    if email and email == user.email:
-                        has_access = True
-                        break
+            has_access = any(
+                get_permission_email(permission) == user.email
+                for permission in permissions
+            )
 
         if has_access:
             user_perms.issues_with_access.append(issue)
@@ -139,8 +149,37 @@ def set_up_new_case(issue: Issue):
         logger.info("Copying document templates to case folder for Issue<%s>", issue.pk)
         copy_document_templates_to_case_folder(issue, case_folder_id)
 
+    # Store the IDs of the case's folders so that they can be used directly.
+    upload_folder, _ = get_or_create_case_upload_folder(case_folder_id)
+    attachment_folder, _ = get_or_create_case_attachment_folder(case_folder_id)
+    set_case_folder_ids(
+        issue,
+        sharepoint_folder_id=case_folder_id,
+        sharepoint_upload_folder_id=upload_folder["id"],
+        sharepoint_attachment_folder_id=attachment_folder["id"],
+    )
+
     logger.info("Copying client uploads to case folder for Issue<%s>", issue.pk)
-    copy_client_uploads_to_case_folder(issue, case_folder_id)
+    copy_client_uploads_to_case_folder(issue, upload_folder["id"])
+    clear_case_listing(issue)
+
+
+def get_case_path(issue: Issue) -> str:
+    """
+    Path of the case folder for the FolderEndpoint methods, by its ID if known.
+    """
+    if issue.sharepoint_folder_id:
+        return item_path(issue.sharepoint_folder_id)
+    return f"cases/{issue.id}"
+
+
+def set_case_folder_ids(issue: Issue, **folder_ids: str):
+    """
+    Store the Sharepoint IDs of the case's folders.
+    """
+    for name, folder_id in folder_ids.items():
+        setattr(issue, name, folder_id)
+    Issue.objects.filter(pk=issue.pk).update(**folder_ids)
 
 
 def get_or_create_case_folder(issue: Issue) -> Tuple[dict, bool]:
@@ -174,12 +213,9 @@ def copy_document_templates_to_case_folder(issue: Issue, case_folder_id: str):
         )
 
 
-def copy_client_uploads_to_case_folder(issue: Issue, case_folder_id: str):
+def copy_client_uploads_to_case_folder(issue: Issue, upload_folder_id: str):
     file_uploads = FileUpload.objects.filter(issue=issue)
     if file_uploads.exists():
-        upload_folder, _ = get_or_create_case_upload_folder(case_folder_id)
-        upload_folder_id = upload_folder["id"]
-
         api = MSGraphAPI()
         for file_upload in file_uploads:
             name = basename(file_upload.file.name)
@@ -219,17 +255,28 @@ def save_email_attachment(email: Email, attachment: EmailAttachment):
     api = MSGraphAPI()
     issue = email.issue
 
-    case_folder_name = str(issue.pk)
-    case_folder = api.folder.get_child_if_exists(
-        case_folder_name, settings.CASES_FOLDER_ID
-    )
-
-    if not case_folder:
-        raise Exception(f"Case folder not found for Issue<{issue.pk}>")
-
-    case_folder_id = case_folder["id"]
-    attachment_folder, _ = get_or_create_case_attachment_folder(case_folder_id)
-    attachments_folder_id = attachment_folder["id"]
+    attachments_folder_id = issue.sharepoint_attachment_folder_id
+    if not attachments_folder_id:
+        # The case was set up before folder IDs were stored, so look them up.
+        case_folder_id = issue.sharepoint_folder_id
+        if not case_folder_id:
+            case_folder_name = str(issue.pk)
+            case_folder = api.folder.get_child_if_exists(
+                case_folder_name, settings.CASES_FOLDER_ID
+            )
+
+            if not case_folder:
+                raise Exception(f"Case folder not found for Issue<{issue.pk}>")
+
+            case_folder_id = case_folder["id"]
+
+        attachment_folder, _ = get_or_create_case_attachment_folder(case_folder_id)
+        attachments_folder_id = attachment_folder["id"]
+        set_case_folder_ids(
+            issue,
+            sharepoint_folder_id=case_folder_id,
+            sharepoint_attachment_folder_id=attachments_folder_id,
+        )
 
     name = basename(attachment.file.name)
     logger.info("Uploading email attachment %s for Issue<%s>", name, issue.pk)
@@ -238,6 +285,7 @@ def save_email_attachment(email: Email, attachment: EmailAttachment):
     api.folder.upload_file(
         attachment.file, attachments_folder_id, name=name, conflict_behaviour="rename"
     )
+    clear_case_listing(issue)
 
 
 def add_user_to_case(user, issue):
@@ -247,10 +295,23 @@ def add_user_to_case(user, issue):
     logger.info("Adding User<%s> to case folder for Issue<%s>", user.pk, issue.pk)
 
     api = MSGraphAPI()
-    case_path = f"cases/{issue.id}"
+    case_path = get_case_path(issue)
     api.folder.create_permissions(case_path, "write", [user.email])
 
 
+def add_user_to_cases(user, issues):
+    """
+    Give User write permissions for many cases (folders) at once.
+    """
+    case_paths = [get_case_path(issue) for issue in issues]
+    if not case_paths:
+        return
+
+    logger.info("Adding User<%s> to %s case folders", user.pk, len(case_paths))
+    api = MSGraphAPI()
+    api.folder.batch_create_permissions(case_paths, "write", [user.email])
+
+
 def remove_user_from_case(user, issue):
     """
     Delete the permissions that a User has for a specific case (folder).
@@ -258,15 +319,25 @@ def remove_user_from_case(user, issue):
     logger.info("Removing User<%s> from case folder for Issue<%s>", user.pk, issue.pk)
 
     api = MSGraphAPI()
-    case_path = f"cases/{issue.id}"
+    case_path = get_case_path(issue)
 
-    # Iterate through the permissions and delete those belonging to the User.
-    for permission in api.folder.list_permissions(case_path):
-        if granted_to_v2 := permission.get("grantedToV2"):
-            email = granted_to_v2.get("user", {}).get("email")
-            if email and email == user.email:
-                perm_id = permission.get("id")
-                api.folder.delete_permission(case_path, perm_id)
+    # Delete all the permissions belonging to the User.
+    user_permissions = [
+        (case_path, permission.get("id"))
+        for permission in api.folder.list_permissions(case_path)
+        if get_permission_email(permission) == user.email
+    ]
+    if user_permissions:
+        api.folder.batch_delete_permissions(user_permissions)
+
+
+def get_permission_email(permission: dict) -> str | None:
+    """
+    Return the email of the user a permission was granted to, if any.
+    """
+    if granted_to_v2 := permission.get("grantedToV2"):
+        return granted_to_v2.get("user", {}).get("email")
+    return None
 
 
 def get_case_folder_info(issue):
@@ -275,20 +346,11 @@ def get_case_folder_info(issue):
     """
     api = MSGraphAPI()
 
-    case_path = f"cases/{issue.id}"
+    case_path = get_case_path(issue)
 
     # Get the list of files (name, file URL) for the case folder.
     children = api.folder.get_children(case_path)
-    list_files = [
-        {
-            "name": item["name"],
-            "url": item["webUrl"],
-            "id": item["id"],
-            "size": item["size"],
-            "is_file": "file" in item,
-        }
-        for item in children
-    ]
+    list_files = [_get_document(item) for item in children]
 
     # Get the case folder URL.
     folder = api.folder.get(case_path)
@@ -296,6 +358,139 @@ def get_case_folder_info(issue):
     return list_files, folder_url
 
 
+def get_case_documents(issue: Issue) -> Tuple[list, str | None, datetime]:
+    """
+    Return a tuple containing the case folder's list of files, URL and when they
+    were fetched from Sharepoint, using the cached listing if there is one.
+    """
+    listing = CaseFolderListing.objects.filter(
+        issue=issue, synced_at__gte=timezone.now() - CASE_LISTING_MAX_AGE
+    ).first()
+    if listing:
+        return listing.documents, listing.folder_url, listing.synced_at
+
+    synced_at = timezone.now()
+    documents, folder_url = get_case_folder_info(issue)
+    # Only folders with a known ID can be kept up to date by sync_case_documents.
+    if folder_url and issue.sharepoint_folder_id:
+        _save_case_listings(
+            [
+                CaseFolderListing(
+                    issue=issue, folder_url=folder_url, documents=documents
+                )
+            ],
+            synced_at,
+        )
+
+    return documents, folder_url, synced_at
+
+
+def clear_case_listing(issue: Issue):
+    """
+    Remove the case's cached listing after Clerk has changed its folder, so that
+    the change is shown without waiting for sync_case_documents.
+    """
+    CaseFolderListing.objects.filter(issue=issue).delete()
+
+
+def sync_case_documents():
+    """
+    Refresh the cached listings of the case folders which have changed in
+    Sharepoint since the last sync.
+    """
+    api = MSGraphAPI()
+    drive_id = settings.MS_GRAPH_DRIVE_ID
+    delta = DriveDelta.objects.filter(drive_id=drive_id).first()
+    try:
+        items, delta_link = api.folder.get_delta(delta.delta_link if delta else None)
+    except requests.HTTPError as e:
+        if e.response is None or e.response.status_code != 410:
+            raise
+
+        logger.warning("Sharepoint delta link has expired, starting a new sync")
+        delta = None
+        items, delta_link = api.folder.get_delta()
+
+    if not delta:
+        # We can't tell what changed before now, so any listing could be stale.
+        count, _ = CaseFolderListing.objects.all().delete()
+        logger.info("Cleared %s case folder listings", count)
+
+    # A change to a file or folder in a case folder changes the case's listing,
+    # as does a change to the case folder itself.
+    changed_ids = set()
+    for item in items:
+        changed_ids.add(item["id"])
+        if parent_id := item.get("parentReference", {}).get("id"):
+            changed_ids.add(parent_id)
+
+    issues = list(
+        Issue.objects.filter(
+            sharepoint_listing__isnull=False, sharepoint_folder_id__in=changed_ids
+        )
+    )
+    logger.info(
+        "Found %s changed items in Sharepoint, refreshing %s case listings",
+        len(items),
+        len(issues),
+    )
+    refresh_case_listings(issues)
+    DriveDelta.objects.update_or_create(
+        drive_id=drive_id, defaults={"delta_link": delta_link}
+    )
+
+
+def refresh_case_listings(issues: list[Issue]):
+    """
+    Fetch and store the listings of many case folders at once.
+    """
+    if not issues:
+        return
+
+    api = MSGraphAPI()
+    synced_at = timezone.now()
+    paths = [get_case_path(issue) for issue in issues]
+    folders = api.folder.batch_get(paths)
+    children = api.folder.batch_get_children(paths)
+    listings, missing = [], []
+    for issue, folder, items in zip(issues, folders, children):
+        if not folder:
+            missing.append(issue.pk)
+            continue
+
+        documents = [_get_document(item) for item in items]
+        listings.append(
+            CaseFolderListing(
+                issue=issue, folder_url=folder["webUrl"], documents=documents
+            )
+        )
+
+    _save_case_listings(listings, synced_at)
+    CaseFolderListing.objects.filter(issue__in=missing).delete()
+
+
+def _save_case_listings(listings: list[CaseFolderListing], synced_at: datetime):
+    for listing in listings:
+        listing.synced_at = synced_at
+
+    CaseFolderListing.objects.bulk_create(
+        listings,
+        update_conflicts=True,
+        unique_fields=["issue"],
+        update_fields=["folder_url", "documents", "synced_at"],
+    )
+
+
+def _get_document(item: dict) -> dict:
+    return {
+        "name": item["name"],
+        "url": item["webUrl"],
+        "id": item["id"],
+        "size": item["size"],
+        "is_file": "file" in item,
+    }
+
+
 def add_group_member(user):
     """
     Add User as Group member.
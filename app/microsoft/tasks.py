@@ -3,6 +3,7 @@ import time
 
 from accounts import events
 from accounts.models import User
+from case.signals import dispatch_summary_update
 from core.models import Issue
 from django.db.models import Q
 from django.utils import timezone
@@ -12,6 +13,7 @@ from utils.sentry import sentry_task
 from .service import (
     set_up_new_case,
     set_up_new_user,
+    sync_case_documents,
 )
 
 logger = logging.getLogger(__name__)
@@ -42,17 +44,20 @@ def reset_ms_access(user):
 
     # NOTE: Not sure why 2022 used below. Maybe that was when Sharepoint was
     # introduced?
-    for issue in Issue.objects.filter(
-        Q(paralegal=user) | Q(lawyer=user),
-        is_sharepoint_set_up=True,
-        created_at__year__gte=2022,
-    ).all():
-        logger.info("Sending event for User<%s> added to Case<%s>", user.pk, issue.pk)
-        events.user_added_to_case.send(
-            sender=User,
-            user=user,
-            issue=issue,
+    issues = list(
+        Issue.objects.filter(
+            Q(paralegal=user) | Q(lawyer=user),
+            is_sharepoint_set_up=True,
+            created_at__year__gte=2022,
         )
+    )
+    # Grant access to all cases at once, rather than sending an event per case.
+    logger.info("Sending event for User<%s> added to %s Cases", user.pk, len(issues))
+    events.user_added_to_cases.send(
+        sender=User,
+        user=user,
+        issues=issues,
+    )
 
 
 @sentry_task
@@ -60,7 +65,10 @@ def set_up_new_case_task(issue_pk: str):
     logger.info("Setting up folder on Sharepoint for Issue<%s>", issue_pk)
     issue = Issue.objects.get(pk=issue_pk)
     set_up_new_case(issue)
-    Issue.objects.filter(pk=issue_pk).update(is_sharepoint_set_up=True)
+    issues = Issue.objects.filter(pk=issue_pk)
+    issues.update(is_sharepoint_set_up=True)
+    # The update skips post_save, and is_sharepoint_set_up is summarised.
+    dispatch_summary_update(issues)
     logger.info("Finished setting up folder on Sharepoint for Issue<%s>", issue_pk)
 
 
@@ -85,3 +93,8 @@ def assign_user_licence(user_pk: int):
         "Failed to assign Microsoft licence to User<%s> after multiple attempts",
         user.pk,
     )
+
+
+@sentry_task
+def sync_case_documents_task():
+    sync_case_documents()
@@ -1,8 +1,21 @@
+import io
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
-from microsoft.endpoints.base import BaseEndpoint, MSGraphTokenError
+from microsoft.endpoints.base import (
+    BATCH_SIZE,
+    BaseEndpoint,
+    MSGraphBatchError,
+    MSGraphTokenError,
+)
+from microsoft.endpoints.helpers import HTTP_HEADERS
+from microsoft.endpoints.session import (
+    BACKOFF_BASE,
+    MAX_RETRIES,
+    GraphSession,
+    get_session,
+)
 
 
 @pytest.fixture
@@ -41,6 +54,8 @@ def test_headers_returns_headers_with_auth(mock_get_token, endpoint):
     mock_get_token.return_value = "abc123"
     headers = endpoint.headers
     assert headers["Authorization"] == "Bearer abc123"
+    # The shared default headers aren't changed.
+    assert "Authorization" not in HTTP_HEADERS
 
 
 @patch("microsoft.endpoints.base.get_token")
@@ -50,8 +65,9 @@ def test_headers_raises_when_no_token(mock_get_token, endpoint):
         _ = endpoint.headers
 
 
-@patch("microsoft.endpoints.base.requests.get")
-def test_get_calls_requests_get(mock_requests_get, endpoint_with_headers):
+@patch("microsoft.endpoints.base.get_session")
+def test_get_calls_session_request(mock_get_session, endpoint_with_headers):
+    mock_requests_get = mock_get_session.return_value.request
     mock_resp = MagicMock()
     mock_resp.content = b'{"foo": "bar"}'
     mock_resp.json.return_value = {"foo": "bar"}
@@ -67,8 +83,9 @@ def test_get_calls_requests_get(mock_requests_get, endpoint_with_headers):
         assert result == {"foo": "bar"}
 
 
-@patch("microsoft.endpoints.base.requests.get")
-def test_get_list_pagination(mock_requests_get, endpoint_with_headers):
+@patch("microsoft.endpoints.base.get_session")
+def test_get_list_pagination(mock_get_session, endpoint_with_headers):
+    mock_requests_get = mock_get_session.return_value.request
     # First response with nextLink
     resp1 = MagicMock()
     resp1.content = b'{"value": [1,2], "@odata.nextLink": "next"}'
@@ -93,8 +110,9 @@ def test_get_list_pagination(mock_requests_get, endpoint_with_headers):
         assert mock_requests_get.call_count == 2
 
 
-@patch("microsoft.endpoints.base.requests.post")
-def test_post_calls_requests_post(mock_requests_post, endpoint_with_headers):
+@patch("microsoft.endpoints.base.get_session")
+def test_post_calls_session_request(mock_get_session, endpoint_with_headers):
+    mock_requests_post = mock_get_session.return_value.request
     mock_resp = MagicMock()
     mock_resp.content = b'{"foo": "bar"}'
     mock_resp.json.return_value = {"foo": "bar"}
@@ -110,8 +128,9 @@ def test_post_calls_requests_post(mock_requests_post, endpoint_with_headers):
         assert result == {"foo": "bar"}
 
 
-@patch("microsoft.endpoints.base.requests.patch")
-def test_patch_calls_requests_patch(mock_requests_patch, endpoint_with_headers):
+@patch("microsoft.endpoints.base.get_session")
+def test_patch_calls_session_request(mock_get_session, endpoint_with_headers):
+    mock_requests_patch = mock_get_session.return_value.request
     mock_resp = MagicMock()
     mock_resp.content = b'{"foo": "bar"}'
     mock_resp.json.return_value = {"foo": "bar"}
@@ -127,8 +146,9 @@ def test_patch_calls_requests_patch(mock_requests_patch, endpoint_with_headers):
         assert result == {"foo": "bar"}
 
 
-@patch("microsoft.endpoints.base.requests.delete")
-def test_delete_calls_requests_delete(mock_requests_delete, endpoint_with_headers):
+@patch("microsoft.endpoints.base.get_session")
+def test_delete_calls_session_request(mock_get_session, endpoint_with_headers):
+    mock_requests_delete = mock_get_session.return_value.request
     mock_resp = MagicMock()
     mock_resp.content = b'{"foo": "bar"}'
     mock_resp.json.return_value = {"foo": "bar"}
@@ -171,3 +191,211 @@ def test_handle_other_http_error_logs_and_raises(endpoint):
     resp.request.url = "https://example.com"
     with pytest.raises(requests.exceptions.HTTPError):
         endpoint.handle(resp)
+
+
+def _batch_post(statuses):
+    """
+    Fake $batch POST which responds to each sub-request with the next status for
+    its url, echoing the url back as the body.
+    """
+    posts = []
+
+    def post(path, data):
+        assert path == "$batch"
+        posts.append(data["requests"])
+        responses = []
+        for sub_request in data["requests"]:
+            status = statuses.get(sub_request["url"], [200]).pop(0)
+            responses.append(
+                {
+                    "id": sub_request["id"],
+                    "status": status,
+                    "headers": {"Retry-After": "2"} if status == 429 else {},
+                    "body": {"url": sub_request["url"]},
+                }
+            )
+        # Graph doesn't return responses in the order they were sent.
+        return {"responses": responses[::-1]}
+
+    return post, posts
+
+
+def test_batch_groups_sub_requests(endpoint):
+    post, posts = _batch_post({"/missing": [404]})
+    sub_requests = [{"method": "GET", "url": f"items/{i}"} for i in range(25)]
+    sub_requests.append({"method": "POST", "url": "/missing", "body": {"a": 1}})
+
+    with patch.object(endpoint, "post", side_effect=post):
+        results = endpoint.batch(sub_requests)
+
+    assert [len(batch) for batch in posts] == [BATCH_SIZE, 6]
+    # Results are in the same order as the sub-requests.
+    assert results[:25] == [{"url": f"/items/{i}"} for i in range(25)]
+    assert results[25] is None
+    assert posts[1][-1] == {
+        "id": "25",
+        "method": "POST",
+        "url": "/missing",
+        "body": {"a": 1},
+        "headers": {"Content-Type": "application/json"},
+    }
+
+
+@patch("microsoft.endpoints.base.time.sleep")
+def test_batch_retries_throttled_sub_requests(mock_sleep, endpoint):
+    post, posts = _batch_post({"/b": [429, 200]})
+    sub_requests = [{"method": "GET", "url": url} for url in ("a", "b", "c")]
+
+    with patch.object(endpoint, "post", side_effect=post):
+        results = endpoint.batch(sub_requests)
+
+    assert results == [{"url": "/a"}, {"url": "/b"}, {"url": "/c"}]
+    # Only the throttled sub-request is sent again.
+    assert [[r["url"] for r in batch] for batch in posts] == [
+        ["/a", "/b", "/c"],
+        ["/b"],
+    ]
+    mock_sleep.assert_called_once_with(2.0)
+
+
+@patch("microsoft.endpoints.base.time.sleep")
+def test_batch_doesnt_retry_unavailable_post(mock_sleep, endpoint):
+    post, posts = _batch_post({"/a": [504, 200]})
+
+    with patch.object(endpoint, "post", side_effect=post):
+        with pytest.raises(requests.HTTPError):
+            endpoint.batch([{"method": "POST", "url": "a", "body": {}}])
+
+    # Graph may have applied the POST, so it isn't sent again.
+    assert len(posts) == 1
+    mock_sleep.assert_not_called()
+
+
+def test_batch_raises_on_failed_sub_request(endpoint):
+    post, _ = _batch_post({"/b": [403]})
+    sub_requests = [{"method": "DELETE", "url": url} for url in ("a", "b")]
+
+    with patch.object(endpoint, "post", side_effect=post):
+        with pytest.raises(requests.HTTPError):
+            endpoint.batch(sub_requests)
+
+
+def test_batch_sends_remaining_sub_requests_after_failure(endpoint):
+    post, posts = _batch_post({"/items/3": [403], "/items/22": [500]})
+    sub_requests = [{"method": "POST", "url": f"items/{i}"} for i in range(25)]
+
+    with patch.object(endpoint, "post", side_effect=post):
+        with pytest.raises(MSGraphBatchError) as exc_info:
+            endpoint.batch(sub_requests)
+
+    # The chunk after the failure is still sent.
+    assert [len(batch) for batch in posts] == [BATCH_SIZE, 5]
+    assert list(exc_info.value.errors) == [3, 22]
+    results = exc_info.value.results
+    assert results[24] == {"url": "/items/24"}
+    assert results[3] is None
+
+
+def test_batch_get_list_follows_pagination(endpoint):
+    responses = [{"value": [1, 2], "@odata.nextLink": "next"}, None]
+
+    with (
+        patch.object(endpoint, "batch", return_value=responses) as mock_batch,
+        patch.object(endpoint, "request") as mock_request,
+        patch.object(endpoint, "handle", return_value={"value": [3]}),
+        patch.object(BaseEndpoint, "headers", {}),
+    ):
+        results = endpoint.batch_get_list(["a", "b"])
+
+    mock_batch.assert_called_once_with(
+        [{"method": "GET", "url": "a"}, {"method": "GET", "url": "b"}]
+    )
+    mock_request.assert_called_once_with("GET", "next", headers={}, stream=False)
+    assert results == [[1, 2, 3], []]
+
+
+def _response(status_code, headers=None):
+    resp = MagicMock()
+    resp.status_code = status_code
+    resp.headers = headers or {}
+    return resp
+
+
+@patch("microsoft.endpoints.session.time.sleep")
+def test_session_retries_throttled_requests(mock_sleep):
+    session = GraphSession()
+    throttled = [_response(429, {"Retry-After": "3"}), _response(503)]
+    ok = _response(200)
+    with patch.object(
+        session.session, "request", side_effect=[*throttled, ok]
+    ) as mock_request:
+        resp = session.request("GET", "https://example.com", endpoint="FolderEndpoint")
+
+    assert resp is ok
+    assert mock_request.call_count == 3
+    # Throttled responses release their connections before retrying.
+    for throttled_resp in throttled:
+        throttled_resp.close.assert_called_once()
+    # Retry-After is used when Graph sends it, otherwise the backoff is used.
+    assert mock_sleep.call_args_list[0].args == (3.0,)
+    assert 0 < mock_sleep.call_args_list[1].args[0] <= BACKOFF_BASE * 2
+    stats = session.get_stats()["FolderEndpoint"]
+    assert (stats.requests, stats.throttled, stats.errors) == (3, 2, 0)
+
+
+@patch("microsoft.endpoints.session.time.sleep")
+def test_session_rewinds_file_body_when_retrying(mock_sleep):
+    session = GraphSession()
+    body = io.BytesIO(b"file contents")
+    positions = []
+
+    def request(method, url, data, **kwargs):
+        positions.append(data.tell())
+        data.read()
+        return _response(429 if len(positions) == 1 else 201)
+
+    with patch.object(session.session, "request", side_effect=request):
+        resp = session.request("PUT", "https://example.com", data=body)
+
+    assert resp.status_code == 201
+    assert positions == [0, 0]
+
+
+@pytest.mark.parametrize(
+    "method, status_code, is_retried",
+    [
+        ("POST", 429, True),
+        ("POST", 504, False),
+        ("PUT", 503, False),
+        ("GET", 504, True),
+        ("DELETE", 503, True),
+    ],
+)
+@patch("microsoft.endpoints.session.time.sleep")
+def test_session_only_retries_unavailable_idempotent_requests(
+    mock_sleep, method, status_code, is_retried
+):
+    session = GraphSession()
+    with patch.object(
+        session.session,
+        "request",
+        side_effect=[_response(status_code), _response(200)],
+    ):
+        resp = session.request(method, "https://example.com")
+
+    assert resp.status_code == (200 if is_retried else status_code)
+    assert mock_sleep.called == is_retried
+
+
+@patch("microsoft.endpoints.session.time.sleep")
+def test_session_gives_up_after_max_retries(mock_sleep):
+    session = GraphSession()
+    with patch.object(session.session, "request", return_value=_response(429)):
+        resp = session.request("GET", "https://example.com")
+
+    assert resp.status_code == 429
+    assert mock_sleep.call_count == MAX_RETRIES
+
+
+def test_get_session_is_shared():
+    assert get_session() is get_session()
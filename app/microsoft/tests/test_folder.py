@@ -0,0 +1,89 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from core.factories import IssueFactory
+from django.conf import settings
+from django.core.management import call_command
+from microsoft.endpoints.folder import FolderEndpoint, item_path
+
+DRIVE_URL = f"groups/{settings.MS_GRAPH_GROUP_ID}/drive"
+
+
+@pytest.fixture
+def folder():
+    return FolderEndpoint(MagicMock())
+
+
+def test_get_url_by_path(folder):
+    assert folder.get_url("cases/123") == f"{DRIVE_URL}/root:/cases/123"
+    assert (
+        folder.get_url("cases/123", "permissions")
+        == f"{DRIVE_URL}/root:/cases/123:/permissions"
+    )
+
+
+def test_get_url_by_id(folder):
+    assert folder.get_url(item_path("ABC")) == f"{DRIVE_URL}/items/ABC"
+    assert (
+        folder.get_url(item_path("ABC"), "permissions/1")
+        == f"{DRIVE_URL}/items/ABC/permissions/1"
+    )
+
+
+def test_get_child_if_exists_gets_child_by_name(folder):
+    with patch("microsoft.endpoints.base.BaseEndpoint.get") as mock_get:
+        folder.get_child_if_exists("email attachments", "ABC")
+
+    mock_get.assert_called_once_with(f"{DRIVE_URL}/items/ABC:/email%20attachments")
+
+
+def test_get_delta_follows_pages(folder):
+    pages = [
+        {"value": [1, 2], "@odata.nextLink": "page-2"},
+        {"value": [3], "@odata.deltaLink": "delta-link"},
+    ]
+    with (
+        patch.object(folder, "request") as mock_request,
+        patch.object(folder, "handle", side_effect=pages),
+        patch.object(FolderEndpoint, "headers", {}),
+    ):
+        items, delta_link = folder.get_delta("previous-delta-link")
+
+    assert (items, delta_link) == ([1, 2, 3], "delta-link")
+    urls = [c.args[1] for c in mock_request.call_args_list]
+    assert urls == ["previous-delta-link", "page-2"]
+
+
+@pytest.mark.django_db
+@patch("microsoft.management.commands.backfill_sharepoint_folder_ids.MSGraphAPI")
+def test_backfill_sharepoint_folder_ids(mock_api_cls):
+    issues = sorted(
+        [IssueFactory(is_sharepoint_set_up=True) for _ in range(3)],
+        key=lambda issue: issue.pk,
+    )
+    not_set_up = IssueFactory(is_sharepoint_set_up=False)
+    mock_api_cls.return_value.folder.batch_get.side_effect = [
+        [{"id": "case_1"}, {"id": "uploads_1"}, {"id": "attachments_1"}]
+        + [{"id": "case_2"}, None, None],
+        [None, None, None],
+    ]
+
+    call_command("backfill_sharepoint_folder_ids", "--batch-size=2", stdout=MagicMock())
+
+    paths = mock_api_cls.return_value.folder.batch_get.call_args_list[0].args[0]
+    assert paths[:3] == [
+        f"cases/{issues[0].pk}",
+        f"cases/{issues[0].pk}/client-uploads",
+        f"cases/{issues[0].pk}/email-attachments",
+    ]
+    for issue in [*issues, not_set_up]:
+        issue.refresh_from_db()
+
+    assert issues[0].sharepoint_folder_id == "case_1"
+    assert issues[0].sharepoint_upload_folder_id == "uploads_1"
+    assert issues[0].sharepoint_attachment_folder_id == "attachments_1"
+    assert issues[1].sharepoint_folder_id == "case_2"
+    assert issues[1].sharepoint_attachment_folder_id == ""
+    # Cases without a folder, or which weren't set up, are left alone.
+    assert issues[2].sharepoint_folder_id == ""
+    assert not_set_up.sharepoint_folder_id == ""
@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, patch
+
+import msal
+import pytest
+from microsoft.endpoints import helpers
+from microsoft.endpoints.helpers import (
+    SCOPES,
+    TOKEN_REFRESH_SECONDS,
+    get_client,
+    get_token,
+)
+from microsoft.models import TokenCache
+
+
+@pytest.fixture
+def client():
+    client = MagicMock()
+    client.client_id = "client-id"
+    client.token_cache = msal.SerializableTokenCache()
+    with patch.dict(helpers._tokens, clear=True):
+        yield client
+
+
+@pytest.mark.django_db
+def test_get_token_is_kept_in_memory(client):
+    def acquire_token_for_client(scopes):
+        client.token_cache.has_state_changed = True
+        return {"access_token": "abc123", "expires_in": 3600}
+
+    client.acquire_token_for_client.side_effect = acquire_token_for_client
+
+    assert get_token(client) == "abc123"
+    assert get_token(client) == "abc123"
+
+    client.acquire_token_for_client.assert_called_once_with(scopes=SCOPES)
+    # The token cache is saved so that other processes can use it.
+    token_cache = TokenCache.objects.get(client_id="client-id")
+    assert token_cache.data == client.token_cache.serialize()
+
+
+@pytest.mark.django_db
+def test_get_token_is_refreshed_before_expiry(client):
+    client.acquire_token_for_client.side_effect = [
+        {"access_token": "old", "expires_in": TOKEN_REFRESH_SECONDS - 60},
+        {"access_token": "new", "expires_in": 3600},
+    ]
+
+    with patch.object(helpers, "_remove_access_tokens") as mock_remove:
+        assert get_token(client) == "new"
+
+    # The old token is removed from the cache so that MSAL gets a new one.
+    mock_remove.assert_called_once_with(client.token_cache)
+    assert client.acquire_token_for_client.call_count == 2
+
+
+@pytest.mark.django_db
+def test_get_token_returns_none_on_error(client):
+    client.acquire_token_for_client.return_value = {
+        "error_description": "Bad secret",
+        "correlation_id": "1234",
+    }
+
+    assert get_token(client) is None
+    assert helpers._tokens == {}
+
+
+def test_get_client_is_shared():
+    with patch.object(helpers, "create_client") as mock_create_client:
+        with patch.object(helpers, "_client", None):
+            assert get_client() is get_client()
+
+    mock_create_client.assert_called_once()
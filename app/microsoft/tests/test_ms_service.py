@@ -1,18 +1,34 @@
+from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
-from core.factories import DocumentTemplateFactory, IssueFactory, UserFactory
+import requests
+from core.factories import (
+    DocumentTemplateFactory,
+    EmailAttachmentFactory,
+    EmailFactory,
+    IssueFactory,
+    UserFactory,
+)
+from django.utils import timezone
 from microsoft.service import (
+    CASE_LISTING_MAX_AGE,
     add_group_member,
     add_office_licence,
     add_user_to_case,
+    add_user_to_cases,
+    get_case_documents,
     get_case_folder_info,
+    get_user_permissions,
     remove_group_member,
     remove_office_licence,
     remove_user_from_case,
+    save_email_attachment,
     set_up_new_case,
     set_up_new_user,
+    sync_case_documents,
 )
+from microsoft.models import CaseFolderListing, DriveDelta
 from microsoft.storage import MSGraphStorage
 
 
@@ -81,14 +97,67 @@ def test_ms_service__set_up_new_case(mock_api):
         template = DocumentTemplateFactory(topic=issue.topic)
 
     mock_api.folder.get_child_if_exists.return_value = None
-    mock_api.folder.create_folder.return_value = {"id": "folder_id"}
+    mock_api.folder.create_folder.side_effect = lambda name, parent_id: {
+        "id": f"{name}_id"
+    }
+    CaseFolderListing.objects.create(
+        issue=issue, documents=[], synced_at=timezone.now()
+    )
 
     set_up_new_case(issue)
 
+    case_folder_id = f"{issue.id}_id"
     mock_api.folder.copy.assert_called_once_with(
-        template.file.name, template.name, "folder_id"
+        template.file.name, template.name, case_folder_id
+    )
+    # The folder IDs are stored so that they don't need to be looked up again.
+    issue.refresh_from_db()
+    assert issue.sharepoint_folder_id == case_folder_id
+    assert issue.sharepoint_upload_folder_id == "client-uploads_id"
+    assert issue.sharepoint_attachment_folder_id == "email-attachments_id"
+    assert not CaseFolderListing.objects.filter(issue=issue).exists()
+
+
+@pytest.mark.django_db
+def test_ms_service__save_email_attachment(mock_api, settings, tmpdir):
+    """Check service function uploads straight to the stored attachment folder"""
+    settings.MEDIA_ROOT = str(tmpdir)
+    issue = IssueFactory(sharepoint_attachment_folder_id="attachment_folder_id")
+    email = EmailFactory(issue=issue)
+    attachment = EmailAttachmentFactory(email=email)
+
+    CaseFolderListing.objects.create(
+        issue=issue, documents=[], synced_at=timezone.now()
     )
 
+    save_email_attachment(email, attachment)
+
+    mock_api.folder.get_child_if_exists.assert_not_called()
+    mock_api.folder.upload_file.assert_called_once()
+    assert mock_api.folder.upload_file.call_args.args[1] == "attachment_folder_id"
+    # The cached listing doesn't have the new file.
+    assert not CaseFolderListing.objects.filter(issue=issue).exists()
+
+
+@pytest.mark.django_db
+def test_ms_service__save_email_attachment_finds_folder(mock_api, settings, tmpdir):
+    """Check service function finds and stores the attachment folder when it isn't stored"""
+    settings.MEDIA_ROOT = str(tmpdir)
+    issue = IssueFactory()
+    email = EmailFactory(issue=issue)
+    attachment = EmailAttachmentFactory(email=email)
+    mock_api.folder.get_child_if_exists.side_effect = [
+        {"id": "case_folder_id"},
+        {"id": "attachment_folder_id"},
+    ]
+
+    save_email_attachment(email, attachment)
+
+    assert mock_api.folder.upload_file.call_args.args[1] == "attachment_folder_id"
+    issue.refresh_from_db()
+    assert issue.sharepoint_folder_id == "case_folder_id"
+    assert issue.sharepoint_attachment_folder_id == "attachment_folder_id"
+
 
 @pytest.mark.django_db
 def test_ms_service__assign_office_licence(mock_api):
@@ -161,6 +230,63 @@ def test_ms_service__add_user_to_case(mock_api):
     )
 
 
+@pytest.mark.django_db
+def test_ms_service__add_user_to_case_by_folder_id(mock_api):
+    """Check service function addresses the case folder by its ID once it is stored"""
+    user = UserFactory()
+    issue = IssueFactory(sharepoint_folder_id="case_folder_id")
+
+    add_user_to_case(user, issue)
+
+    mock_api.folder.create_permissions.assert_called_once_with(
+        "id:case_folder_id", "write", [user.email]
+    )
+
+
+@pytest.mark.django_db
+def test_ms_service__add_user_to_cases(mock_api):
+    """Check service function gives user write permissions to many case folders at once"""
+    user = UserFactory()
+    issues = [IssueFactory(), IssueFactory()]
+
+    add_user_to_cases(user, issues)
+
+    mock_api.folder.batch_create_permissions.assert_called_once_with(
+        [f"cases/{issue.id}" for issue in issues], "write", [user.email]
+    )
+
+
+@pytest.mark.django_db
+def test_ms_service__get_user_permissions(mock_api):
+    """Check service function lists the permissions for all of a user's cases at once"""
+    user = UserFactory(email="donald.duck@anikalegal.org.au")
+    with_access = IssueFactory(paralegal=user)
+    without_access = IssueFactory(lawyer=user)
+    mock_api.group.members.return_value = []
+    mock_api.group.owners.return_value = []
+    mock_api.user.get.return_value = {"userPrincipalName": user.email}
+
+    def batch_list_permissions(paths):
+        return [
+            (
+                [{"id": "1", "grantedToV2": {"user": {"email": user.email}}}]
+                if path == f"cases/{with_access.id}"
+                else [{"id": "2", "grantedTo": {"user": {"displayName": "Bugs"}}}]
+            )
+            for path in paths
+        ]
+
+    mock_api.folder.batch_list_permissions.side_effect = batch_list_permissions
+
+    perms = get_user_permissions(user)
+
+    assert perms.access_level == "PARTIAL_ACCESS"
+    assert perms.issues_with_access == [with_access]
+    assert perms.issues_without_access == [without_access]
+    mock_api.folder.batch_list_permissions.assert_called_once()
+    mock_api.folder.list_permissions.assert_not_called()
+
+
 @pytest.mark.django_db
 def test_ms_service__remove_unprivileged_user_from_case(mock_api):
     """Check service function when there are no permissions on the case folder"""
@@ -171,7 +297,7 @@ def test_ms_service__remove_unprivileged_user_from_case(mock_api):
     remove_user_from_case(user, issue)
 
     mock_api.folder.list_permissions.assert_called_once_with(f"cases/{issue.id}")
-    mock_api.folder.delete_permission.assert_not_called()
+    mock_api.folder.batch_delete_permissions.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -189,7 +315,7 @@ def test_ms_service__remove_different_user_from_case(mock_api):
     remove_user_from_case(user, issue)
 
     mock_api.folder.list_permissions.assert_called_once_with(f"cases/{issue.id}")
-    mock_api.folder.delete_permission.assert_not_called()
+    mock_api.folder.batch_delete_permissions.assert_not_called()
 
 
 @pytest.mark.django_db
@@ -207,8 +333,8 @@ def test_ms_service__remove_user_from_case(mock_api):
     remove_user_from_case(user, issue)
 
     mock_api.folder.list_permissions.assert_called_once_with(f"cases/{issue.id}")
-    mock_api.folder.delete_permission.assert_called_once_with(
-        f"cases/{issue.id}", "666"
+    mock_api.folder.batch_delete_permissions.assert_called_once_with(
+        [(f"cases/{issue.id}", "666")]
     )
 
 
@@ -307,3 +433,129 @@ def test_ms_service__tear_down_coordinator_that_is_not_member(mock_api):
     mock_api.group.members.assert_called_once()
     mock_api.user.get.assert_not_called()
     mock_api.group.remove_user.assert_not_called()
+
+
+def _drive_item(item_id, parent_id=None, **kwargs):
+    return {
+        "id": item_id,
+        "name": f"{item_id}.docx",
+        "webUrl": f"https://example.com/{item_id}",
+        "size": 1,
+        "file": {},
+        "parentReference": {"id": parent_id},
+        **kwargs,
+    }
+
+
+@pytest.mark.django_db
+def test_ms_service__get_case_documents(mock_api):
+    """Check service function fetches and caches the listing on a miss, then uses the cache"""
+    issue = IssueFactory(sharepoint_folder_id="case_folder_id")
+    mock_api.folder.get_children.return_value = [_drive_item("doc")]
+    mock_api.folder.get.return_value = {"webUrl": "https://example.com/case"}
+
+    documents, url, synced_at = get_case_documents(issue)
+    assert (documents, url) == get_case_documents(issue)[:2]
+
+    assert url == "https://example.com/case"
+    assert [document["id"] for document in documents] == ["doc"]
+    mock_api.folder.get_children.assert_called_once_with("id:case_folder_id")
+    assert CaseFolderListing.objects.get(issue=issue).synced_at == synced_at
+
+
+@pytest.mark.django_db
+def test_ms_service__get_case_documents_refetches_old_listing(mock_api):
+    """Check service function fetches the listing again once the cached one is too old"""
+    issue = IssueFactory(sharepoint_folder_id="case_folder_id")
+    CaseFolderListing.objects.create(
+        issue=issue,
+        documents=[],
+        synced_at=timezone.now() - CASE_LISTING_MAX_AGE - timedelta(minutes=1),
+    )
+    mock_api.folder.get_children.return_value = [_drive_item("doc")]
+    mock_api.folder.get.return_value = {"webUrl": "https://example.com/case"}
+
+    documents, _, synced_at = get_case_documents(issue)
+
+    assert [document["id"] for document in documents] == ["doc"]
+    listing = CaseFolderListing.objects.get(issue=issue)
+    assert listing.synced_at == synced_at
+    assert listing.documents == documents
+
+
+@pytest.mark.django_db
+def test_ms_service__get_case_documents_without_folder_id(mock_api):
+    """Check service function doesn't cache listings which can't be synced"""
+    issue = IssueFactory()
+    mock_api.folder.get_children.return_value = []
+    mock_api.folder.get.return_value = {"webUrl": "https://example.com/case"}
+
+    get_case_documents(issue)
+
+    assert not CaseFolderListing.objects.exists()
+
+
+@pytest.mark.django_db
+def test_ms_service__sync_case_documents(mock_api, settings):
+    """Check service function refreshes the cached listings of changed case folders"""
+    settings.MS_GRAPH_DRIVE_ID = "drive_id"
+    changed = IssueFactory(sharepoint_folder_id="changed_id")
+    unchanged = IssueFactory(sharepoint_folder_id="unchanged_id")
+    deleted = IssueFactory(sharepoint_folder_id="deleted_id")
+    not_cached = IssueFactory(sharepoint_folder_id="not_cached_id")
+    for issue in (changed, unchanged, deleted):
+        CaseFolderListing.objects.create(
+            issue=issue, documents=[], synced_at=issue.created_at
+        )
+
+    DriveDelta.objects.create(drive_id=settings.MS_GRAPH_DRIVE_ID, delta_link="old")
+    mock_api.folder.get_delta.return_value = (
+        [
+            _drive_item("new_doc", parent_id="changed_id"),
+            _drive_item("deleted_id", parent_id="cases_id", deleted={}),
+            _drive_item("other_doc", parent_id="not_cached_id"),
+        ],
+        "new",
+    )
+    mock_api.folder.batch_get.side_effect = lambda paths: [
+        {"webUrl": "https://example.com/changed"} if path == "id:changed_id" else None
+        for path in paths
+    ]
+    mock_api.folder.batch_get_children.side_effect = lambda paths: [
+        [_drive_item("new_doc")] if path == "id:changed_id" else [] for path in paths
+    ]
+
+    sync_case_documents()
+
+    mock_api.folder.get_delta.assert_called_once_with("old")
+    paths = mock_api.folder.batch_get.call_args.args[0]
+    assert sorted(paths) == ["id:changed_id", "id:deleted_id"]
+    listing = CaseFolderListing.objects.get(issue=changed)
+    assert listing.folder_url == "https://example.com/changed"
+    assert [document["id"] for document in listing.documents] == ["new_doc"]
+    assert CaseFolderListing.objects.get(issue=unchanged).documents == []
+    # Listings of folders which no longer exist are removed.
+    assert not CaseFolderListing.objects.filter(issue=deleted).exists()
+    # Folders which weren't cached are left to be fetched when they are viewed.
+    assert not CaseFolderListing.objects.filter(issue=not_cached).exists()
+    assert DriveDelta.objects.get().delta_link == "new"
+
+
+@pytest.mark.django_db
+def test_ms_service__sync_case_documents_with_expired_delta(mock_api, settings):
+    """Check service function clears all cached listings when it can't tell what changed"""
+    settings.MS_GRAPH_DRIVE_ID = "drive_id"
+    issue = IssueFactory(sharepoint_folder_id="case_folder_id")
+    CaseFolderListing.objects.create(
+        issue=issue, documents=[], synced_at=issue.created_at
+    )
+    DriveDelta.objects.create(drive_id=settings.MS_GRAPH_DRIVE_ID, delta_link="old")
+    expired = requests.HTTPError(response=requests.Response())
+    expired.response.status_code = 410
+    mock_api.folder.get_delta.side_effect = [expired, ([], "latest")]
+
+    sync_case_documents()
+
+    assert mock_api.folder.get_delta.call_args.args == ()
+    assert not CaseFolderListing.objects.exists()
+    assert DriveDelta.objects.get().delta_link == "latest"
@@ -0,0 +1,68 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from accounts import registry
+from case.utils.summary import update_issue_summaries
+from core.factories import IssueFactory, UserFactory
+from core.models import IssueSummary
+from django.utils import timezone
+from microsoft.tasks import reset_ms_access, set_up_new_case_task
+
+
+@pytest.fixture()
+def mock_user_event_mgr():
+    mock_mgr = MagicMock()
+    with registry.override_user_event_manager(mock_mgr):
+        yield mock_mgr
+
+
+@pytest.mark.enable_signals
+@pytest.mark.django_db
+@patch("microsoft.tasks.set_up_new_user")
+def test_reset_ms_access__adds_user_to_cases(mock_set_up_new_user, mock_user_event_mgr):
+    an_hour_ago = timezone.now() - timezone.timedelta(hours=1)
+    user = UserFactory(ms_account_created_at=an_hour_ago)
+    paralegal_issue = IssueFactory(paralegal=user, is_sharepoint_set_up=True)
+    lawyer_issue = IssueFactory(lawyer=user, is_sharepoint_set_up=True)
+    # Cases without a Sharepoint folder or belonging to other users are skipped.
+    IssueFactory(paralegal=user, is_sharepoint_set_up=False)
+    IssueFactory(is_sharepoint_set_up=True)
+    mock_user_event_mgr.reset_mock()
+
+    reset_ms_access(user)
+
+    mock_set_up_new_user.assert_called_once_with(user)
+    mock_user_event_mgr.user_added_to_case.assert_not_called()
+    mock_user_event_mgr.user_added_to_cases.assert_called_once()
+    args = mock_user_event_mgr.user_added_to_cases.call_args.args
+    assert args[0] == user
+    assert {issue.pk for issue in args[1]} == {paralegal_issue.pk, lawyer_issue.pk}
+
+
+@pytest.mark.enable_signals
+@pytest.mark.django_db
+@patch("microsoft.tasks.set_up_new_user")
+def test_reset_ms_access__skips_new_account(mock_set_up_new_user, mock_user_event_mgr):
+    user = UserFactory(ms_account_created_at=timezone.now())
+    IssueFactory(paralegal=user, is_sharepoint_set_up=True)
+    mock_user_event_mgr.reset_mock()
+
+    reset_ms_access(user)
+
+    mock_set_up_new_user.assert_called_once_with(user)
+    mock_user_event_mgr.user_added_to_cases.assert_not_called()
+
+
+@pytest.mark.django_db
+@patch("microsoft.tasks.set_up_new_case")
+def test_set_up_new_case_task__updates_summary(mock_set_up_new_case):
+    issue = IssueFactory(is_sharepoint_set_up=False)
+    update_issue_summaries([issue.pk])
+
+    set_up_new_case_task(issue.pk)
+
+    mock_set_up_new_case.assert_called_once_with(issue)
+    issue.refresh_from_db()
+    assert issue.is_sharepoint_set_up
+    summary = IssueSummary.objects.get(issue=issue)
+    assert summary.data["is_sharepoint_set_up"] is True
@@ -20,19 +20,12 @@ def pre_save_issue(sender, instance, **kwargs):
     Detect state changes for notifications
     """
     issue = instance
-    if not issue.pk:
-        return
-
-    try:
-        prev_issue = Issue.objects.get(pk=issue.pk)
-    except Issue.DoesNotExist:
-        return
-
-    if issue.stage != prev_issue.stage:
+    if "stage" in issue.changed_fields:
+        prev_stage, next_stage = issue.changed_fields["stage"]
         logger.info(
             "Dispatching notification stage change task for Issue[%s]", issue.pk
         )
-        async_task(on_issue_stage_change, issue.pk, prev_issue.stage, issue.stage)
+        async_task(on_issue_stage_change, issue.pk, prev_stage, next_stage)
 
 
 def on_issue_stage_change(issue_pk, old_stage: str, new_stage: str):
@@ -0,0 +1,97 @@
+"""
+Utils for recording the database queries run while handling a request.
+"""
+
+import logging
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.dispatch import Signal
+
+logger = logging.getLogger(__name__)
+
+# Sent after a request's queries have been recorded. kwargs: request, stats
+query_stats_recorded = Signal()
+
+
+@dataclass
+class QueryStats:
+    # Number of queries run.
+    count: int = 0
+    # Total time spent running queries, in seconds.
+    duration: float = 0.0
+    # Number of times each query was run, keyed by its SQL without params.
+    fingerprints: Counter = field(default_factory=Counter)
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """
+        Returns the queries which were run more than once, eg. due to N+1s.
+        """
+        return {sql: n for sql, n in self.fingerprints.most_common() if n > 1}
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper which records QueryStats.
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            ...
+    """
+
+    def __init__(self):
+        self.stats = QueryStats()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.monotonic()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.count += 1
+            self.stats.duration += time.monotonic() - start
+            self.stats.fingerprints[sql] += 1
+
+
+def query_stats_middleware(get_response):
+    """
+    Logs the number of database queries run by each request, the time spent
+    running them and any duplicate queries. Enable with QUERY_STATS_ENABLED.
+    """
+    if not settings.QUERY_STATS_ENABLED:
+        raise MiddlewareNotUsed()
+
+    def middleware(request):
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = get_response(request)
+
+        stats = recorder.stats
+        duration_ms = stats.duration * 1000
+        response["Server-Timing"] = (
+            f'db;dur={duration_ms:.1f};desc="{stats.count} queries"'
+        )
+        logger.info(
+            "%s %s ran %s queries in %.1fms",
+            request.method,
+            request.path,
+            stats.count,
+            duration_ms,
+        )
+        for sql, count in stats.duplicates.items():
+            logger.warning(
+                "%s %s ran query %s times: %s",
+                request.method,
+                request.path,
+                count,
+                sql,
+            )
+
+        query_stats_recorded.send(sender=None, request=request, stats=stats)
+        return response
+
+    return middleware
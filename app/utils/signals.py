@@ -6,6 +6,7 @@ https://www.cameronmaske.com/muting-django-signals-with-a-pytest-fixture/
 from accounts.events import (
     user_activated,
     user_added_to_case,
+    user_added_to_cases,
     user_deactivated,
     user_removed_from_case,
     user_role_changed,
@@ -28,6 +29,7 @@ SIGNALS = [
     user_activated,
     user_deactivated,
     user_added_to_case,
+    user_added_to_cases,
     user_removed_from_case,
     user_role_changed,
     ms_account_created,
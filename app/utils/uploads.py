@@ -1,4 +1,5 @@
 import hashlib
+
 from django.utils.text import slugify
 
 """
@@ -16,9 +17,25 @@ def get_s3_key(model, filename: str):
 
     Assumes model has a FileField named 'file' and an attribute UPLOAD_KEY.
     """
-    file = model.file
-    file_bytes = file.read()
+    return get_content_key(model.UPLOAD_KEY, hash_file(model.file), filename)
+
+
+def get_content_key(upload_key: str, file_hash: str, filename: str) -> str:
+    return f"{upload_key}/{file_hash}/{slugify_filename(filename)}"
+
+
+def hash_file(file) -> str:
+    """
+    SHA-256 hash of a file, read in chunks so that large files aren't loaded
+    into memory.
+    """
+    hasher = hashlib.sha256()
+    for chunk in file.chunks():
+        hasher.update(chunk)
+
     file.seek(0)
-    file_hash = hashlib.md5(file_bytes).hexdigest()
-    new_filename = ".".join([slugify(p) for p in filename.split(".")]).lower()
-    return f"{model.UPLOAD_KEY}/{file_hash}/{new_filename}"
+    return hasher.hexdigest()
+
+
+def slugify_filename(filename: str) -> str:
+    return ".".join([slugify(p) for p in filename.split(".")]).lower()
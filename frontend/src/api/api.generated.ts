@@ -10,6 +10,7 @@ const injectedRtkApi = api.injectEndpoints({
         params: {
           page: queryArg.page,
           page_size: queryArg.pageSize,
+          cursor: queryArg.cursor,
           search: queryArg.search,
           topic: queryArg.topic,
           stage: queryArg.stage,
@@ -121,6 +122,18 @@ const injectedRtkApi = api.injectEndpoints({
         body: queryArg.emailCreate,
       }),
     }),
+    getEmailThreadSummaries: build.query<
+      GetEmailThreadSummariesApiResponse,
+      GetEmailThreadSummariesApiArg
+    >({
+      query: (queryArg) => ({
+        url: `/clerk/api/email/${queryArg.id}/threads/`,
+        params: {
+          page: queryArg.page,
+          page_size: queryArg.pageSize,
+        },
+      }),
+    }),
     getEmail: build.query<GetEmailApiResponse, GetEmailApiArg>({
       query: (queryArg) => ({
         url: `/clerk/api/email/${queryArg.id}/${queryArg.emailId}/`,
@@ -182,6 +195,7 @@ const injectedRtkApi = api.injectEndpoints({
         params: {
           page: queryArg.page,
           page_size: queryArg.pageSize,
+          cursor: queryArg.cursor,
           issue: queryArg.issue,
           creator: queryArg.creator,
           note_type: queryArg.noteType,
@@ -196,6 +210,7 @@ const injectedRtkApi = api.injectEndpoints({
           query: queryArg.query,
           page: queryArg.page,
           page_size: queryArg.pageSize,
+          cursor: queryArg.cursor,
         },
       }),
     }),
@@ -228,6 +243,7 @@ const injectedRtkApi = api.injectEndpoints({
         params: {
           page: queryArg.page,
           page_size: queryArg.pageSize,
+          cursor: queryArg.cursor,
           q: queryArg.q,
           issue_id: queryArg.issueId,
           type: queryArg["type"],
@@ -286,6 +302,7 @@ const injectedRtkApi = api.injectEndpoints({
         params: {
           page: queryArg.page,
           page_size: queryArg.pageSize,
+          cursor: queryArg.cursor,
           q: queryArg.q,
         },
       }),
@@ -508,11 +525,15 @@ export type GetCasesApiResponse = /** status 200 Successful response. */ {
   prev: number | null;
   page_count: number;
   item_count: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
   results: IssueRead[];
 };
 export type GetCasesApiArg = {
   page?: number;
   pageSize?: number;
+  /** Position for cursor pagination, empty for the first page */
+  cursor?: string;
   search?: string;
   topic?: string;
   stage?: string;
@@ -556,6 +577,8 @@ export type GetCaseDocumentsApiResponse =
   /** status 200 Successful response. */ {
     sharepoint_url: string;
     documents: SharepointDocument[];
+    /** When the documents were fetched from SharePoint. */
+    synced_at: string;
   };
 export type GetCaseDocumentsApiArg = {
   /** Entity ID */
@@ -616,6 +639,21 @@ export type CreateEmailApiArg = {
   id: string;
   emailCreate: EmailCreate;
 };
+export type GetEmailThreadSummariesApiResponse =
+  /** status 200 Successful response. */ {
+    current: number;
+    next: number | null;
+    prev: number | null;
+    page_count: number;
+    item_count: number;
+    results: EmailThreadSummary[];
+  };
+export type GetEmailThreadSummariesApiArg = {
+  /** Case ID */
+  id: string;
+  page?: number;
+  pageSize?: number;
+};
 export type GetEmailApiResponse =
   /** status 200 Successful response. */ EmailRead;
 export type GetEmailApiArg = {
@@ -683,11 +721,15 @@ export type GetNotesApiResponse = /** status 200 Successful response. */ {
   prev: number | null;
   page_count: number;
   item_count: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
   results: IssueNoteRead[];
 };
 export type GetNotesApiArg = {
   page?: number;
   pageSize?: number;
+  /** Position for cursor pagination, empty for the first page */
+  cursor?: string;
   /** Entity ID */
   issue?: string;
   /** Creator account ID */
@@ -702,6 +744,8 @@ export type GetPeopleApiResponse = /** status 200 Successful response. */ {
   prev: number | null;
   page_count: number;
   item_count: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
   results: Person[];
 };
 export type GetPeopleApiArg = {
@@ -710,6 +754,8 @@ export type GetPeopleApiArg = {
   page?: number;
   /** Number of items per page (pagination) */
   pageSize?: number;
+  /** Position for cursor pagination, empty for the first page */
+  cursor?: string;
 };
 export type CreatePersonApiResponse =
   /** status 201 Successful response. */ Person;
@@ -741,11 +787,15 @@ export type GetCaseDatesApiResponse = /** status 200 Successful response. */ {
   prev: number | null;
   page_count: number;
   item_count: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
   results: IssueDateRead[];
 };
 export type GetCaseDatesApiArg = {
   page?: number;
   pageSize?: number;
+  /** Position for cursor pagination, empty for the first page */
+  cursor?: string;
   q?: string;
   /** Entity ID */
   issueId?: string;
@@ -797,11 +847,15 @@ export type GetClientsApiResponse = /** status 200 Successful response. */ {
   prev: number | null;
   page_count: number;
   item_count: number;
+  next_cursor?: string | null;
+  prev_cursor?: string | null;
   results: Client[];
 };
 export type GetClientsApiArg = {
   page?: number;
   pageSize?: number;
+  /** Position for cursor pagination, empty for the first page */
+  cursor?: string;
   q?: string;
 };
 export type GetClientApiResponse =
@@ -1512,6 +1566,18 @@ export type EmailThreadRead = {
   most_recent: string;
   url: string;
 };
+export type EmailThreadSummary = {
+  subject: string;
+  slug: string;
+  most_recent: string;
+  email_count: number;
+  draft_count: number;
+  sent_count: number;
+  delivered_count: number;
+  delivery_failure_count: number;
+  ingested_count: number;
+  url: string;
+};
 export type EmailUpdate = {
   to_address?: string;
   cc_addresses?: string[];
@@ -1716,6 +1782,7 @@ export const {
   useDeleteCaseServiceMutation,
   useGetEmailThreadsQuery,
   useCreateEmailMutation,
+  useGetEmailThreadSummariesQuery,
   useGetEmailQuery,
   useUpdateEmailMutation,
   useDeleteEmailMutation,
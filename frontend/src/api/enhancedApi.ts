@@ -31,6 +31,9 @@ const enhancedApi = generatedApi.enhanceEndpoints({
     getEmailThreads: {
       providesTags: [{ type: 'EMAIL' }],
     },
+    getEmailThreadSummaries: {
+      providesTags: [{ type: 'EMAIL' }],
+    },
     getEmail: {
       providesTags: [{ type: 'EMAIL' }],
     },
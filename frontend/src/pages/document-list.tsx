@@ -1,3 +1,4 @@
+import dayjs from 'dayjs'
 import React from 'react'
 import { Container, Header, Loader } from 'semantic-ui-react'
 
@@ -22,6 +23,7 @@ const App = () => {
 
   const sharepointUrl = docsResult.data?.sharepoint_url
   const documents = docsResult.data?.documents
+  const syncedAt = docsResult.data?.synced_at
   const issue = caseResult.data!.issue
   return (
     <Container>
@@ -41,6 +43,9 @@ const App = () => {
       {!isLoading && sharepointUrl && (
         <p>
           View case documents in <a href={sharepointUrl}>SharePoint</a>.
+          {syncedAt && (
+            <> Documents as of {dayjs(syncedAt).format('DD/MM/YYYY h:mm a')}.</>
+          )}
         </p>
       )}
       {!isLoading &&
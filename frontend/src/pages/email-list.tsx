@@ -1,4 +1,5 @@
-import React from 'react'
+import { Pagination } from '@mantine/core'
+import React, { useState } from 'react'
 import {
   Button,
   Container,
@@ -8,7 +9,7 @@ import {
   Table,
 } from 'semantic-ui-react'
 
-import { useGetCaseQuery, useGetEmailThreadsQuery } from 'api'
+import { useGetCaseQuery, useGetEmailThreadSummariesQuery } from 'api'
 import { CASE_TABS, CaseHeader, CaseTabUrls } from 'comps/case-header'
 import { mount } from 'utils'
 
@@ -24,7 +25,8 @@ const { case_pk, case_email_address, urls, draft_url } = (window as any)
 
 const App = () => {
   const caseResult = useGetCaseQuery({ id: case_pk })
-  const threadResult = useGetEmailThreadsQuery({ id: case_pk })
+  const [page, setPage] = useState(1)
+  const threadResult = useGetEmailThreadSummariesQuery({ id: case_pk, page })
 
   if (caseResult.isLoading || threadResult.isLoading) {
     return null
@@ -40,7 +42,7 @@ const App = () => {
   }
 
   const issue = caseResult.data.issue
-  const emailThreads = threadResult.data
+  const emailThreads = threadResult.data.results
 
   return (
     <Container>
@@ -78,34 +80,34 @@ const App = () => {
               </Table.Cell>
               <Table.Cell>{t.most_recent}</Table.Cell>
               <Table.Cell>
-                {countEmailType(t.emails, 'DRAFT') > 0 && (
+                {t.draft_count > 0 && (
                   <Label color="blue">
                     <Icon name="mail" />
-                    {countEmailType(t.emails, 'DRAFT')} drafts
+                    {t.draft_count} drafts
                   </Label>
                 )}
-                {countEmailType(t.emails, 'DELIVERED') > 0 && (
+                {t.delivered_count > 0 && (
                   <Label>
                     <Icon name="mail" />
-                    {countEmailType(t.emails, 'DELIVERED')} sent
+                    {t.delivered_count} sent
                   </Label>
                 )}
-                {countEmailType(t.emails, 'DELIVERY_FAILURE') > 0 && (
+                {t.delivery_failure_count > 0 && (
                   <Label color="red">
                     <Icon name="mail" />
-                    {countEmailType(t.emails, 'DELIVERY_FAILURE')} failed
+                    {t.delivery_failure_count} failed
                   </Label>
                 )}
-                {countEmailType(t.emails, 'SENT') > 0 && (
+                {t.sent_count > 0 && (
                   <Label>
                     <Icon name="mail" />
-                    {countEmailType(t.emails, 'SENT')} sending
+                    {t.sent_count} sending
                   </Label>
                 )}
-                {countEmailType(t.emails, 'INGESTED') > 0 && (
+                {t.ingested_count > 0 && (
                   <Label>
                     <Icon name="mail" />
-                    {countEmailType(t.emails, 'INGESTED')} received
+                    {t.ingested_count} received
                   </Label>
                 )}
               </Table.Cell>
@@ -113,11 +115,18 @@ const App = () => {
           ))}
         </Table.Body>
       </Table>
+      {threadResult.data.page_count > 1 && (
+        <Pagination
+          total={threadResult.data.page_count}
+          value={page}
+          onChange={setPage}
+          mt="md"
+          withEdges
+          withControls
+        />
+      )}
     </Container>
   )
 }
 
-const countEmailType = (emails, state) =>
-  emails.filter((e) => e.state === state).length
-
 mount(App)